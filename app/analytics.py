@@ -0,0 +1,167 @@
+"""
+Ventas de entradas en el tiempo, por hora y por día.
+
+HourlySales y DailySales guardan una fila por (evento, intervalo, tipo) con
+las entradas vendidas y la recaudación estimada. Los servicios de compra,
+cambio y cancelación las ajustan con record_sales() cuando su transacción
+confirma (todas las compras de un evento caen en el mismo intervalo; dentro
+de la transacción se esperarían unas a otras), así que una consulta de rango
+lee a lo sumo una fila por intervalo y tipo en vez de agrupar los buy_date
+de todos los tickets.
+rebuild_sales_rollups() las recalcula desde los tickets y corrige lo que
+esas escrituras no ven (borrados en cascada, cambios por fuera de la app).
+
+Los intervalos horarios se cortan en UTC y los diarios a la medianoche de
+la zona horaria del sitio.
+"""
+import datetime
+from collections import Counter
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from .models import DailySales, Event, EventStats, HourlySales, Ticket, TicketType
+
+ROLLUPS = {"hour": HourlySales, "day": DailySales}
+# Intervalos que devuelve sales_series() si no se indica el rango
+DEFAULT_BUCKETS = {"hour": 48, "day": 30}
+MAX_BUCKETS = 1000
+REBUILD_BATCH_SIZE = 1000
+
+
+class SalesRangeError(ValueError):
+    pass
+
+
+def _tzinfo(granularity):
+    return datetime.timezone.utc if granularity == "hour" else timezone.get_current_timezone()
+
+
+def bucket_start(moment, granularity):
+    """Inicio del intervalo horario o diario que contiene a `moment`."""
+    local = moment.astimezone(_tzinfo(granularity))
+    if granularity == "hour":
+        return local.replace(minute=0, second=0, microsecond=0)
+    return timezone.make_aware(datetime.datetime.combine(local.date(), datetime.time.min), local.tzinfo)
+
+
+def _next_bucket(bucket, granularity):
+    if granularity == "hour":
+        return bucket + datetime.timedelta(hours=1)
+    # Por fecha y no sumando 24 h, para no correrse en los cambios de horario
+    return bucket_start(bucket + datetime.timedelta(hours=25), granularity)
+
+
+def record_sales(changes):
+    """
+    Suma a los rollups los cambios (evento_id, buy_date, tipo, cantidad); las
+    cantidades negativas son cancelaciones. Cambios al mismo intervalo se
+    juntan en un solo UPDATE por tabla.
+    """
+    deltas = Counter()
+    for evento_id, buy_date, type, quantity in changes:
+        for granularity in ROLLUPS:
+            deltas[granularity, evento_id, bucket_start(buy_date, granularity), type] += quantity
+
+    for (granularity, evento_id, bucket, type), quantity in deltas.items():
+        if quantity:
+            _add(ROLLUPS[granularity], evento_id, bucket, type, quantity)
+
+
+def _add(model, evento_id, bucket, type, quantity):
+    revenue = quantity * EventStats.TICKET_PRICES[type]
+    rows = model.objects.filter(evento_id=evento_id, bucket=bucket, type=type)
+    if rows.update(quantity=F("quantity") + quantity, revenue=F("revenue") + revenue):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(evento_id=evento_id, bucket=bucket, type=type, quantity=quantity, revenue=revenue)
+    except IntegrityError:
+        # Otra compra creó la fila entre el UPDATE y el INSERT
+        rows.update(quantity=F("quantity") + quantity, revenue=F("revenue") + revenue)
+
+
+def _bound(value, nombre, granularity, end=False):
+    """Intervalo de `value` (datetime, fecha o AAAA-MM-DD); una fecha de fin cubre todo el día."""
+    if isinstance(value, str):
+        try:
+            value = datetime.date.fromisoformat(value)
+        except ValueError:
+            raise SalesRangeError(f"La fecha '{nombre}' debe tener el formato AAAA-MM-DD.") from None
+    if not isinstance(value, datetime.datetime):
+        value = timezone.make_aware(datetime.datetime.combine(value, datetime.time.max if end else datetime.time.min))
+    return bucket_start(value, granularity)
+
+
+def sales_series(evento_id, granularity="day", desde=None, hasta=None):
+    """
+    Ventas del evento por intervalo entre `desde` y `hasta` (inclusive;
+    datetimes, fechas o AAAA-MM-DD). Por defecto, los últimos DEFAULT_BUCKETS
+    intervalos. Devuelve un dict listo para JSON con una lista por tipo de
+    entrada, alineada con "buckets" y con ceros en los intervalos sin ventas.
+    """
+    if granularity not in ROLLUPS:
+        raise SalesRangeError("Granularidad inválida: usá hour o day.")
+
+    last = _bound(hasta or timezone.now(), "hasta", granularity, end=True)
+    if desde:
+        first = _bound(desde, "desde", granularity)
+    else:
+        first = last
+        for _ in range(DEFAULT_BUCKETS[granularity] - 1):
+            first = bucket_start(first - datetime.timedelta(minutes=1), granularity)
+    if first > last:
+        raise SalesRangeError("La fecha 'desde' no puede ser posterior a 'hasta'.")
+
+    buckets = [first]
+    while buckets[-1] < last:
+        if len(buckets) >= MAX_BUCKETS:
+            raise SalesRangeError(f"El rango no puede tener más de {MAX_BUCKETS} intervalos.")
+        buckets.append(_next_bucket(buckets[-1], granularity))
+    position = {bucket: i for i, bucket in enumerate(buckets)}
+
+    series = {type: [0] * len(buckets) for type in TicketType.values}
+    revenue = [0] * len(buckets)
+    rows = ROLLUPS[granularity].objects.filter(
+        evento_id=evento_id, bucket__gte=first, bucket__lt=_next_bucket(last, granularity)
+    ).values_list("bucket", "type", "quantity", "revenue")
+    for bucket, type, quantity, amount in rows:
+        i = position[bucket]
+        series[type][i] += quantity
+        revenue[i] += amount
+
+    return {
+        "granularity": granularity,
+        "buckets": [bucket.isoformat() for bucket in buckets],
+        "quantity": series,
+        "revenue": revenue,
+        "totals": {**{type: sum(values) for type, values in series.items()}, "revenue": sum(revenue)},
+    }
+
+
+def rebuild_sales_rollups(queryset=None, batch_size=REBUILD_BATCH_SIZE):
+    """Recalcula los rollups de los eventos de `queryset` (por defecto, todos) desde los tickets."""
+    events = Event.objects.all() if queryset is None else queryset
+    with transaction.atomic():
+        for granularity, model in ROLLUPS.items():
+            model.objects.filter(evento__in=events.values("pk")).delete()
+            rows = (
+                Ticket.objects.filter(evento__in=events.values("pk"))
+                .annotate(bucket=Trunc("buy_date", granularity, tzinfo=_tzinfo(granularity)))
+                .order_by()
+                .values("evento_id", "bucket", "type")
+                .annotate(total=Sum("quantity"))
+                .values_list("evento_id", "bucket", "type", "total")
+                .iterator(chunk_size=batch_size)
+            )
+            while batch := list(islice(rows, batch_size)):
+                model.objects.bulk_create([
+                    model(
+                        evento_id=evento_id, bucket=bucket, type=type,
+                        quantity=total, revenue=total * EventStats.TICKET_PRICES[type],
+                    )
+                    for evento_id, bucket, type, total in batch
+                ])
@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class AppConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "app"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from eventhub.database import configure_sqlite_connection
+
+        from . import signals as model_signals  # noqa: F401
+        from .caching import signals as caching_signals  # noqa: F401
+        from .jobs import notifications as notification_jobs  # noqa: F401
+        from .jobs import stats as stats_jobs  # noqa: F401
+        from .search import signals  # noqa: F401
+
+        connection_created.connect(configure_sqlite_connection, dispatch_uid="configure_sqlite")
@@ -0,0 +1,91 @@
+"""
+Caché de fragmentos HTML renderizados.
+
+Cada familia de fragmentos tiene un contador de generación que forma parte
+de la clave. Invalidar es incrementar el contador: las claves viejas dejan
+de leerse y expiran solas por timeout, sin tener que enumerarlas (hay una
+por rol y por cursor de página). Las calificaciones usan un contador por
+evento, así calificar un evento no invalida el detalle de los demás.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.middleware.csrf import get_token
+from django.utils.safestring import mark_safe
+
+EVENTS_LIST = "events_list"
+# El stock "Disponibles" cambia con cada compra sin pasar por Event.save; este
+# timeout acota cuánto puede atrasar el listado.
+EVENTS_LIST_TIMEOUT = 60
+
+EVENT_RATINGS = "event_ratings"
+# Se invalida en cada cambio de calificaciones; el timeout solo cubre cambios
+# de nombre de usuario, que no se rastrean.
+EVENT_RATINGS_TIMEOUT = 600
+
+# Los fragmentos se renderizan con este valor en lugar del token CSRF del
+# usuario, y with_csrf_token lo reemplaza al servirlos.
+CSRF_PLACEHOLDER = "__csrf_token_placeholder__"
+
+
+def _generation_key(name):
+    return f"generation:{name}"
+
+
+def get_generation(name):
+    value = cache.get(_generation_key(name))
+    if value is None:
+        # Arranca desde el reloj: si el contador se pierde (reinicio, desalojo)
+        # nunca vuelve a un número con fragmentos viejos todavía en caché.
+        cache.add(_generation_key(name), time.time_ns(), timeout=None)
+        value = cache.get(_generation_key(name), 0)
+    return value
+
+
+async def aget_generation(name):
+    value = await cache.aget(_generation_key(name))
+    if value is None:
+        await cache.aadd(_generation_key(name), time.time_ns(), timeout=None)
+        value = await cache.aget(_generation_key(name), 0)
+    return value
+
+
+def bump_generation(name):
+    try:
+        cache.incr(_generation_key(name))
+    except ValueError:
+        cache.set(_generation_key(name), time.time_ns(), timeout=None)
+
+
+def _fragment_key(name, generation, parts):
+    digest = hashlib.md5(":".join(str(p) for p in parts).encode()).hexdigest()
+    return f"fragment:{name}:{generation}:{digest}"
+
+
+def fragment_key(name, *parts):
+    return _fragment_key(name, get_generation(name), parts)
+
+
+async def afragment_key(name, *parts):
+    return _fragment_key(name, await aget_generation(name), parts)
+
+
+async def aevents_list_key(role, cursor, ordering="fecha"):
+    return await afragment_key(EVENTS_LIST, role, ordering, cursor or "first")
+
+
+def event_ratings_generation(event_id):
+    return f"{EVENT_RATINGS}:{event_id}"
+
+
+def event_ratings_key(event_id, role, cursor=None):
+    return fragment_key(event_ratings_generation(event_id), role, cursor or "first")
+
+
+async def aevent_ratings_key(event_id, role, cursor=None):
+    return await afragment_key(event_ratings_generation(event_id), role, cursor or "first")
+
+
+def with_csrf_token(fragment, request):
+    return mark_safe(fragment.replace(CSRF_PLACEHOLDER, get_token(request)))
@@ -0,0 +1,17 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from ..models import Event
+from . import EVENTS_LIST, bump_generation, event_ratings_generation
+
+
+@receiver(post_save, sender=Event, dispatch_uid="events_list_cache_save")
+@receiver(post_delete, sender=Event, dispatch_uid="events_list_cache_delete")
+def invalidate_event_fragments(sender, instance, **kwargs):
+    # Después del commit: antes, otro request podría cachear la versión vieja con la generación nueva
+    transaction.on_commit(lambda: bump_generation(EVENTS_LIST))
+    # update_with_notification pasa por save(): editar el evento también renueva su detalle
+    name = event_ratings_generation(instance.pk)
+    transaction.on_commit(lambda: bump_generation(name))
+
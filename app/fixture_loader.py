@@ -0,0 +1,216 @@
+"""
+Carga rápida de fixtures JSON (el formato de dumpdata/loaddata).
+
+loaddata lee el fixture entero en memoria y guarda los objetos de a uno. Acá
+el archivo se lee de a un objeto con app.jsonstream, los objetos se juntan
+por modelo y cada modelo se inserta de a FIXTURE_BATCH_SIZE filas con un
+solo INSERT por lote. Antes de insertar un lote se insertan los pendientes
+de los modelos a los que apunta, así las claves foráneas encuentran a su
+fila aunque el fixture no venga ordenado. Como loaddata, todo corre en una
+transacción y la integridad referencial se verifica al final.
+"""
+import gzip
+from collections import Counter, defaultdict
+from functools import cache
+
+from django.core.management.color import no_style
+from django.core.serializers.python import Deserializer
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models.constants import OnConflict
+
+from .analytics import rebuild_sales_rollups
+from .caching import EVENTS_LIST, bump_generation
+from .jsonstream import iter_json_items
+from .models import Comment, Event, EventStats, Rating, RefundRequest, Ticket
+from .search import get_backend
+
+FIXTURE_BATCH_SIZE = 2000
+# Eventos por consulta al recalcular sus agregados (cada id es un parámetro del IN)
+REBUILD_CHUNK_SIZE = 500
+
+
+def open_fixture(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+@cache
+def _dependencies(model):
+    """Modelos cuyas filas tienen que existir antes de insertar las de `model`."""
+    related = {f.related_model for f in model._meta.concrete_fields if f.is_relation}
+    related |= {f.related_model for f in model._meta.local_many_to_many}
+    related.discard(model)
+    return related
+
+
+def _on_conflict(connection, model):
+    """Si la fila ya existe se actualiza, igual que loaddata al guardar un objeto con pk existente."""
+    features = connection.features
+    update_fields = [f for f in model._meta.local_concrete_fields if not f.primary_key and not f.generated]
+    if not update_fields:
+        return (OnConflict.IGNORE if features.supports_ignore_conflicts else None), None, None
+    if features.supports_update_conflicts_with_target:
+        return OnConflict.UPDATE, update_fields, [model._meta.pk]
+    if features.supports_update_conflicts:
+        return OnConflict.UPDATE, update_fields, None
+    return None, None, None
+
+
+class FixtureLoader:
+    def __init__(self, using=DEFAULT_DB_ALIAS, batch_size=FIXTURE_BATCH_SIZE):
+        self.using = using
+        self.connection = connections[using]
+        self.batch_size = batch_size
+        self.pending = defaultdict(list)
+        self.counts = Counter()
+        self.models = set()
+        # Objetos sin pk o con herencia multitabla: se guardan de a uno como en loaddata
+        self.one_by_one = []
+        # Objetos con claves naturales que apuntan a filas que todavía no se cargaron
+        self.deferred = []
+        # Eventos cuyos agregados (calificaciones, EventStats, ventas) hay que recalcular
+        self.events = set()
+        self.refund_tickets = set()
+
+    def add(self, obj):
+        model = type(obj.object)
+        self.models.add(model)
+        if obj.deferred_fields:
+            self.deferred.append(obj)
+        if obj.object.pk is None or model._meta.parents:
+            self.one_by_one.append(obj)
+            return
+        self.pending[model].append(obj)
+        if len(self.pending[model]) >= self.batch_size:
+            self.flush(model)
+
+    def flush(self, model, visiting=None):
+        visiting = visiting if visiting is not None else set()
+        visiting.add(model)
+        for parent in _dependencies(model):
+            # visiting corta los ciclos; la verificación diferida cubre esos casos
+            if self.pending.get(parent) and parent not in visiting:
+                self.flush(parent, visiting)
+        objs = self.pending.pop(model, [])
+        if objs:
+            self._insert(model, objs)
+
+    def finish(self):
+        for model in list(self.pending):
+            self.flush(model)
+        for obj in self.one_by_one:
+            obj.save(using=self.using)
+            self._touch(obj.object)
+            self.counts[obj.object._meta.label] += 1
+        for obj in self.deferred:
+            obj.save_deferred_fields(using=self.using)
+
+    def _insert(self, model, objs):
+        fields = [f for f in model._meta.local_concrete_fields if not f.generated]
+        instances = [obj.object for obj in objs]
+        on_conflict, update_fields, unique_fields = _on_conflict(self.connection, model)
+        batch_size = max(min(self.batch_size, self.connection.ops.bulk_batch_size(fields, instances)), 1)
+        for start in range(0, len(instances), batch_size):
+            # El mismo INSERT que bulk_create, pero raw como en loaddata: los valores de
+            # auto_now/auto_now_add del fixture se guardan tal cual
+            model._base_manager._insert(
+                instances[start:start + batch_size],
+                fields=fields,
+                raw=True,
+                using=self.using,
+                on_conflict=on_conflict,
+                update_fields=update_fields,
+                unique_fields=unique_fields,
+            )
+        self._insert_m2m(objs)
+        for instance in instances:
+            self._touch(instance)
+        self.counts[model._meta.label] += len(objs)
+
+    def _touch(self, instance):
+        if isinstance(instance, Event):
+            self.events.add(instance.pk)
+        elif isinstance(instance, (Ticket, Rating)):
+            self.events.add(instance.evento_id)
+        elif isinstance(instance, Comment):
+            self.events.add(instance.event_id)
+        elif isinstance(instance, RefundRequest) and instance.ticket_id is not None:
+            self.refund_tickets.add(instance.ticket_id)
+
+    def touched_events(self):
+        """Ids de los eventos cargados o con tickets, calificaciones, comentarios o reembolsos cargados."""
+        events = set(self.events)
+        for chunk in _chunks(self.refund_tickets):
+            events.update(Ticket.objects.using(self.using).filter(pk__in=chunk).values_list("evento_id", flat=True))
+        events.discard(None)
+        return events
+
+    def _insert_m2m(self, objs):
+        rows = defaultdict(list)
+        for obj in objs:
+            for name, values in (obj.m2m_data or {}).items():
+                field = obj.object._meta.get_field(name)
+                through = field.remote_field.through
+                self.models.add(through)
+                source = through._meta.get_field(field.m2m_field_name()).attname
+                target = through._meta.get_field(field.m2m_reverse_field_name()).attname
+                rows[through].extend(through(**{source: obj.object.pk, target: value}) for value in values)
+        for through, instances in rows.items():
+            through._base_manager.using(self.using).bulk_create(
+                instances, batch_size=self.batch_size, ignore_conflicts=True
+            )
+
+
+def _chunks(ids, size=REBUILD_CHUNK_SIZE):
+    ids = sorted(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def rebuild_aggregates(loader):
+    """
+    Recalcula lo que mantienen Rating.save() y los servicios de compra, que los
+    INSERT del loader no ejecutan, solo para los eventos que tocó la carga.
+    """
+    for chunk in _chunks(loader.touched_events()):
+        events = Event.objects.using(loader.using).filter(pk__in=chunk)
+        if loader.models & {Event, Rating}:
+            # rating_count/rating_sum del fixture (o su falta) no tienen por qué coincidir con las filas
+            Event.rebuild_rating_stats(events)
+        EventStats.rebuild(events)
+        if loader.models & {Event, Ticket}:
+            rebuild_sales_rollups(events)
+
+
+def load_fixtures(paths, using=DEFAULT_DB_ALIAS, batch_size=FIXTURE_BATCH_SIZE, ignorenonexistent=False):
+    """Carga los fixtures JSON de `paths` (pueden estar comprimidos con gzip). Devuelve las filas por modelo."""
+    loader = FixtureLoader(using, batch_size)
+    connection = loader.connection
+    with transaction.atomic(using=using):
+        with connection.constraint_checks_disabled():
+            for path in paths:
+                with open_fixture(path) as stream:
+                    objects = Deserializer(
+                        iter_json_items(stream), using=using, ignorenonexistent=ignorenonexistent,
+                        handle_forward_references=True,
+                    )
+                    for obj in objects:
+                        loader.add(obj)
+            loader.finish()
+
+        connection.check_constraints(table_names=[model._meta.db_table for model in loader.models])
+        # Con pks explícitos las secuencias de PostgreSQL quedan atrás
+        sequence_sql = connection.ops.sequence_reset_sql(no_style(), loader.models)
+        if sequence_sql:
+            with connection.cursor() as cursor:
+                for sql in sequence_sql:
+                    cursor.execute(sql)
+
+        # Las filas no pasan por save(): ni señales de búsqueda ni de caché
+        if Event in loader.models:
+            get_backend().rebuild()
+        rebuild_aggregates(loader)
+        if loader.models:
+            transaction.on_commit(lambda: bump_generation(EVENTS_LIST), using=using)
+    return loader.counts
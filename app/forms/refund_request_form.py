@@ -25,7 +25,7 @@ class RefundRequestForm(forms.ModelForm):
             raise forms.ValidationError("El código de ticket debe ser un número.")
 
         try:
-            Ticket.objects.get(ticket_code=ticket_code, usuario=self.user)
+            self.instance.ticket = Ticket.objects.get(ticket_code=ticket_code, usuario=self.user)
         except Ticket.DoesNotExist:
             raise forms.ValidationError("El ticket ingresado no existe o no pertenece a tu cuenta.")
 
@@ -0,0 +1,6 @@
+from .queue import JobLockLost as JobLockLost
+from .queue import claim as claim
+from .queue import enqueue as enqueue
+from .queue import execute as execute
+from .queue import handler as handler
+from .queue import work as work
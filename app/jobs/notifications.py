@@ -0,0 +1,52 @@
+"""
+Envio de notificaciones a cada destinatario.
+
+Una notificacion global de un evento llega a la bandeja de todos los que
+tienen tickets sin crear filas por usuario (ver Notification.inbox). Lo
+que si es por usuario, el correo, lo hace esta tarea en lotes por id de
+usuario: despues de enviar cada lote guarda en el payload el ultimo id
+enviado, asi un reintento sigue desde ahi sin guardar nada por destinatario.
+
+La entrega es "al menos una vez": si el proceso cae o el guardado falla
+entre el envio de un lote y su progreso, el reintento vuelve a mandar ese
+lote (a lo sumo DELIVERY_BATCH_SIZE correos repetidos). El SMTP no permite
+hacerlo mejor sin registrar cada envio.
+"""
+from django.core.mail import EmailMessage, get_connection
+
+from .queue import handler
+
+DELIVERY_BATCH_SIZE = 500
+
+
+def recipients(notification):
+    """Usuarios con correo que deben recibir `notification`, ordenados por id."""
+    from ..models import Ticket, User
+
+    if notification.user_id is not None:
+        users = User.objects.filter(pk=notification.user_id)
+    elif notification.event_id is not None:
+        users = User.objects.filter(pk__in=Ticket.objects.filter(evento=notification.event_id).values("usuario"))
+    else:
+        users = User.objects.none()
+    return users.exclude(email="").order_by("pk").only("pk", "email")
+
+
+@handler("notifications.deliver")
+def deliver_notification(job):
+    from ..models import Notification
+
+    notification = Notification.objects.filter(pk=job.payload["notification_id"]).first()
+    if notification is None:
+        # Se borro antes de que llegara su turno
+        return
+
+    after = job.payload.get("after", 0)
+    users = recipients(notification)
+    connection = get_connection()
+    while batch := list(users.filter(pk__gt=after)[:DELIVERY_BATCH_SIZE]):
+        connection.send_messages([
+            EmailMessage(notification.title, notification.message, to=[user.email]) for user in batch
+        ])
+        after = batch[-1].pk
+        job.save_progress(after=after)
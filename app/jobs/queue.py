@@ -0,0 +1,137 @@
+"""
+Cola de tareas en segundo plano sobre la base de datos.
+
+Una tarea es una fila de Job con el nombre de su handler y un payload JSON.
+Se encola dentro de la misma transaccion que el cambio que la origina, asi
+que solo existe si ese cambio se confirmo. `manage.py run_workers` las toma
+en lotes, las ejecuta y las reintenta con espera exponencial; al agotar los
+intentos quedan en estado "dead" con el ultimo error, para revisarlas a mano.
+"""
+import logging
+import threading
+import traceback
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+
+# Una tarea "running" sin novedades por mas de esto se considera de un worker caido.
+# Los handlers largos avisan que siguen vivos con Job.save_progress()
+LOCK_TIMEOUT = timedelta(minutes=10)
+RETRY_BASE_SECONDS = 10
+RETRY_MAX_SECONDS = 3600
+
+
+class JobLockLost(Exception):
+    """La tarea la retomo otro worker (esta paso LOCK_TIMEOUT sin avisar): hay que dejarla."""
+
+
+def handler(name):
+    """Registra la funcion decorada como handler de las tareas `name`; recibe el Job."""
+    def register(func):
+        HANDLERS[name] = func
+        return func
+    return register
+
+
+def enqueue(name, payload=None, key=None, run_at=None, max_attempts=5):
+    """
+    Crea una tarea pendiente. Con `key`, encolar de nuevo la misma tarea
+    (un reintento del request, un doble submit) devuelve la ya existente.
+    """
+    from ..models import Job
+
+    fields = {
+        "name": name,
+        "payload": payload or {},
+        "run_at": run_at or timezone.now(),
+        "max_attempts": max_attempts,
+    }
+    if key is None:
+        return Job.objects.create(**fields)
+    try:
+        with transaction.atomic():
+            return Job.objects.create(idempotency_key=key, **fields)
+    except IntegrityError:
+        return Job.objects.get(idempotency_key=key)
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS))
+
+
+def claim(worker, limit=10):
+    """Marca como propias hasta `limit` tareas listas para correr y las devuelve."""
+    from ..models import Job
+
+    now = timezone.now()
+    ready = Q(status=Job.STATUS_PENDING, run_at__lte=now) | Q(
+        status=Job.STATUS_RUNNING, locked_at__lt=now - LOCK_TIMEOUT
+    )
+    with transaction.atomic():
+        # En PostgreSQL cada worker salta las filas que otro ya esta tomando;
+        # en SQLite la transaccion IMMEDIATE ya serializa a los workers
+        ids = list(
+            Job.objects.filter(ready)
+            .order_by("run_at", "id")
+            .select_for_update(skip_locked=True)
+            .values_list("id", flat=True)[:limit]
+        )
+        Job.objects.filter(id__in=ids).update(
+            status=Job.STATUS_RUNNING, locked_by=worker, locked_at=now, attempts=F("attempts") + 1
+        )
+    return list(Job.objects.filter(id__in=ids, locked_by=worker).order_by("run_at", "id"))
+
+
+def execute(job):
+    """Corre el handler de `job`; devuelve True si termino bien."""
+    from ..models import Job
+
+    try:
+        func = HANDLERS.get(job.name)
+        if func is None:
+            raise LookupError(f"No hay handler registrado para {job.name!r}")
+        func(job)
+    except JobLockLost:
+        logger.warning("La tarea %s la retomo otro worker", job)
+        return False
+    except Exception:
+        logger.exception("Fallo la tarea %s (intento %s de %s)", job, job.attempts, job.max_attempts)
+        if job.attempts >= job.max_attempts:
+            update = {"status": Job.STATUS_DEAD, "finished_at": timezone.now()}
+        else:
+            update = {"status": Job.STATUS_PENDING, "run_at": timezone.now() + retry_delay(job.attempts)}
+        # Solo si sigue siendo nuestra: si otro worker la retomo, el estado es suyo
+        Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(
+            locked_by="", locked_at=None, last_error=traceback.format_exc(), **update
+        )
+        return False
+
+    Job.objects.filter(pk=job.pk, locked_by=job.locked_by).update(
+        status=Job.STATUS_DONE, finished_at=timezone.now(), locked_by="", locked_at=None, last_error=""
+    )
+    return True
+
+
+def work(worker, batch_size=10, poll_interval=1.0, stop=None, burst=False):
+    """
+    Toma y ejecuta tareas hasta que se active `stop` (un threading.Event).
+    Con `burst` termina apenas la cola queda vacia. Devuelve cuantas ejecuto.
+    """
+    stop = stop or threading.Event()
+    processed = 0
+    while not stop.is_set():
+        jobs = claim(worker, batch_size)
+        for pending in jobs:
+            execute(pending)
+            processed += 1
+        if not jobs:
+            if burst:
+                break
+            stop.wait(poll_interval)
+    return processed
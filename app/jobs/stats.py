@@ -0,0 +1,40 @@
+"""
+Recálculo periódico de EventStats, de los contadores de calificaciones de
+Event y de los rollups de ventas (app.analytics).
+
+Las escrituras ajustan las estadísticas de a una; lo que esas escrituras no
+ven (borrados en cascada, cargas masivas, carreras entre transacciones) lo
+corrige esta tarea recalculando todo cada STATS_REBUILD_INTERVAL. Cada
+ejecución encola la siguiente con una clave por horario, así varios workers
+o reinicios de run_workers no duplican la tarea.
+"""
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .queue import enqueue, handler
+
+STATS_REBUILD_INTERVAL = timedelta(hours=1)
+
+
+def schedule_stats_rebuild(now=None):
+    """Encola el recálculo del próximo horario (en punto) si todavía no está encolado."""
+    now = now or timezone.now()
+    run_at = now.replace(minute=0, second=0, microsecond=0) + STATS_REBUILD_INTERVAL
+    return enqueue("event_stats.rebuild", key=f"event-stats-rebuild:{run_at.isoformat()}", run_at=run_at)
+
+
+@handler("event_stats.rebuild")
+def rebuild_event_stats(job):
+    from ..analytics import rebuild_sales_rollups
+    from ..models import Event, EventStats
+
+    # Primero la próxima: si el recálculo falla, la cadena sigue igual
+    schedule_stats_rebuild()
+    # Entre pasos avisa que sigue viva: con muchos eventos el recálculo puede
+    # pasar LOCK_TIMEOUT y otro worker lo correría a la vez
+    EventStats.rebuild()
+    job.save_progress()
+    Event.rebuild_rating_stats()
+    job.save_progress()
+    rebuild_sales_rollups()
@@ -0,0 +1,74 @@
+"""
+Lectura incremental de JSON.
+
+json.load necesita el documento entero en memoria. iter_json_items lee el
+archivo de a READ_SIZE caracteres y devuelve cada elemento del arreglo de
+primer nivel apenas termina de decodificarlo, así que la memoria depende
+del tamaño de un elemento y no del archivo. También acepta NDJSON (un
+valor JSON por línea).
+"""
+import json
+
+READ_SIZE = 64 * 1024
+
+
+def iter_json_items(stream, read_size=READ_SIZE):
+    """Elementos de un arreglo JSON, o valores sucesivos de un NDJSON, leídos de `stream` (texto)."""
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+
+    def read_more():
+        nonlocal buffer, pos, eof
+        chunk = stream.read(read_size)
+        eof = not chunk
+        buffer, pos = buffer[pos:] + chunk, 0
+
+    def peek():
+        # Siguiente caracter significativo, o "" al final del archivo
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if eof:
+                return ""
+            read_more()
+
+    def value():
+        nonlocal pos
+        peek()  # raw_decode no saltea espacios iniciales
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                read_more()
+                continue
+            # Un número justo al final del buffer puede seguir en el próximo pedazo
+            if end == len(buffer) and not eof:
+                read_more()
+                continue
+            pos = end
+            return item
+
+    if peek() != "[":
+        while peek():
+            yield value()
+        return
+
+    pos += 1
+    if peek() == "]":
+        pos += 1
+    else:
+        while True:
+            yield value()
+            separator = peek()
+            pos += 1
+            if separator == "]":
+                break
+            if separator != ",":
+                raise ValueError(f"Se esperaba ',' o ']' y se encontró {separator!r}")
+    if peek():
+        raise ValueError("Hay contenido después del arreglo JSON")
@@ -0,0 +1,51 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.models import User
+from app.services import EventImportError, import_events, import_format
+from app.services.event_import import IMPORT_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa eventos desde un archivo CSV o JSON (arreglo o NDJSON) a nombre de un organizador. "
+        "Las filas inválidas se informan y no se importan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Archivo a importar (.csv, .json, .ndjson o .jsonl).")
+        parser.add_argument("--organizer", required=True, help="Username del organizador de los eventos.")
+        parser.add_argument("--format", choices=["csv", "json"], help="Por defecto, según la extensión.")
+        parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Solo valida, no crea eventos.")
+
+    def handle(self, *args, **options):
+        fmt = options["format"] or import_format(options["path"])
+        if fmt is None:
+            raise CommandError("No se reconoce la extensión del archivo; indicá --format csv o json.")
+        try:
+            organizer = User.objects.get(username=options["organizer"], is_organizer=True)
+        except User.DoesNotExist:
+            raise CommandError(f"No existe el organizador {options['organizer']}.") from None
+
+        started = time.monotonic()
+        try:
+            with open(options["path"], encoding="utf-8-sig", newline="") as stream:
+                report = import_events(
+                    stream, fmt, organizer, batch_size=options["batch_size"], dry_run=options["dry_run"]
+                )
+        except (OSError, EventImportError) as e:
+            raise CommandError(str(e)) from e
+        elapsed = time.monotonic() - started
+
+        for number, errors in report.errors:
+            detalle = "; ".join(f"{campo}: {mensaje}" for campo, mensaje in errors.items())
+            self.stderr.write(f"Fila {number}: {detalle}")
+        if report.rejected > len(report.errors):
+            self.stderr.write(f"... y {report.rejected - len(report.errors)} filas rechazadas más")
+
+        accion = "válidas (sin importar, --dry-run)" if options["dry_run"] else "importadas"
+        self.stdout.write(self.style.SUCCESS(
+            f"{report.created} filas {accion}, {report.rejected} rechazadas en {elapsed:.1f} s"
+        ))
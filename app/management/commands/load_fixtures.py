@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.base import DeserializationError
+from django.db import DEFAULT_DB_ALIAS, DatabaseError
+
+from app.fixture_loader import FIXTURE_BATCH_SIZE, load_fixtures
+
+
+class Command(BaseCommand):
+    help = (
+        "Carga fixtures JSON como loaddata pero por lotes: lee el archivo de a un objeto e inserta "
+        "cada modelo con un INSERT por lote. Acepta archivos .json y .json.gz."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="Rutas de los fixtures.")
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument("--batch-size", type=int, default=FIXTURE_BATCH_SIZE)
+        parser.add_argument(
+            "--ignorenonexistent", "-i", action="store_true",
+            help="Ignora campos del fixture que ya no existen en el modelo.",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        try:
+            counts = load_fixtures(
+                options["paths"],
+                using=options["database"],
+                batch_size=options["batch_size"],
+                ignorenonexistent=options["ignorenonexistent"],
+            )
+        except (OSError, ValueError, DeserializationError, DatabaseError) as e:
+            raise CommandError(f"No se pudieron cargar los fixtures: {e}") from e
+        elapsed = time.monotonic() - started
+
+        for label, count in sorted(counts.items()):
+            self.stdout.write(f"{label}: {count}")
+        total = sum(counts.values())
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} objetos cargados en {elapsed:.1f} s ({total / max(elapsed, 1e-6):.0f} objetos/s)"
+        ))
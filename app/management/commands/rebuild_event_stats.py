@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from app.analytics import rebuild_sales_rollups
+from app.models import Event, EventStats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula las estadísticas del panel del organizador (EventStats) a partir de "
+        "tickets, calificaciones, comentarios y reembolsos, y las ventas por hora y por día"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--event",
+            type=int,
+            action="append",
+            dest="events",
+            help="ID de evento a recalcular (se puede repetir). Por defecto, todos.",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Event.objects.all()
+        if options["events"]:
+            queryset = queryset.filter(pk__in=options["events"])
+
+        processed = EventStats.rebuild(queryset)
+        rebuild_sales_rollups(queryset)
+        self.stdout.write(self.style.SUCCESS(f"{processed} eventos recalculados"))
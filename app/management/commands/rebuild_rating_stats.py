@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from app.models import Event
+
+
+class Command(BaseCommand):
+    help = "Recalcula rating_count y rating_sum de cada evento a partir de sus Ratings"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--event",
+            type=int,
+            action="append",
+            dest="events",
+            help="ID de evento a recalcular (se puede repetir). Por defecto, todos.",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Event.objects.all()
+        if options["events"]:
+            queryset = queryset.filter(pk__in=options["events"])
+
+        updated = Event.rebuild_rating_stats(queryset)
+        self.stdout.write(self.style.SUCCESS(f"{updated} eventos actualizados"))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from app.search import get_backend
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el indice de busqueda de eventos desde la tabla de eventos"
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Indice reconstruido con {type(backend).__name__}"))
@@ -0,0 +1,76 @@
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from app.jobs import work
+from app.jobs.stats import schedule_stats_rebuild
+
+
+def _run_worker(batch_size, poll_interval, burst):
+    # Con el método spawn (macOS, Windows) el hijo arranca sin Django configurado
+    django.setup()
+    stop = threading.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        # Termina la tarea en curso y sale
+        signal.signal(signum, lambda *_: stop.set())
+    try:
+        return work(
+            f"{socket.gethostname()}:{os.getpid()}",
+            batch_size=batch_size,
+            poll_interval=poll_interval,
+            stop=stop,
+            burst=burst,
+        )
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Procesa la cola de tareas en segundo plano (app.jobs) con un pool de procesos"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=2, help="Cantidad de procesos worker.")
+        parser.add_argument("--batch-size", type=int, default=10, help="Tareas que toma cada worker por vez.")
+        parser.add_argument(
+            "--poll-interval", type=float, default=1.0, help="Segundos de espera cuando la cola está vacía."
+        )
+        parser.add_argument(
+            "--burst", action="store_true", help="Terminar cuando no queden tareas listas en lugar de esperar."
+        )
+
+    def handle(self, *args, **options):
+        worker_args = (options["batch_size"], options["poll_interval"], options["burst"])
+        # Las tareas periódicas se reencolan solas; esto arranca la cadena la primera vez
+        schedule_stats_rebuild()
+
+        if options["processes"] <= 1:
+            processed = _run_worker(*worker_args)
+            self.stdout.write(self.style.SUCCESS(f"{processed} tareas procesadas"))
+            return
+
+        # Cada proceso abre sus propias conexiones
+        connections.close_all()
+        workers = [
+            multiprocessing.Process(target=_run_worker, args=worker_args, name=f"worker-{i}")
+            for i in range(options["processes"])
+        ]
+        for worker in workers:
+            worker.start()
+
+        def stop_workers(signum, frame):
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+
+        signal.signal(signal.SIGTERM, stop_workers)
+        # Ctrl+C ya les llega a los hijos por el grupo de procesos
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        for worker in workers:
+            worker.join()
+        self.stdout.write(self.style.SUCCESS(f"{len(workers)} workers terminados"))
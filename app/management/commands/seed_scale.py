@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.models import User
+from app.seeding import DEFAULT_BATCH_SIZE, SCALE_BASE, SEED_PASSWORD, USER_PREFIX, seed_scale
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera datos sintéticos a escala (usuarios, eventos, tickets, ratings, comentarios, "
+        "notificaciones y reembolsos). Con la misma semilla genera siempre los mismos datos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale", type=float, default=1.0,
+            help="Multiplicador sobre las cantidades base (1.0 = 1000 eventos y 10000 tickets).",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Semilla de los generadores aleatorios.")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        for name, base in SCALE_BASE.items():
+            parser.add_argument(f"--{name}", type=int, help=f"Cantidad exacta de {name} (base: {base}).")
+
+    def handle(self, *args, **options):
+        suffix = f"_{options['seed']}" if options["seed"] else ""
+        if User.objects.filter(username=f"{USER_PREFIX}{suffix}_0").exists():
+            raise CommandError(
+                f"Ya existen datos sembrados con la semilla {options['seed']}; usá otra --seed o vaciá la base."
+            )
+
+        started = time.monotonic()
+        created = seed_scale(
+            scale=options["scale"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            stdout=self.stdout,
+            **{name: options[name] for name in SCALE_BASE},
+        )
+        elapsed = time.monotonic() - started
+
+        total = sum(created.values())
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} filas creadas en {elapsed:.1f} s ({total / max(elapsed, 1e-6):.0f} filas/s). "
+            f"Contraseña de todos los usuarios: {SEED_PASSWORD}"
+        ))
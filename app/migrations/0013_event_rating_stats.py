@@ -0,0 +1,37 @@
+# Generated by Django 5.2 on 2026-10-18 16:44
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_rating_stats(apps, schema_editor):
+    Event = apps.get_model('app', 'Event')
+    for event in Event.objects.annotate(
+        total_count=Count('organized_ratings'),
+        total_sum=Sum('organized_ratings__rating'),
+    ).filter(total_count__gt=0):
+        Event.objects.filter(pk=event.pk).update(
+            rating_count=event.total_count,
+            rating_sum=event.total_sum,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0012_merge_0011_event_location_0011_refundrequest_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_rating_stats, migrations.RunPython.noop),
+    ]
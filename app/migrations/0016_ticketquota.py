@@ -0,0 +1,42 @@
+# Generated by Django 5.2 on 2026-10-18 16:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_ticket_quotas(apps, schema_editor):
+    Ticket = apps.get_model('app', 'Ticket')
+    TicketQuota = apps.get_model('app', 'TicketQuota')
+    totales = Ticket.objects.values('usuario', 'evento').annotate(total=Sum('quantity'))
+    TicketQuota.objects.bulk_create(
+        [
+            TicketQuota(usuario_id=t['usuario'], evento_id=t['evento'], quantity=t['total'])
+            for t in totales.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0015_notificationread'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketQuota',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.PositiveIntegerField(default=0)),
+                ('evento', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ticket_quotas', to='app.event')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ticket_quotas', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('usuario', 'evento'), name='unique_ticket_quota')],
+            },
+        ),
+        migrations.RunPython(backfill_ticket_quotas, migrations.RunPython.noop),
+    ]
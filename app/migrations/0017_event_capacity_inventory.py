@@ -0,0 +1,37 @@
+# Generated by Django 5.2 on 2026-10-18 16:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0016_ticketquota'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='general_capacity',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='vip_capacity',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='TicketInventory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(choices=[('general', 'General'), ('VIP', 'VIP')], max_length=10)),
+                ('shard', models.PositiveSmallIntegerField()),
+                ('remaining', models.PositiveIntegerField(default=0)),
+                ('evento', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inventory', to='app.event')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('evento', 'type', 'shard'), name='unique_inventory_shard')],
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2 on 2026-10-18 17:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_refund_tickets(apps, schema_editor):
+    RefundRequest = apps.get_model('app', 'RefundRequest')
+    Ticket = apps.get_model('app', 'Ticket')
+    refunds = RefundRequest.objects.filter(ticket__isnull=True, ticket_code__regex=r'^[0-9]+$')
+
+    lote = []
+    for refund in refunds.only('id', 'ticket_code').iterator(chunk_size=500):
+        lote.append(refund)
+        if len(lote) == 500:
+            _link(RefundRequest, Ticket, lote)
+            lote = []
+    _link(RefundRequest, Ticket, lote)
+
+
+def _link(RefundRequest, Ticket, refunds):
+    existentes = set(
+        Ticket.objects.filter(pk__in=[int(r.ticket_code) for r in refunds]).values_list('pk', flat=True)
+    )
+    actualizar = []
+    for refund in refunds:
+        if int(refund.ticket_code) in existentes:
+            refund.ticket_id = int(refund.ticket_code)
+            actualizar.append(refund)
+    RefundRequest.objects.bulk_update(actualizar, ['ticket'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0017_event_capacity_inventory'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='refundrequest',
+            name='ticket',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='refund_requests', to='app.ticket'),
+        ),
+        migrations.RunPython(backfill_refund_tickets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2 on 2026-10-18 17:18
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Sum
+
+
+def remove_duplicate_ratings(apps, schema_editor):
+    # Conserva la calificación más reciente de cada (usuario, evento) y recalcula
+    # los contadores de los eventos afectados antes de crear la restricción única.
+    Event = apps.get_model('app', 'Event')
+    Rating = apps.get_model('app', 'Rating')
+    duplicados = (
+        Rating.objects.values('usuario', 'evento')
+        .annotate(total=Count('id'), ultimo=Max('id'))
+        .filter(total__gt=1)
+    )
+    eventos = set()
+    for fila in duplicados:
+        Rating.objects.filter(usuario=fila['usuario'], evento=fila['evento']).exclude(
+            id=fila['ultimo']
+        ).delete()
+        eventos.add(fila['evento'])
+
+    for event in Event.objects.filter(pk__in=eventos).annotate(
+        total_count=Count('organized_ratings'),
+        total_sum=Sum('organized_ratings__rating'),
+    ):
+        Event.objects.filter(pk=event.pk).update(
+            rating_count=event.total_count,
+            rating_sum=event.total_sum or 0,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0020_event_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['event', '-created_at'], name='comment_event_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['user', 'event'], name='notif_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='refundrequest',
+            index=models.Index(fields=['user', 'status'], name='refund_user_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='refundrequest',
+            index=models.Index(fields=['-created_at', '-id'], name='refund_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['usuario', 'evento'], name='ticket_user_event_idx'),
+        ),
+        migrations.RunPython(remove_duplicate_ratings, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='rating',
+            constraint=models.UniqueConstraint(fields=('usuario', 'evento'), name='unique_rating_per_user_event'),
+        ),
+    ]
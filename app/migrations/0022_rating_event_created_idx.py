@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-18 17:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0021_indexes_and_constraints'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rating',
+            index=models.Index(fields=['evento', '-created_at', '-id'], name='rating_event_created_idx'),
+        ),
+    ]
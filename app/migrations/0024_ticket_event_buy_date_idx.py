@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-18 18:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0023_job_queue_and_notification_delivery'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['evento', 'buy_date'], name='ticket_event_buy_date_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2 on 2026-10-18 18:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0024_ticket_event_buy_date_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventStats',
+            fields=[
+                ('evento', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='app.event')),
+                ('general_sold', models.IntegerField(default=0)),
+                ('vip_sold', models.IntegerField(default=0)),
+                ('revenue', models.BigIntegerField(default=0)),
+                ('rating_1', models.IntegerField(default=0)),
+                ('rating_2', models.IntegerField(default=0)),
+                ('rating_3', models.IntegerField(default=0)),
+                ('rating_4', models.IntegerField(default=0)),
+                ('rating_5', models.IntegerField(default=0)),
+                ('comment_count', models.IntegerField(default=0)),
+                ('refunds_pending', models.IntegerField(default=0)),
+                ('refunds_approved', models.IntegerField(default=0)),
+                ('refunds_rejected', models.IntegerField(default=0)),
+                ('rebuilt_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['organizer', 'scheduled_at', 'id'], name='event_organizer_sched_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2 on 2026-10-18 19:09
+
+from django.db import migrations, models
+from django.db.models import ExpressionWrapper, F, FloatField, Value
+
+# Copia de Event.RATING_PRIOR_MEAN y RATING_PRIOR_WEIGHT al momento de la migración
+PRIOR_MEAN = 3.0
+PRIOR_WEIGHT = 5
+
+
+def backfill_rating_score(apps, schema_editor):
+    Event = apps.get_model('app', 'Event')
+    Event.objects.filter(rating_count__gt=0).update(
+        rating_score=ExpressionWrapper(
+            (Value(PRIOR_MEAN * PRIOR_WEIGHT) + F('rating_sum')) / (Value(float(PRIOR_WEIGHT)) + F('rating_count')),
+            output_field=FloatField(),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0026_sales_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='rating_score',
+            field=models.FloatField(default=3.0),
+        ),
+        migrations.RunPython(backfill_rating_score, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['rating_score', 'id'], name='event_rating_score_idx'),
+        ),
+    ]
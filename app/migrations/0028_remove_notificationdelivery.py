@@ -0,0 +1,16 @@
+# Generated by Django 5.2 on 2026-10-18 19:41
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0027_event_rating_score'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='NotificationDelivery',
+        ),
+    ]
@@ -1,8 +1,30 @@
+from itertools import islice
+
 from django.contrib.auth.models import AbstractUser
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
-from django.db.models import Avg
+from django.db import models, transaction
+from django.db.models import (
+    BooleanField,
+    Count,
+    Exists,
+    ExpressionWrapper,
+    F,
+    FloatField,
+    Func,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .caching import bump_generation, event_ratings_generation
+from .jobs import JobLockLost, enqueue
+from .pagination import keyset_filter
 
 
 # === MODELOS PARA USERs ===
@@ -41,19 +63,60 @@ class Event(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     location = models.CharField(max_length=255, default="Por definir")
 
+    # Cupo por tipo de entrada; None = sin limite. Se cambia con app.services.set_capacity
+    general_capacity = models.PositiveIntegerField(null=True, blank=True)
+    vip_capacity = models.PositiveIntegerField(null=True, blank=True)
+
+    # Agregados desnormalizados de Rating, mantenidos por Rating.save()/delete()
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    # Promedio bayesiano: el promedio real tirado hacia RATING_PRIOR_MEAN como si el
+    # evento tuviera además RATING_PRIOR_WEIGHT calificaciones de ese valor. Con pocas
+    # calificaciones pesa el prior, con muchas el promedio real
+    rating_score = models.FloatField(default=3.0)  # = RATING_PRIOR_MEAN
+
+    # Campos que solo se escriben con update() atomicos; save() no los pisa
+    DENORMALIZED_FIELDS = ("rating_count", "rating_sum", "rating_score", "general_capacity", "vip_capacity")
+    CAPACITY_FIELDS = {"general": "general_capacity", "VIP": "vip_capacity"}
+    RATING_PRIOR_MEAN = 3.0
+    RATING_PRIOR_WEIGHT = 5
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["scheduled_at", "id"], name="event_scheduled_idx"),
+            # Eventos de un organizador por fecha (panel del organizador)
+            models.Index(fields=["organizer", "scheduled_at", "id"], name="event_organizer_sched_idx"),
+            # Listado "mejor calificados" (se recorre en orden descendente)
+            models.Index(fields=["rating_score", "id"], name="event_rating_score_idx"),
+        ]
+
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # Una instancia vieja en memoria no debe sobrescribir los contadores
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.DENORMALIZED_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
     @classmethod
     def validate(cls, title, description, scheduled_at):
         errors = {}
 
         if title == "":
             errors["title"] = "Por favor ingrese un titulo"
+        elif title is not None and len(title) > cls._meta.get_field("title").max_length:
+            errors["title"] = "El titulo es demasiado largo"
 
         if description == "":
             errors["description"] = "Por favor ingrese una descripcion"
 
+        if scheduled_at is None:
+            errors["scheduled_at"] = "Por favor ingrese una fecha valida"
+
         return errors
 
     @classmethod
@@ -80,8 +143,52 @@ class Event(models.Model):
 
         self.save()
 
+    def capacity_for(self, type):
+        field = self.CAPACITY_FIELDS.get(type)
+        return getattr(self, field) if field else None
+
     def promedio_rating(self):
-        return self.organized_ratings.aggregate(promedio=Avg('rating'))['promedio'] or 0 # type: ignore
+        if self.rating_count == 0:
+            return 0
+        return self.rating_sum / self.rating_count
+
+    @classmethod
+    def bayesian_score(cls, count, total):
+        """rating_score para `count` calificaciones que suman `total`."""
+        return (cls.RATING_PRIOR_MEAN * cls.RATING_PRIOR_WEIGHT + total) / (cls.RATING_PRIOR_WEIGHT + count)
+
+    @classmethod
+    def bayesian_score_expression(cls, count, total):
+        """bayesian_score en SQL; los valores float evitan la división entera de SQLite."""
+        return ExpressionWrapper(
+            (Value(cls.RATING_PRIOR_MEAN * cls.RATING_PRIOR_WEIGHT) + total)
+            / (Value(float(cls.RATING_PRIOR_WEIGHT)) + count),
+            output_field=FloatField(),
+        )
+
+    def apply_rating_delta(self, count, total):
+        # El SET usa los valores previos de cada columna: el puntaje sale del mismo UPDATE
+        Event.objects.filter(pk=self.pk).update(
+            rating_count=F("rating_count") + count,
+            rating_sum=F("rating_sum") + total,
+            rating_score=self.bayesian_score_expression(F("rating_count") + count, F("rating_sum") + total),
+        )
+        self.refresh_from_db(fields=["rating_count", "rating_sum", "rating_score"])
+
+    @classmethod
+    def rebuild_rating_stats(cls, queryset=None):
+        queryset = cls.objects.all() if queryset is None else queryset
+        updated = 0
+        for event in queryset.annotate(
+            total_count=Count("organized_ratings"),
+            total_sum=Sum("organized_ratings__rating"),
+        ).only("pk", "rating_count", "rating_sum", "rating_score").iterator(chunk_size=1000):
+            count, total = event.total_count, event.total_sum or 0 # type: ignore
+            score = cls.bayesian_score(count, total)
+            if (event.rating_count, event.rating_sum) != (count, total) or abs(event.rating_score - score) > 1e-9:
+                cls.objects.filter(pk=event.pk).update(rating_count=count, rating_sum=total, rating_score=score)
+                updated += 1
+        return updated
     
     def update_with_notification(self, title, description, scheduled_at, location):
         # Obtener valores originales desde la base de datos
@@ -108,7 +215,7 @@ class Event(models.Model):
                 priority=Notification.PRIORITY_HIGH,
                 user=None,  # Notificación global
                 event=self
-            )
+            ).schedule_delivery()
 
 
 # === MODELOS PARA COMMENTs ===
@@ -123,10 +230,31 @@ class Comment(models.Model):
     #Relaciona el comentario con un evento
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="comments")
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["event", "-created_at"], name="comment_event_created_idx"),
+        ]
+
     #Para visualizar el contenido de un comentario
     def __str__(self):
         return f"Comentario de {self.user.username} sobre {self.event.title}"
 
+    # El contador de EventStats se ajusta acá y no con señales, igual que Rating
+    def save(self, *args, **kwargs):
+        with transaction.atomic(savepoint=False):
+            adding = self._state.adding
+            super().save(*args, **kwargs)
+            if adding:
+                EventStats.apply_delta(self.event_id, comment_count=1) # type: ignore
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(savepoint=False):
+            result = super().delete(*args, **kwargs)
+            # Un comentario ya borrado (instancia vieja, doble envío) no descuenta de nuevo
+            if result[1].get(self._meta.label) == 1:
+                EventStats.apply_delta(self.event_id, comment_count=-1) # type: ignore
+        return result
+
 
 # === MODELOS PARA NOTIFICATIONs ===
 class Notification(models.Model):
@@ -147,9 +275,129 @@ class Notification(models.Model):
 
     event = models.ForeignKey("Event", on_delete=models.CASCADE, null=True, blank=True)
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
+
+    INBOX_PAGE_SIZE = 20
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "-created_at", "-id"], name="notif_user_created_idx"),
+            models.Index(fields=["event", "-created_at", "-id"], name="notif_event_created_idx"),
+            # Índice parcial: solo las no leídas, que es lo que cuenta el badge de la bandeja
+            models.Index(fields=["user", "event"], condition=Q(is_read=False), name="notif_unread_idx"),
+        ]
+
     def __str__(self):
         return self.title
 
+    @classmethod
+    def inbox_filter(cls, user):
+        # Notificaciones propias + globales de eventos para los que el usuario tiene tickets
+        eventos = Ticket.objects.filter(usuario=user).values("evento")
+        return Q(user=user) | Q(user__isnull=True, event__in=eventos)
+
+    @classmethod
+    def unread_filter(cls, user):
+        # Una global se considera leida por el usuario si tiene su acuse en NotificationRead
+        acuse = NotificationRead.objects.filter(notification=OuterRef("pk"), user=user)
+        return Q(is_read=False) & ~Exists(acuse)
+
+    @classmethod
+    def unread_for(cls, user):
+        return cls.objects.filter(cls.inbox_filter(user), cls.unread_filter(user))
+
+    @classmethod
+    def _inbox_queryset(cls, user, before=None):
+        inbox = cls.inbox_filter(user)
+        unread_filter = cls.unread_filter(user)
+        unread = (
+            cls.objects.filter(inbox, unread_filter)
+            .order_by()
+            .annotate(total=Func("pk", function="COUNT"))
+            .values("total")
+        )
+        queryset = (
+            cls.objects.filter(inbox)
+            .select_related("event")
+            .annotate(
+                inbox_unread=Subquery(unread, output_field=IntegerField()),
+                read_by_user=ExpressionWrapper(~unread_filter, output_field=BooleanField()),
+            )
+            .order_by("-created_at", "-id")
+        )
+        if before is not None:
+            queryset = queryset.filter(keyset_filter("created_at", before, descending=True))
+        return queryset
+
+    @classmethod
+    def inbox(cls, user, before=None, limit=INBOX_PAGE_SIZE):
+        """
+        Devuelve (notificaciones, no_leidas, hay_mas) con una sola consulta:
+        la pagina se recorre por cursor (created_at, id) descendente y el
+        total de no leidas viaja como subconsulta escalar en cada fila.
+        Cada notificacion trae `read_by_user` con su estado para ese usuario.
+        """
+        page = list(cls._inbox_queryset(user, before)[: limit + 1])
+        has_more = len(page) > limit
+        page = page[:limit]
+
+        if page:
+            unread_count = page[0].inbox_unread # type: ignore
+        else:
+            unread_count = cls.unread_for(user).count()
+        return page, unread_count, has_more
+
+    @classmethod
+    async def ainbox(cls, user, before=None, limit=INBOX_PAGE_SIZE):
+        """Version de inbox para vistas async."""
+        page = [n async for n in cls._inbox_queryset(user, before)[: limit + 1]]
+        has_more = len(page) > limit
+        page = page[:limit]
+
+        if page:
+            unread_count = page[0].inbox_unread # type: ignore
+        else:
+            unread_count = await cls.unread_for(user).acount()
+        return page, unread_count, has_more
+
+    def is_read_by(self, user):
+        if self.is_read:
+            return True
+        return self.user is None and self.reads.filter(user=user).exists() # type: ignore
+
+    def schedule_delivery(self):
+        # El envío a cada destinatario lo hace un worker (app.jobs.notifications);
+        # la tarea se confirma junto con la notificación
+        enqueue(
+            "notifications.deliver",
+            {"notification_id": self.pk},
+            key=f"notification-delivery:{self.pk}",
+        )
+
+    def mark_read_by(self, user):
+        # Las personales usan su propio flag; las globales registran un acuse por usuario
+        if self.user_id == user.pk: # type: ignore
+            if not self.is_read:
+                self.is_read = True
+                self.save(update_fields=["is_read"])
+        elif self.user_id is None: # type: ignore
+            NotificationRead.objects.get_or_create(notification=self, user=user)
+
+
+class NotificationRead(models.Model):
+    """
+    Acuse de lectura de una notificacion global por un usuario. Solo se crea
+    cuando el usuario la marca como leida, asi que el costo crece con las
+    lecturas y no con la cantidad de destinatarios.
+    """
+    notification = models.ForeignKey(Notification, on_delete=models.CASCADE, related_name="reads")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="notification_reads")
+    read_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "notification"], name="unique_notification_read"),
+        ]
+
 
 # === MODELOS PARA REFUNDREQUESTs ===
 class RefundRequest(models.Model):
@@ -159,6 +407,10 @@ class RefundRequest(models.Model):
         ('rechazado', 'Rechazado'),
     ]
     ticket_code = models.CharField(max_length=100)
+    # Ticket resuelto a partir de ticket_code; queda en NULL si el ticket ya no existe
+    ticket = models.ForeignKey(
+        "Ticket", on_delete=models.SET_NULL, null=True, blank=True, related_name="refund_requests"
+    )
     reason = models.TextField()
     approved = models.BooleanField(default=False)
     approval_date = models.DateField(null=True, blank=True)
@@ -166,9 +418,53 @@ class RefundRequest(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pendiente')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "status"], name="refund_user_status_idx"),
+            models.Index(fields=["-created_at", "-id"], name="refund_created_idx"),
+        ]
+
     def __str__(self):
         return f"Solicitud de devolución para el ticket {self.ticket_code} por {self.user.username}"
 
+    def save(self, *args, **kwargs):
+        # Mantiene el FK alineado con el código ingresado por el usuario
+        if self.ticket_code and str(self.ticket_id) != str(self.ticket_code): # type: ignore
+            code = str(self.ticket_code)
+            self.ticket = Ticket.objects.filter(pk=code).first() if code.isdigit() else None
+        with transaction.atomic(savepoint=False):
+            anterior = None
+            if not self._state.adding:
+                anterior = RefundRequest.objects.filter(pk=self.pk).values_list("status", "ticket__evento_id").first()
+            super().save(*args, **kwargs)
+            actual = (self.status, self.ticket.evento_id if self.ticket else None) # type: ignore
+            if anterior != actual:
+                self._apply_stats([(anterior, -1), (actual, 1)] if anterior else [(actual, 1)])
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(savepoint=False):
+            anterior = RefundRequest.objects.filter(pk=self.pk).values_list("status", "ticket__evento_id").first()
+            result = super().delete(*args, **kwargs)
+            if anterior is not None and result[1].get(self._meta.label) == 1:
+                self._apply_stats([(anterior, -1)])
+        return result
+
+    @staticmethod
+    def _apply_stats(changes):
+        """Aplica cambios ((estado, evento), cantidad) con un UPDATE por evento."""
+        deltas = {}
+        for (status, event_id), count in changes:
+            field = EventStats.REFUND_FIELDS.get(status)
+            if field:
+                fields = deltas.setdefault(event_id, {})
+                fields[field] = fields.get(field, 0) + count
+        for event_id, fields in deltas.items():
+            EventStats.apply_delta(event_id, **fields)
+
+    @property
+    def event_name(self):
+        return self.ticket.evento.title if self.ticket else "Evento no encontrado"
+
 
 # === MODELOS PARA TICKETs ===
 class TicketType(models.TextChoices):
@@ -184,6 +480,13 @@ class Ticket(models.Model):
     buy_date = models.DateTimeField()
     type = models.CharField(max_length=10, choices=TicketType.choices, default=TicketType.GENERAL)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["usuario", "evento"], name="ticket_user_event_idx"),
+            # Exportación de tickets por evento ordenada y filtrada por fecha de compra
+            models.Index(fields=["evento", "buy_date"], name="ticket_event_buy_date_idx"),
+        ]
+
     def __str__(self):
         texto = "{0} ({1})"
         return texto.format(self.ticket_code, self.buy_date)
@@ -194,6 +497,35 @@ class Ticket(models.Model):
         super().save(*args, **kwargs)
 
 
+class TicketQuota(models.Model):
+    # Total de entradas de un usuario para un evento; lo mantiene app.services.ticket_purchase
+    usuario = models.ForeignKey(User, on_delete=models.CASCADE, related_name="ticket_quotas")
+    evento = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="ticket_quotas")
+    quantity = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["usuario", "evento"], name="unique_ticket_quota"),
+        ]
+
+
+class TicketInventory(models.Model):
+    """
+    Stock restante de un tipo de entrada, repartido en varias filas (shards)
+    para que las compras concurrentes descuenten de filas distintas en lugar
+    de bloquearse sobre una sola. Lo mantiene app.services.inventory.
+    """
+    evento = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="inventory")
+    type = models.CharField(max_length=10, choices=TicketType.choices)
+    shard = models.PositiveSmallIntegerField()
+    remaining = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["evento", "type", "shard"], name="unique_inventory_shard"),
+        ]
+
+
 # === MODELOS PARA RATINGs ===
 class Rating(models.Model):
     # title: string, text: string, rating: integer, created_at: datetime
@@ -204,5 +536,258 @@ class Rating(models.Model):
     text = models.CharField (max_length=250)
     rating = models.PositiveSmallIntegerField(
         validators=[MinValueValidator(1), MaxValueValidator(5)])
-    created_at = models.DateTimeField(auto_now_add=True)  
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            # Una sola calificación por usuario y evento; también sirve de índice para (usuario, evento)
+            models.UniqueConstraint(fields=["usuario", "evento"], name="unique_rating_per_user_event"),
+        ]
+        indexes = [
+            # Páginas de reseñas de un evento, de la más nueva a la más vieja
+            models.Index(fields=["evento", "-created_at", "-id"], name="rating_event_created_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            if self._state.adding:
+                super().save(*args, **kwargs)
+                self.evento.apply_rating_delta(1, self.rating)
+                EventStats.apply_delta(self.evento_id, **EventStats.rating_delta(self.rating, 1)) # type: ignore
+            else:
+                anterior = Rating.objects.select_for_update().get(pk=self.pk)
+                super().save(*args, **kwargs)
+                if anterior.evento_id != self.evento_id: # type: ignore
+                    anterior.evento.apply_rating_delta(-1, -anterior.rating)
+                    self.evento.apply_rating_delta(1, self.rating)
+                    EventStats.apply_delta(anterior.evento_id, **EventStats.rating_delta(anterior.rating, -1)) # type: ignore
+                    EventStats.apply_delta(self.evento_id, **EventStats.rating_delta(self.rating, 1)) # type: ignore
+                    self._invalidate_cache(anterior.evento_id) # type: ignore
+                elif anterior.rating != self.rating:
+                    self.evento.apply_rating_delta(0, self.rating - anterior.rating)
+                    EventStats.apply_delta(self.evento_id, **{ # type: ignore
+                        **EventStats.rating_delta(anterior.rating, -1), **EventStats.rating_delta(self.rating, 1)
+                    })
+            self._invalidate_cache(self.evento_id) # type: ignore
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            # La instancia puede estar vieja (doble clic en eliminar, otra edición):
+            # se descuenta lo guardado, y solo si este delete borró la fila
+            anterior = Rating.objects.select_for_update().filter(pk=self.pk).values_list("evento_id", "rating").first()
+            result = super().delete(*args, **kwargs)
+            if anterior is not None and result[1].get(self._meta.label) == 1:
+                evento_id, rating = anterior
+                evento = self.evento if self.evento_id == evento_id else Event(pk=evento_id) # type: ignore
+                evento.apply_rating_delta(-1, -rating)
+                EventStats.apply_delta(evento_id, **EventStats.rating_delta(rating, -1))
+                self._invalidate_cache(evento_id)
+        return result
+
+    @classmethod
+    def discount_user_ratings(cls, usuario):
+        """
+        Descuenta de los contadores de cada evento las calificaciones de
+        `usuario`, que un borrado en cascada elimina sin pasar por delete().
+        Hay a lo sumo una por evento: un UPDATE para Event y uno por valor
+        de estrellas para el histograma de EventStats.
+        """
+        ratings = list(cls.objects.filter(usuario=usuario).values_list("evento_id", "rating"))
+        if not ratings:
+            return
+        propia = Subquery(
+            cls.objects.filter(usuario=usuario, evento=OuterRef("pk")).values("rating"),
+            output_field=IntegerField(),
+        )
+        Event.objects.filter(pk__in=[evento_id for evento_id, _ in ratings]).update(
+            rating_count=F("rating_count") - 1,
+            rating_sum=F("rating_sum") - propia,
+            rating_score=Event.bayesian_score_expression(F("rating_count") - 1, F("rating_sum") - propia),
+        )
+        for rating, field in enumerate(EventStats.RATING_FIELDS, start=1):
+            eventos = [evento_id for evento_id, valor in ratings if valor == rating]
+            if eventos:
+                EventStats.objects.filter(pk__in=eventos).update(**{field: F(field) - 1})
+        for evento_id, _ in ratings:
+            cls._invalidate_cache(evento_id)
+
+    @staticmethod
+    def _invalidate_cache(event_id):
+        # Aquí y no con señales: un receptor de post_delete obligaría a cargar
+        # todas las calificaciones al borrar un evento en cascada
+        name = event_ratings_generation(event_id)
+        transaction.on_commit(lambda: bump_generation(name))
+
+
+
+# === ESTADÍSTICAS PARA EL PANEL DEL ORGANIZADOR ===
+class EventStats(models.Model):
+    """
+    Totales de un evento para el panel del organizador, una fila por evento.
+    Las escrituras (compras, calificaciones, comentarios y reembolsos) los
+    ajustan con UPDATE atómicos; rebuild() los recalcula desde las tablas de
+    origen y corrige lo que se haya desviado (p. ej. borrados en cascada).
+    """
+    evento = models.OneToOneField(Event, on_delete=models.CASCADE, primary_key=True, related_name="stats")
+    general_sold = models.IntegerField(default=0)
+    vip_sold = models.IntegerField(default=0)
+    # Estimada con TICKET_PRICES: los tickets todavía no guardan el precio pagado
+    revenue = models.BigIntegerField(default=0)
+    rating_1 = models.IntegerField(default=0)
+    rating_2 = models.IntegerField(default=0)
+    rating_3 = models.IntegerField(default=0)
+    rating_4 = models.IntegerField(default=0)
+    rating_5 = models.IntegerField(default=0)
+    comment_count = models.IntegerField(default=0)
+    refunds_pending = models.IntegerField(default=0)
+    refunds_approved = models.IntegerField(default=0)
+    refunds_rejected = models.IntegerField(default=0)
+    rebuilt_at = models.DateTimeField(null=True, blank=True)
+
+    # Los mismos precios que muestra ticket/entrada.html
+    TICKET_PRICES = {TicketType.GENERAL: 20000, TicketType.VIP: 40000}
+    SOLD_FIELDS = {TicketType.GENERAL: "general_sold", TicketType.VIP: "vip_sold"}
+    REFUND_FIELDS = {"pendiente": "refunds_pending", "aprobado": "refunds_approved", "rechazado": "refunds_rejected"}
+    RATING_FIELDS = ("rating_1", "rating_2", "rating_3", "rating_4", "rating_5")
+
+    @property
+    def ratings_histogram(self):
+        return [getattr(self, field) for field in self.RATING_FIELDS]
+
+    @property
+    def ratings_by_stars(self):
+        """[(estrellas, cantidad)] de 5 a 1, para mostrar el histograma."""
+        return list(reversed(list(enumerate(self.ratings_histogram, start=1))))
+
+    @classmethod
+    def ticket_delta(cls, type, quantity):
+        return {cls.SOLD_FIELDS[type]: quantity, "revenue": quantity * cls.TICKET_PRICES[type]}
 
+    @classmethod
+    def rating_delta(cls, rating, count):
+        return {cls.RATING_FIELDS[rating - 1]: count}
+
+    @classmethod
+    def apply_delta(cls, event_id, **deltas):
+        """Suma `deltas` ({campo: cantidad}) a la fila del evento con un solo UPDATE."""
+        changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+        if event_id is None or not changes:
+            return
+        if not cls.objects.filter(pk=event_id).update(**changes):
+            # Sin fila todavía (evento nuevo o anterior a la tabla): se calcula desde
+            # cero, lo que ya incluye la escritura en curso
+            cls.rebuild(Event.objects.filter(pk=event_id))
+
+    @classmethod
+    def rebuild(cls, queryset=None, batch_size=1000):
+        """Recalcula las filas de los eventos de `queryset` (por defecto, todos). Devuelve cuántos procesó."""
+        queryset = Event.objects.all() if queryset is None else queryset
+
+        def total(model, fk, aggregate, **filters):
+            rows = model.objects.filter(**{fk: OuterRef("pk")}, **filters).order_by().values(fk)
+            return Coalesce(Subquery(rows.annotate(v=aggregate).values("v")), 0, output_field=IntegerField())
+
+        totals = {
+            field: total(Ticket, "evento", Sum("quantity"), type=type) for type, field in cls.SOLD_FIELDS.items()
+        }
+        for rating, field in enumerate(cls.RATING_FIELDS, start=1):
+            totals[field] = total(Rating, "evento", Count("pk"), rating=rating)
+        totals["comment_count"] = total(Comment, "event", Count("pk"))
+        for status, field in cls.REFUND_FIELDS.items():
+            totals[field] = total(RefundRequest, "ticket__evento", Count("pk"), status=status)
+
+        now = timezone.now()
+        rows = queryset.order_by().annotate(**totals).values("pk", *totals).iterator(chunk_size=batch_size)
+        processed = 0
+        while batch := list(islice(rows, batch_size)):
+            stats = []
+            for row in batch:
+                evento_id = row.pop("pk")
+                row["revenue"] = sum(row[field] * cls.TICKET_PRICES[type] for type, field in cls.SOLD_FIELDS.items())
+                stats.append(cls(evento_id=evento_id, rebuilt_at=now, **row))
+            cls.objects.bulk_create(
+                stats,
+                update_conflicts=True,
+                unique_fields=["evento"],
+                update_fields=[*totals, "revenue", "rebuilt_at"],
+            )
+            processed += len(stats)
+        return processed
+
+
+# === VENTAS POR HORA Y POR DÍA (ver app.analytics) ===
+class SalesRollup(models.Model):
+    """Entradas vendidas y recaudación estimada de un evento por tipo en un intervalo."""
+    evento = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="+")
+    # Inicio del intervalo
+    bucket = models.DateTimeField()
+    type = models.CharField(max_length=10, choices=TicketType.choices)
+    quantity = models.IntegerField(default=0)
+    revenue = models.BigIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+        constraints = [
+            models.UniqueConstraint(fields=["evento", "bucket", "type"], name="%(class)s_event_bucket_type"),
+        ]
+
+    def __str__(self):
+        return f"{self.evento_id} {self.bucket:%Y-%m-%d %H:%M} {self.type}: {self.quantity}" # type: ignore
+
+
+class HourlySales(SalesRollup):
+    pass
+
+
+class DailySales(SalesRollup):
+    pass
+
+
+# === COLA DE TAREAS ===
+class Job(models.Model):
+    """Tarea en segundo plano; ver app.jobs."""
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_DEAD = "dead"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pendiente"),
+        (STATUS_RUNNING, "En ejecución"),
+        (STATUS_DONE, "Terminada"),
+        (STATUS_DEAD, "Fallida"),
+    ]
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    # Encolar dos veces con la misma clave devuelve la tarea existente
+    idempotency_key = models.CharField(max_length=255, unique=True, null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "run_at"], name="job_ready_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+    def save_progress(self, **progress):
+        """
+        Guarda en el payload hasta dónde llegó el handler, para retomar desde ahí
+        si se reintenta, y renueva locked_at para que claim() no la dé por
+        abandonada. Lanza JobLockLost si otro worker ya la retomó.
+        """
+        self.payload.update(progress)
+        self.locked_at = timezone.now()
+        if not Job.objects.filter(pk=self.pk, locked_by=self.locked_by).update(
+            payload=self.payload, locked_at=self.locked_at
+        ):
+            raise JobLockLost(self)
@@ -0,0 +1,140 @@
+"""
+Avisos en vivo de notificaciones nuevas (server-sent events).
+
+Cada proceso ASGI tiene un solo NotificationHub que consulta la tabla de
+notificaciones cada POLL_INTERVAL segundos buscando ids nuevos, sin
+importar cuantos clientes haya conectados. Por cada notificacion nueva
+averigua cuales de los usuarios conectados son destinatarios y les deja
+el aviso en su cola; el navegador suma uno al contador de no leidas, asi
+que no hace falta recontar por usuario en cada aviso.
+
+Los ids se asignan al insertar y no al confirmar: en PostgreSQL una
+transaccion mas lenta puede hacer visible un id menor despues de uno mayor.
+Por eso cada consulta vuelve a mirar los POLL_OVERLAP ids anteriores al
+ultimo visto y descarta los que ya avisó.
+"""
+import asyncio
+import json
+import logging
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 2
+# Ids por detras del ultimo visto que se vuelven a consultar en cada vuelta
+POLL_OVERLAP = 100
+KEEPALIVE_INTERVAL = 25
+# Avisos pendientes por conexion; un cliente que no lee pierde los mas viejos
+QUEUE_SIZE = 50
+# Con WSGI no se puede mantener la conexion: el navegador reintenta cada tanto
+FALLBACK_RETRY_MS = 15000
+
+
+def sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class NotificationHub:
+    def __init__(self, poll_interval=POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self.subscribers = defaultdict(set)
+        self.last_id = None
+        # Ids ya avisados dentro de la ventana de POLL_OVERLAP
+        self.seen = set()
+        self.task = None
+
+    def subscribe(self, user_id):
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.subscribers[user_id].add(queue)
+        loop = asyncio.get_running_loop()
+        if self.task is None or self.task.done() or self.task.get_loop() is not loop:
+            self.task = loop.create_task(self.run())
+        return queue
+
+    def unsubscribe(self, user_id, queue):
+        queues = self.subscribers.get(user_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self.subscribers[user_id]
+
+    async def run(self):
+        while self.subscribers:
+            try:
+                await self.poll()
+            except Exception:
+                # Un error de base no debe cortar los avisos de todo el proceso
+                logger.exception("Fallo la consulta de notificaciones nuevas")
+            await asyncio.sleep(self.poll_interval)
+        # Sin clientes el listener se detiene; al volver arranca desde el ultimo id
+        self.task = None
+
+    async def poll(self):
+        from .models import Notification, Ticket
+
+        if self.last_id is None:
+            # Las que ya existen no se avisan, tampoco las de la ventana
+            recientes = [
+                pk async for pk in Notification.objects.order_by("-pk").values_list("pk", flat=True)[:POLL_OVERLAP]
+            ]
+            self.last_id = recientes[0] if recientes else 0
+            self.seen = set(recientes)
+            return
+
+        nuevas = [
+            n async for n in Notification.objects.filter(pk__gt=self.last_id - POLL_OVERLAP)
+            .order_by("pk")
+            .values("pk", "title", "message", "user_id", "event_id")
+            if n["pk"] not in self.seen
+        ]
+        if not nuevas:
+            return
+        self.last_id = max(self.last_id, nuevas[-1]["pk"])
+        self.seen.update(n["pk"] for n in nuevas)
+        self.seen = {pk for pk in self.seen if pk > self.last_id - POLL_OVERLAP}
+
+        connected = set(self.subscribers)
+        globales = {n["event_id"] for n in nuevas if n["user_id"] is None and n["event_id"] is not None}
+        holders = defaultdict(set)
+        if globales and connected:
+            async for usuario_id, evento_id in (
+                Ticket.objects.filter(evento__in=globales).values_list("usuario_id", "evento_id").distinct()
+            ):
+                if usuario_id in connected:
+                    holders[evento_id].add(usuario_id)
+
+        for n in nuevas:
+            users = holders[n["event_id"]] if n["user_id"] is None else {n["user_id"]} & connected
+            aviso = {"id": n["pk"], "title": n["title"], "message": n["message"]}
+            for user_id in users:
+                for queue in self.subscribers.get(user_id, ()):
+                    if queue.full():
+                        queue.get_nowait()
+                    queue.put_nowait(aviso)
+
+
+hub = NotificationHub()
+
+
+async def notification_events(user, live=True):
+    """Flujo SSE de un usuario: primero el total de no leidas y despues cada aviso."""
+    from .models import Notification
+
+    unread = await Notification.unread_for(user).acount()
+    yield f"retry: {FALLBACK_RETRY_MS}\n" + sse("unread", {"count": unread})
+    if not live:
+        return
+
+    queue = hub.subscribe(user.pk)
+    try:
+        while True:
+            try:
+                aviso = await asyncio.wait_for(queue.get(), KEEPALIVE_INTERVAL)
+            except asyncio.TimeoutError:
+                # Comentario SSE: mantiene viva la conexion a traves de proxies
+                yield ": keepalive\n\n"
+                continue
+            yield sse("notification", aviso)
+    finally:
+        # Django cancela el generador cuando el cliente se desconecta
+        hub.unsubscribe(user.pk, queue)
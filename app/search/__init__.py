@@ -0,0 +1,11 @@
+from .backends import get_backend as get_backend
+from .backends import tokenize as tokenize
+
+
+def search_events(query, limit=20, upcoming_only=True):
+    """Eventos que coinciden con `query`, en orden de relevancia."""
+    from ..models import Event
+
+    ids = get_backend().search(query, limit=limit, upcoming_only=upcoming_only)
+    events = Event.objects.in_bulk(ids)
+    return [events[pk] for pk in ids if pk in events]
@@ -0,0 +1,201 @@
+"""
+Backends de busqueda de eventos.
+
+Cada backend mantiene un indice de texto aparte de la tabla de eventos y
+devuelve los ids de los eventos que coinciden, ordenados por relevancia.
+Se elige con settings.EVENT_SEARCH_BACKEND (ruta a la clase) o, si no esta
+definido, segun el motor de la base de datos.
+"""
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from ..models import Event
+
+MAX_TERMS = 8
+
+
+def tokenize(query):
+    """Palabras de la consulta en minusculas, sin operadores ni comillas."""
+    return re.findall(r"\w+", (query or "").lower())[:MAX_TERMS]
+
+
+class BaseSearchBackend:
+    def index(self, event):
+        raise NotImplementedError
+
+    def index_many(self, events):
+        """Indexa varios eventos de una vez (p. ej. los creados con bulk_create)."""
+        for event in events:
+            self.index(event)
+
+    def remove(self, event_id):
+        raise NotImplementedError
+
+    def rebuild(self):
+        raise NotImplementedError
+
+    def search(self, query, limit=20, upcoming_only=True):
+        """Devuelve la lista de ids de eventos ordenada por relevancia."""
+        raise NotImplementedError
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    """Indice FTS5 (tabla virtual app_event_fts, rowid = id del evento)."""
+
+    table = "app_event_fts"
+    # Peso de cada columna en bm25: titulo > lugar > descripcion
+    weights = (10.0, 1.0, 4.0)
+
+    def index(self, event):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [event.pk])
+            cursor.execute(
+                f"INSERT INTO {self.table} (rowid, title, description, location) VALUES (%s, %s, %s, %s)",
+                [event.pk, event.title, event.description, event.location],
+            )
+
+    def index_many(self, events):
+        rows = [(event.pk, event.title, event.description, event.location) for event in events]
+        with connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {self.table} WHERE rowid = %s", [row[:1] for row in rows])
+            cursor.executemany(
+                f"INSERT INTO {self.table} (rowid, title, description, location) VALUES (%s, %s, %s, %s)",
+                rows,
+            )
+
+    def remove(self, event_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [event_id])
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+            cursor.execute(
+                f"INSERT INTO {self.table} (rowid, title, description, location) "
+                f"SELECT id, title, description, location FROM {Event._meta.db_table}"
+            )
+
+    def search(self, query, limit=20, upcoming_only=True):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        # Cada palabra entre comillas (sin operadores FTS) y con prefijo
+        match = " ".join(f'"{term}"*' for term in terms)
+        sql = (
+            f"SELECT e.id FROM {self.table} f JOIN {Event._meta.db_table} e ON e.id = f.rowid "
+            f"WHERE {self.table} MATCH %s"
+        )
+        params = [match]
+        if upcoming_only:
+            sql += " AND e.scheduled_at >= %s"
+            params.append(timezone.now())
+        sql += f" ORDER BY bm25({self.table}, %s, %s, %s), e.scheduled_at LIMIT %s"
+        params.extend([*self.weights, limit])
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """Tabla app_event_search con un tsvector ponderado por evento e indice GIN."""
+
+    table = "app_event_search"
+    document = (
+        "setweight(to_tsvector('simple', coalesce(%s, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(%s, '')), 'B') || "
+        "setweight(to_tsvector('simple', coalesce(%s, '')), 'C')"
+    )
+
+    def index(self, event):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {self.table} (event_id, document) VALUES (%s, {self.document}) "
+                "ON CONFLICT (event_id) DO UPDATE SET document = EXCLUDED.document",
+                [event.pk, event.title, event.location, event.description],
+            )
+
+    def index_many(self, events):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {self.table} (event_id, document) VALUES (%s, {self.document}) "
+                "ON CONFLICT (event_id) DO UPDATE SET document = EXCLUDED.document",
+                [(event.pk, event.title, event.location, event.description) for event in events],
+            )
+
+    def remove(self, event_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE event_id = %s", [event_id])
+
+    def rebuild(self):
+        document = self.document.replace("%s", "{}").format("title", "location", "description")
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+            cursor.execute(
+                f"INSERT INTO {self.table} (event_id, document) SELECT id, {document} FROM {Event._meta.db_table}"
+            )
+
+    def search(self, query, limit=20, upcoming_only=True):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        sql = (
+            f"SELECT e.id FROM {self.table} s JOIN {Event._meta.db_table} e ON e.id = s.event_id, "
+            "to_tsquery('simple', %s) q WHERE s.document @@ q"
+        )
+        params = [tsquery]
+        if upcoming_only:
+            sql += " AND e.scheduled_at >= %s"
+            params.append(timezone.now())
+        sql += " ORDER BY ts_rank(s.document, q) DESC, e.scheduled_at LIMIT %s"
+        params.append(limit)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+
+class SimpleSearchBackend(BaseSearchBackend):
+    """Respaldo sin indice para otros motores: filtra con icontains."""
+
+    def index(self, event):
+        pass
+
+    def index_many(self, events):
+        pass
+
+    def remove(self, event_id):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def search(self, query, limit=20, upcoming_only=True):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        events = Event.objects.all()
+        for term in terms:
+            events = events.filter(
+                Q(title__icontains=term) | Q(description__icontains=term) | Q(location__icontains=term)
+            )
+        if upcoming_only:
+            events = events.filter(scheduled_at__gte=timezone.now())
+        return list(events.order_by("scheduled_at").values_list("id", flat=True)[:limit])
+
+
+BACKENDS_BY_VENDOR = {
+    "sqlite": SQLiteFTSBackend,
+    "postgresql": PostgresSearchBackend,
+}
+
+
+def get_backend():
+    path = getattr(settings, "EVENT_SEARCH_BACKEND", None)
+    if path:
+        return import_string(path)()
+    return BACKENDS_BY_VENDOR.get(connection.vendor, SimpleSearchBackend)()
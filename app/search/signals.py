@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from ..models import Event
+from .backends import get_backend
+
+
+@receiver(post_save, sender=Event, dispatch_uid="event_search_index")
+def index_event(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not {"title", "description", "location"} & set(update_fields):
+        return
+    get_backend().index(instance)
+
+
+@receiver(post_delete, sender=Event, dispatch_uid="event_search_remove")
+def remove_event(sender, instance, **kwargs):
+    get_backend().remove(instance.pk)
@@ -0,0 +1,246 @@
+"""
+Generador de datos sintéticos para pruebas de escala.
+
+Con la misma semilla y la misma escala produce siempre los mismos datos. Las
+filas se generan de forma perezosa y se insertan con bulk_create por lotes,
+de modo que la memoria no crece con la cantidad de filas. Los contadores
+denormalizados (ratings, cuotas) se calculan en la misma pasada o con un
+único UPDATE al final, nunca fila por fila.
+"""
+import datetime
+import random
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .analytics import rebuild_sales_rollups
+from .models import (
+    Comment,
+    Event,
+    EventStats,
+    Notification,
+    Rating,
+    RefundRequest,
+    Ticket,
+    TicketQuota,
+    TicketType,
+    User,
+)
+from .search import get_backend
+
+# Cantidades para scale=1.0
+SCALE_BASE = {
+    "organizers": 10,
+    "users": 1000,
+    "events": 1000,
+    "tickets": 10000,
+    "ratings": 10000,
+    "comments": 5000,
+    "notifications": 5000,
+    "refunds": 500,
+}
+DEFAULT_BATCH_SIZE = 5000
+SEED_PASSWORD = "password123"
+USER_PREFIX = "seed_user"
+ORGANIZER_PREFIX = "seed_org"
+
+
+def scaled_counts(scale=1.0, **overrides):
+    counts = {name: int(base * scale) for name, base in SCALE_BASE.items()}
+    counts.update({name: value for name, value in overrides.items() if value is not None})
+    counts["organizers"] = max(counts["organizers"], 1)
+    counts["users"] = max(counts["users"], 1)
+    counts["events"] = max(counts["events"], 1)
+    return counts
+
+
+def _insert(model, rows, batch_size):
+    """Inserta un iterable de instancias sin materializarlo entero. Devuelve cuántas filas creó."""
+    rows = iter(rows)
+    total = 0
+    while batch := list(islice(rows, batch_size)):
+        with transaction.atomic():
+            model.objects.bulk_create(batch, batch_size=batch_size)
+        total += len(batch)
+    return total
+
+
+def _last_pk(model):
+    return model.objects.order_by("-pk").values_list("pk", flat=True).first() or 0
+
+
+def _pks(model, after, **filters):
+    """PKs de las filas creadas después de `after` (el último pk antes de insertar)."""
+    return list(model.objects.filter(pk__gt=after, **filters).order_by("pk").values_list("pk", flat=True))
+
+
+class _Pairs:
+    """
+    Reparte pares (usuario, evento) únicos: el par k es del usuario k % U y
+    recorre eventos consecutivos a partir de un desplazamiento propio. Los
+    desplazamientos se concentran en los primeros eventos, así que esos
+    quedan "calientes" como en producción.
+    """
+
+    def __init__(self, users, events, rng):
+        self.users = users
+        self.events = events
+        self.offsets = [int(len(events) * rng.random() ** 3) for _ in users]
+
+    @property
+    def capacity(self):
+        return len(self.users) * len(self.events)
+
+    def __getitem__(self, k):
+        u = k % len(self.users)
+        return self.users[u], self.events[(self.offsets[u] + k // len(self.users)) % len(self.events)]
+
+
+def seed_scale(scale=1.0, seed=0, batch_size=DEFAULT_BATCH_SIZE, stdout=None, **overrides):
+    """
+    Crea organizadores, usuarios, eventos, tickets (con sus cuotas), ratings,
+    comentarios, notificaciones y solicitudes de reembolso. `overrides`
+    reemplaza cualquiera de las cantidades de SCALE_BASE. Devuelve un dict
+    con las filas creadas por modelo.
+    """
+    counts = scaled_counts(scale, **overrides)
+    now = timezone.now()
+    password = make_password(SEED_PASSWORD)
+    created = {}
+
+    def log(message):
+        if stdout is not None:
+            stdout.write(message)
+
+    def rng(stream):
+        # Un generador por tabla: cambiar una cantidad no altera las demás
+        return random.Random(f"{seed}:{stream}")
+
+    # El sufijo de la semilla permite sembrar varias veces la misma base
+    suffix = f"_{seed}" if seed else ""
+    first_user = _last_pk(User)
+    created["organizers"] = _insert(User, (
+        User(username=f"{ORGANIZER_PREFIX}{suffix}_{i}", email=f"org{i}{suffix}@example.com",
+             password=password, is_organizer=True)
+        for i in range(counts["organizers"])
+    ), batch_size)
+    created["users"] = _insert(User, (
+        User(username=f"{USER_PREFIX}{suffix}_{i}", email=f"user{i}{suffix}@example.com", password=password)
+        for i in range(counts["users"])
+    ), batch_size)
+    organizers = _pks(User, first_user, is_organizer=True)
+    users = _pks(User, first_user, is_organizer=False)
+    log(f"usuarios: {created['users']} + {created['organizers']} organizadores")
+
+    r = rng("events")
+    first_event = _last_pk(Event)
+    created["events"] = _insert(Event, (
+        Event(
+            title=f"Evento {i}",
+            description=f"Descripción del evento número {i} con detalles del lugar y la agenda.",
+            location=f"Sala {r.randrange(50)}",
+            scheduled_at=now + datetime.timedelta(minutes=10 * (i + 1)),
+            organizer_id=organizers[i % len(organizers)],
+        )
+        for i in range(counts["events"])
+    ), batch_size)
+    events = _pks(Event, first_event)
+    log(f"eventos: {created['events']}")
+
+    pairs = _Pairs(users, events, rng("pairs"))
+    ticket_count = min(counts["tickets"], pairs.capacity)
+    first_ticket = _last_pk(Ticket)
+
+    def quantities():
+        # Se recorre dos veces (tickets y cuotas) con la misma secuencia
+        r = rng("quantities")
+        return (r.randint(1, 4) for _ in range(ticket_count))
+
+    r = rng("tickets")
+    created["tickets"] = _insert(Ticket, (
+        Ticket(
+            usuario_id=pairs[k][0], evento_id=pairs[k][1], quantity=quantity, buy_date=now,
+            type=TicketType.VIP if r.random() < 0.2 else TicketType.GENERAL,
+        )
+        for k, quantity in enumerate(quantities())
+    ), batch_size)
+    # Un ticket por par, así que la cuota es directamente su cantidad
+    _insert(TicketQuota, (
+        TicketQuota(usuario_id=pairs[k][0], evento_id=pairs[k][1], quantity=quantity)
+        for k, quantity in enumerate(quantities())
+    ), batch_size)
+    log(f"tickets: {created['tickets']}")
+
+    # Quien califica un evento es alguien que compró entrada (mismos pares)
+    r = rng("ratings")
+    created["ratings"] = _insert(Rating, (
+        Rating(usuario_id=pairs[k][0], evento_id=pairs[k][1], title="Reseña",
+               text="Opinión sobre el evento", rating=r.choices(range(1, 6), weights=(1, 1, 3, 5, 4))[0])
+        for k in range(min(counts["ratings"], pairs.capacity))
+    ), batch_size)
+    log(f"ratings: {created['ratings']}")
+
+    def hot_event(r):
+        return events[int(len(events) * r.random() ** 3)]
+
+    r = rng("comments")
+    created["comments"] = _insert(Comment, (
+        Comment(user_id=r.choice(users), event_id=hot_event(r), title="Comentario",
+                text="Texto del comentario")
+        for _ in range(counts["comments"])
+    ), batch_size)
+
+    r = rng("notifications")
+    priorities = [choice for choice, _ in Notification.PRIORITY_CHOICES]
+    created["notifications"] = _insert(Notification, (
+        Notification(
+            title=f"Aviso {i}", message="Cambió la información del evento", priority=r.choice(priorities),
+            event_id=hot_event(r), user_id=r.choice(users) if r.random() < 0.5 else None,
+            is_read=r.random() < 0.3,
+        )
+        for i in range(counts["notifications"])
+    ), batch_size)
+    log(f"comentarios: {created['comments']}, notificaciones: {created['notifications']}")
+
+    # Reembolsos sobre tickets espaciados uniformemente, como mucho uno pendiente por usuario
+    r = rng("refunds")
+    stride = max(ticket_count // max(counts["refunds"], 1), 1)
+    sampled = islice(
+        Ticket.objects.filter(pk__gt=first_ticket).order_by("pk")
+        .values_list("pk", "usuario_id").iterator(chunk_size=batch_size),
+        0, None, stride,
+    )
+    pending = set()
+
+    def refunds():
+        for ticket_id, user_id in islice(sampled, counts["refunds"]):
+            status = r.choice(["pendiente", "aprobado", "rechazado"])
+            if status == "pendiente" and user_id in pending:
+                status = "rechazado"
+            if status == "pendiente":
+                pending.add(user_id)
+            yield RefundRequest(
+                user_id=user_id, ticket_id=ticket_id, ticket_code=str(ticket_id), status=status,
+                reason="No puedo asistir al evento", approved=status == "aprobado",
+            )
+
+    created["refunds"] = _insert(RefundRequest, refunds(), batch_size)
+    log(f"reembolsos: {created['refunds']}")
+
+    # Contadores denormalizados con un único UPDATE sobre los eventos nuevos
+    ratings = Rating.objects.filter(evento=OuterRef("pk")).order_by().values("evento")
+    Event.objects.filter(pk__gt=first_event).update(
+        rating_count=Coalesce(Subquery(ratings.annotate(c=Count("pk")).values("c")), 0, output_field=IntegerField()),
+        rating_sum=Coalesce(Subquery(ratings.annotate(s=Sum("rating")).values("s")), 0, output_field=IntegerField()),
+    )
+    Event.objects.filter(pk__gt=first_event).update(
+        rating_score=Event.bayesian_score_expression(F("rating_count"), F("rating_sum"))
+    )
+    EventStats.rebuild(Event.objects.filter(pk__gt=first_event), batch_size=batch_size)
+    rebuild_sales_rollups(Event.objects.filter(pk__gt=first_event), batch_size=batch_size)
+    get_backend().rebuild()
+    return created
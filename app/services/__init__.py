@@ -0,0 +1,17 @@
+from .event_import import EventImportError as EventImportError
+from .event_import import ImportReport as ImportReport
+from .event_import import import_events as import_events
+from .event_import import import_format as import_format
+from .inventory import SoldOutError as SoldOutError
+from .inventory import release_stock as release_stock
+from .inventory import remaining_stock as remaining_stock
+from .inventory import set_capacity as set_capacity
+from .inventory import take_stock as take_stock
+from .inventory import with_remaining_stock as with_remaining_stock
+from .ticket_purchase import MAX_TICKETS_PER_EVENT as MAX_TICKETS_PER_EVENT
+from .ticket_purchase import PurchaseLine as PurchaseLine
+from .ticket_purchase import TicketLimitError as TicketLimitError
+from .ticket_purchase import cancel_ticket as cancel_ticket
+from .ticket_purchase import change_ticket as change_ticket
+from .ticket_purchase import purchase_ticket as purchase_ticket
+from .ticket_purchase import purchase_tickets as purchase_tickets
@@ -0,0 +1,152 @@
+"""
+Importación masiva de eventos desde CSV o JSON.
+
+El archivo se lee de a una fila (csv.DictReader o app.jsonstream), cada fila
+se valida con Event.validate y las válidas se insertan con bulk_create de a
+IMPORT_BATCH_SIZE, todo dentro de una transacción: si el archivo está mal
+formado a mitad de camino no queda ningún evento a medias. Las filas
+inválidas no frenan la importación; quedan en el reporte con su número y
+el error de cada campo.
+"""
+import csv
+import json
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..caching import EVENTS_LIST, bump_generation
+from ..jsonstream import iter_json_items
+from ..models import Event
+from ..search import get_backend
+
+IMPORT_BATCH_SIZE = 1000
+# El reporte guarda el detalle de las primeras filas rechazadas; el total siempre se cuenta
+MAX_REPORTED_ERRORS = 1000
+FORMATS_BY_EXTENSION = {".csv": "csv", ".json": "json", ".ndjson": "json", ".jsonl": "json"}
+
+
+class EventImportError(ValueError):
+    """El archivo no se puede leer: no se importa ninguna fila."""
+
+
+@dataclass
+class ImportReport:
+    created: int = 0
+    rejected: int = 0
+    # (número de fila, {campo: mensaje}); en CSV el número es la línea del archivo
+    errors: list = field(default_factory=list)
+
+    def reject(self, number, errors):
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((number, errors))
+
+
+def import_format(filename):
+    """Formato ("csv" o "json") según la extensión del archivo, o None si no se reconoce."""
+    for extension, fmt in FORMATS_BY_EXTENSION.items():
+        if filename.lower().endswith(extension):
+            return fmt
+    return None
+
+
+def _text(row, name):
+    value = row.get(name)
+    return "" if value is None else str(value).strip()
+
+
+def _scheduled_at(row):
+    # "scheduled_at" en ISO 8601, o "date" y "time" por separado como en el formulario
+    value = _text(row, "scheduled_at")
+    if not value and _text(row, "date"):
+        value = f"{_text(row, 'date')}T{_text(row, 'time') or '00:00'}"
+    try:
+        scheduled_at = parse_datetime(value)
+    except ValueError:
+        return None
+    if scheduled_at is not None and timezone.is_naive(scheduled_at):
+        scheduled_at = timezone.make_aware(scheduled_at)
+    return scheduled_at
+
+
+def build_event(row, organizer):
+    """Devuelve (evento sin guardar, {}) o (None, errores) para una fila del archivo."""
+    if not isinstance(row, dict):
+        return None, {"fila": "Cada registro debe ser un objeto con los campos del evento"}
+
+    title = _text(row, "title")
+    description = _text(row, "description")
+    scheduled_at = _scheduled_at(row)
+    location = _text(row, "location") or Event._meta.get_field("location").default
+
+    errors = Event.validate(title, description, scheduled_at)
+    if len(location) > Event._meta.get_field("location").max_length:
+        errors["location"] = "El lugar es demasiado largo"
+    if errors:
+        return None, errors
+
+    return Event(
+        title=title, description=description, scheduled_at=scheduled_at, location=location, organizer=organizer
+    ), {}
+
+
+def _rows(stream, fmt):
+    """(número de fila, registro) por cada fila de `stream`, leyendo de a una."""
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(stream)
+            columns = set(reader.fieldnames or ())
+            faltantes = {"title", "description"} - columns
+            if not columns & {"scheduled_at", "date"}:
+                faltantes.add("scheduled_at")
+            if faltantes:
+                raise EventImportError(f"Faltan columnas en el CSV: {', '.join(sorted(faltantes))}.")
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            yield from enumerate(iter_json_items(stream), start=1)
+    except (csv.Error, json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise EventImportError(f"El archivo no es un {fmt.upper()} válido: {e}") from e
+    except EventImportError:
+        raise
+    except ValueError as e:
+        # iter_json_items avisa así de separadores o contenido inesperado
+        raise EventImportError(f"El archivo no es un JSON válido: {e}") from e
+
+
+def import_events(stream, fmt, organizer, batch_size=IMPORT_BATCH_SIZE, dry_run=False):
+    """
+    Crea a nombre de `organizer` los eventos de `stream` (archivo de texto en
+    formato "csv" o "json") y devuelve un ImportReport. Con dry_run solo
+    valida. Lanza EventImportError si el archivo no se puede leer.
+    """
+    if fmt not in ("csv", "json"):
+        raise EventImportError(f"Formato no soportado: {fmt}.")
+
+    report = ImportReport()
+    backend = get_backend()
+    batch = []
+
+    def flush():
+        if batch and not dry_run:
+            Event.objects.bulk_create(batch, batch_size=batch_size)
+            # bulk_create no dispara las señales de Event: el índice de búsqueda se actualiza acá
+            backend.index_many(batch)
+        report.created += len(batch)
+        batch.clear()
+
+    with transaction.atomic():
+        for number, row in _rows(stream, fmt):
+            event, errors = build_event(row, organizer)
+            if errors:
+                report.reject(number, errors)
+                continue
+            batch.append(event)
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+        if report.created and not dry_run:
+            transaction.on_commit(lambda: bump_generation(EVENTS_LIST))
+    return report
@@ -0,0 +1,152 @@
+"""
+Cupos de entradas por evento y tipo.
+
+El stock restante de cada (evento, tipo) vive en INVENTORY_SHARDS filas de
+TicketInventory. Una compra intenta descontar de un shard elegido al azar
+con un UPDATE condicional (`remaining = remaining - n WHERE remaining >= n`),
+asi que compradores simultaneos casi nunca esperan por la misma fila. Solo
+cuando ese shard no alcanza se recorren los demas.
+"""
+import random
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from ..caching import EVENTS_LIST, bump_generation
+from ..models import Event, Ticket, TicketInventory, TicketType
+
+INVENTORY_SHARDS = 8
+
+
+class SoldOutError(ValidationError):
+    def __init__(self, evento, type, remaining):
+        self.evento = evento
+        self.type = type
+        self.remaining = remaining
+        super().__init__(f"No quedan suficientes entradas {type} para este evento (disponibles: {remaining}).")
+
+
+def _shards(evento, type):
+    return TicketInventory.objects.filter(evento=evento, type=type)
+
+
+def _split(total, shards=INVENTORY_SHARDS):
+    base, extra = divmod(total, shards)
+    return [base + (1 if i < extra else 0) for i in range(shards)]
+
+
+def _sold(evento, type):
+    return Ticket.objects.filter(evento=evento, type=type).aggregate(total=Sum("quantity"))["total"] or 0
+
+
+def _fill_shards(evento, type, remaining):
+    _shards(evento, type).delete()
+    TicketInventory.objects.bulk_create([
+        TicketInventory(evento=evento, type=type, shard=i, remaining=amount)
+        for i, amount in enumerate(_split(remaining))
+    ])
+
+
+def set_capacity(evento, type, capacity):
+    """Fija el cupo de un tipo de entrada (None = sin limite) y recalcula el stock restante."""
+    field = Event.CAPACITY_FIELDS[type]
+    with transaction.atomic():
+        # Bloquea el evento para que dos cambios de cupo no se pisen
+        Event.objects.select_for_update().filter(pk=evento.pk).values_list(field, flat=True).get()
+
+        if capacity is None:
+            _shards(evento, type).delete()
+        else:
+            sold = _sold(evento, type)
+            if capacity < sold:
+                raise ValidationError(
+                    f"El cupo {type} no puede ser menor a las {sold} entradas ya vendidas."
+                )
+            _fill_shards(evento, type, capacity - sold)
+
+        Event.objects.filter(pk=evento.pk).update(**{field: capacity})
+        setattr(evento, field, capacity)
+        # El listado muestra el cupo; update() no dispara las señales de Event
+        transaction.on_commit(lambda: bump_generation(EVENTS_LIST))
+
+
+def take_stock(evento, type, quantity):
+    """Descuenta `quantity` entradas del stock o lanza SoldOutError."""
+    capacity = evento.capacity_for(type)
+    if capacity is None:
+        return
+
+    shards = _shards(evento, type)
+    with transaction.atomic():
+        if shards.filter(
+            shard=random.randrange(INVENTORY_SHARDS), remaining__gte=quantity
+        ).update(remaining=F("remaining") - quantity):
+            return
+
+        disponibles = list(shards.filter(remaining__gt=0).values_list("shard", "remaining"))
+        if not disponibles and not shards.exists():
+            # Cupo cargado sin pasar por set_capacity: se arma el stock una sola vez.
+            # Con el evento bloqueado como en set_capacity, un segundo comprador
+            # espera y vuelve a mirar en vez de chocar con unique_inventory_shard
+            Event.objects.select_for_update().filter(pk=evento.pk).values_list("pk", flat=True).get()
+            if not shards.exists():
+                _fill_shards(evento, type, max(capacity - _sold(evento, type), 0))
+            return take_stock(evento, type, quantity)
+
+        random.shuffle(disponibles)
+        available = sum(remaining for _, remaining in disponibles)
+        pending = quantity
+        for shard, remaining in disponibles:
+            take = min(pending, remaining)
+            if shards.filter(shard=shard, remaining__gte=take).update(remaining=F("remaining") - take):
+                pending -= take
+            if pending == 0:
+                return
+
+        raise SoldOutError(evento, type, available)
+
+
+def release_stock(evento, type, quantity):
+    """Devuelve `quantity` entradas al stock (cancelaciones y cambios de tipo)."""
+    if evento.capacity_for(type) is None:
+        return
+    _shards(evento, type).filter(shard=random.randrange(INVENTORY_SHARDS)).update(
+        remaining=F("remaining") + quantity
+    )
+
+
+def remaining_stock(evento):
+    """Devuelve {tipo: entradas restantes} con None para los tipos sin limite."""
+    totales = dict(
+        TicketInventory.objects.filter(evento=evento)
+        .values("type")
+        .annotate(total=Sum("remaining"))
+        .values_list("type", "total")
+    )
+    stock = {}
+    for type in TicketType.values:
+        capacity = evento.capacity_for(type)
+        stock[type] = None if capacity is None else totales.get(type, capacity)
+    return stock
+
+
+def with_remaining_stock(queryset):
+    """Anota `stock_general` y `stock_vip` sumando los shards de cada evento."""
+    def restante(type):
+        total = (
+            TicketInventory.objects.filter(evento=OuterRef("pk"), type=type)
+            .order_by()
+            .values("evento")
+            .annotate(total=Sum("remaining"))
+            .values("total")
+        )
+        return Coalesce(
+            Subquery(total), Event.CAPACITY_FIELDS[type], output_field=IntegerField()
+        )
+
+    return queryset.annotate(
+        stock_general=restante(TicketType.GENERAL),
+        stock_vip=restante(TicketType.VIP),
+    )
@@ -0,0 +1,189 @@
+"""
+Servicio de compra de tickets.
+
+El limite de entradas por usuario y evento se controla sobre la fila
+TicketQuota de ese par con un UPDATE condicional
+(`quantity = quantity + n WHERE quantity + n <= limite`): la verificacion y
+la reserva son una sola sentencia atomica, sin leer antes de escribir, asi
+que dos compras simultaneas no pueden superar el limite.
+
+Las estadisticas del evento (EventStats) y las ventas por hora y por dia
+(app.analytics) se ajustan despues del commit: esas filas las tocan todas
+las compras del evento, y actualizarlas dentro de la transaccion volveria a
+hacerlas esperar una detras de otra.
+"""
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from ..analytics import record_sales
+from ..models import Event, EventStats, Ticket, TicketQuota, TicketType
+from .inventory import release_stock, take_stock
+
+MAX_TICKETS_PER_EVENT = 4
+
+
+class TicketLimitError(ValidationError):
+    def __init__(self, evento, existentes, solicitadas):
+        self.evento = evento
+        self.existentes = existentes
+        self.solicitadas = solicitadas
+        super().__init__(
+            f"Ya has comprado {existentes} entradas para este evento. "
+            f"Con esta compra ({solicitadas}) superarías el límite de {MAX_TICKETS_PER_EVENT} entradas."
+        )
+
+
+@dataclass
+class PurchaseLine:
+    evento: Event
+    quantity: int
+    type: str = TicketType.GENERAL
+
+
+def _quota_for(usuario, evento):
+    # La primera vez se inicializa con lo ya comprado para no perder tickets previos
+    quota, _ = TicketQuota.objects.get_or_create(
+        usuario=usuario,
+        evento=evento,
+        defaults={
+            "quantity": lambda: Ticket.objects.filter(usuario=usuario, evento=evento)
+            .aggregate(total=Sum("quantity"))["total"] or 0,
+        },
+    )
+    return quota
+
+
+def _reserve(usuario, evento, delta):
+    """Suma `delta` a la cuota del usuario o lanza TicketLimitError si se pasa del limite."""
+    quota = _quota_for(usuario, evento)
+    if delta <= 0:
+        TicketQuota.objects.filter(pk=quota.pk).update(quantity=F("quantity") + delta)
+        return
+
+    updated = TicketQuota.objects.filter(
+        pk=quota.pk, quantity__lte=MAX_TICKETS_PER_EVENT - delta
+    ).update(quantity=F("quantity") + delta)
+    if not updated:
+        quota.refresh_from_db(fields=["quantity"])
+        raise TicketLimitError(evento, quota.quantity, delta)
+
+
+def _check_type(type):
+    # Los tipos vienen del formulario: uno desconocido no debe llegar a los cupos ni a las estadísticas
+    if type not in TicketType.values:
+        raise ValidationError(f"Tipo de entrada inválido: {type}.")
+
+
+def _update_stats(changes):
+    """
+    Suma a EventStats y a los rollups de ventas los cambios (evento_id, fecha de
+    compra, tipo, cantidad) cuando la transaccion confirma. Si el proceso cae antes
+    de aplicarlos, el recalculo periodico los corrige.
+    """
+    changes = list(changes)
+    deltas = defaultdict(Counter)
+    for evento_id, _, type, quantity in changes:
+        deltas[evento_id].update(EventStats.ticket_delta(type, quantity))
+
+    def apply():
+        for evento_id, fields in deltas.items():
+            EventStats.apply_delta(evento_id, **fields)
+        record_sales(changes)
+
+    transaction.on_commit(apply, robust=True)
+
+
+def purchase_tickets(usuario, lines):
+    """
+    Compra varias lineas en una sola transaccion. Si alguna supera el limite
+    o se queda sin stock no se crea ningun ticket. Devuelve los tickets creados.
+    """
+    por_evento = defaultdict(int)
+    for line in lines:
+        if line.quantity < 1:
+            raise ValidationError("La cantidad debe ser al menos 1.")
+        _check_type(line.type)
+        por_evento[line.evento] += line.quantity
+
+    ahora = timezone.now()
+    with transaction.atomic():
+        for evento, cantidad in por_evento.items():
+            _reserve(usuario, evento, cantidad)
+        for line in lines:
+            take_stock(line.evento, line.type, line.quantity)
+        tickets = Ticket.objects.bulk_create([
+            Ticket(
+                usuario=usuario,
+                evento=line.evento,
+                quantity=line.quantity,
+                type=line.type,
+                buy_date=ahora,
+            )
+            for line in lines
+        ])
+        _update_stats((line.evento.pk, ahora, line.type, line.quantity) for line in lines)
+        return tickets
+
+
+def purchase_ticket(usuario, evento, quantity, type=TicketType.GENERAL):
+    return purchase_tickets(usuario, [PurchaseLine(evento, quantity, type)])[0]
+
+
+def _lock(ticket):
+    """
+    Relee el ticket bloqueando su fila. Los datos en memoria pueden ser viejos
+    (otro request lo cambio o lo cancelo) y sobre ellos se devolveria cupo y
+    stock de mas. None si ya no existe.
+    """
+    return Ticket.objects.select_for_update().filter(pk=ticket.pk).first()
+
+
+def change_ticket(ticket, quantity, type):
+    """Modifica cantidad y tipo de un ticket respetando el limite del usuario y el stock."""
+    _check_type(type)
+    with transaction.atomic():
+        actual = _lock(ticket)
+        if actual is None:
+            raise ValidationError("El ticket ya no existe.")
+        _reserve(ticket.usuario, ticket.evento, quantity - actual.quantity)
+        if type != actual.type:
+            release_stock(ticket.evento, actual.type, actual.quantity)
+            take_stock(ticket.evento, type, quantity)
+        elif quantity > actual.quantity:
+            take_stock(ticket.evento, type, quantity - actual.quantity)
+        elif quantity < actual.quantity:
+            release_stock(ticket.evento, type, actual.quantity - quantity)
+        _update_stats([
+            (actual.evento_id, actual.buy_date, actual.type, -actual.quantity),
+            (actual.evento_id, actual.buy_date, type, quantity),
+        ])
+        actual.quantity = quantity
+        actual.type = type
+        actual.save()
+    ticket.quantity = quantity
+    ticket.type = type
+    return ticket
+
+
+def cancel_ticket(ticket):
+    """
+    Elimina el ticket y libera su cantidad en la cuota del usuario y en el
+    stock. Devuelve False si ya estaba cancelado: una segunda cancelacion no
+    devuelve nada.
+    """
+    with transaction.atomic():
+        actual = _lock(ticket)
+        if actual is None:
+            return False
+        _, deleted = actual.delete()
+        if deleted.get(Ticket._meta.label) != 1:
+            return False
+        _reserve(ticket.usuario, ticket.evento, -actual.quantity)
+        release_stock(ticket.evento, actual.type, actual.quantity)
+        _update_stats([(actual.evento_id, actual.buy_date, actual.type, -actual.quantity)])
+    return True
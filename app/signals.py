@@ -0,0 +1,10 @@
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from .models import Rating, User
+
+
+@receiver(pre_delete, sender=User, dispatch_uid="user_ratings_discount")
+def discount_user_ratings(sender, instance, **kwargs):
+    # Antes del borrado: después, la cascada ya se llevó las calificaciones que hay que descontar
+    Rating.discount_user_ratings(instance)
@@ -0,0 +1,81 @@
+import datetime
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from app.models import Comment, Event, Notification, Rating, RefundRequest, Ticket, User
+from app.pagination import encode_cursor
+
+
+class AsyncViewsTest(TestCase):
+    """
+    Las vistas de solo lectura son async: con AsyncClient corren en el event loop
+    y cualquier consulta perezosa desde la plantilla fallaría con SynchronousOnlyOperation.
+    """
+
+    def setUp(self):
+        self.organizer = User.objects.create_user(username="organizador", password="password123", is_organizer=True)
+        self.user = User.objects.create_user(username="asistente", password="password123")
+        self.event = Event.objects.create(
+            title="Festival",
+            description="Descripción",
+            scheduled_at=timezone.now() + datetime.timedelta(days=1),
+            organizer=self.organizer,
+        )
+        ticket = Ticket.objects.create(usuario=self.user, evento=self.event, quantity=1, buy_date=timezone.now(), type="general")
+        Rating.objects.create(usuario=self.user, evento=self.event, title="Genial", text="Texto", rating=5)
+        Comment.objects.create(title="Hola", text="Primer comentario", user=self.user, event=self.event)
+        Notification.objects.create(title="Cambio de sala", message="Mensaje", priority="LOW", event=self.event)
+        self.refund = RefundRequest.objects.create(ticket_code=str(ticket.pk), reason="No puedo ir", user=self.user)
+
+    async def get(self, name, *args):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse(name, args=args))
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    async def test_events(self):
+        self.assertContains(await self.get("events"), "Festival")
+
+    async def test_event_detail(self):
+        response = await self.get("event_detail", self.event.pk)
+
+        self.assertContains(response, "Genial")
+        self.assertContains(response, "organizador")
+
+    async def test_event_detail_inexistente(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse("event_detail", args=[self.event.pk + 1000]))
+
+        self.assertEqual(response.status_code, 404)
+
+    async def test_comment(self):
+        response = await self.get("comments", self.event.pk)
+
+        self.assertContains(response, "Primer comentario")
+        self.assertEqual(response.context["comments"].paginator.count, 1)
+
+    async def test_notification_list_user(self):
+        response = await self.get("notification_list_user")
+
+        self.assertContains(response, "Cambio de sala")
+        self.assertContains(response, "1 nuevas")
+
+    async def test_notification_list_user_con_cursor_de_puntaje(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse("notification_list_user"), {"before": encode_cursor(3.5, 1)})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Cambio de sala")
+
+    async def test_refund_detail(self):
+        self.assertContains(await self.get("refund_detail", self.refund.pk), "No puedo ir")
+
+    async def test_refund_detail_ajeno_redirige(self):
+        otro = await User.objects.acreate_user(username="otro", password="password123")
+        await self.async_client.aforce_login(otro)
+
+        response = await self.async_client.get(reverse("refund_detail", args=[self.refund.pk]))
+
+        self.assertRedirects(response, reverse("refund_list"), fetch_redirect_response=False)
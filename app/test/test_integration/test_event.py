@@ -4,7 +4,8 @@ from django.test import Client, TestCase
 from django.urls import reverse
 from django.utils import timezone
 
-from app.models import Event, User
+from app.models import Event, Ticket, User
+from app.views import EVENTS_DESCRIPTION_LENGTH, EVENTS_PAGE_SIZE
 
 
 class BaseEventTestCase(TestCase):
@@ -92,6 +93,45 @@ class EventsListViewTest(BaseEventTestCase):
         self.assertTrue(response.url.startswith("/accounts/login/")) # type: ignore
 
 
+    def test_events_view_paginates_with_cursor(self):
+        """Test que verifica la paginación por cursor (scheduled_at, id) del listado"""
+        base = timezone.now() + datetime.timedelta(days=3)
+        # Dos eventos a la misma hora para que el desempate sea por id
+        for i in range(EVENTS_PAGE_SIZE):
+            Event.objects.create(
+                title=f"Evento extra {i}",
+                description="Descripción extra",
+                scheduled_at=base + datetime.timedelta(hours=i // 2),
+                organizer=self.organizer,
+            )
+        self.client.login(username="regular", password="password123")
+
+        response = self.client.get(reverse("events"))
+        primera = list(response.context["events"])
+        self.assertEqual(len(primera), EVENTS_PAGE_SIZE)
+        self.assertIsNotNone(response.context["next_cursor"])
+
+        response = self.client.get(reverse("events"), {"after": response.context["next_cursor"]})
+        segunda = list(response.context["events"])
+        self.assertIsNone(response.context["next_cursor"])
+
+        todos = Event.objects.filter(scheduled_at__gte=timezone.now()).order_by("scheduled_at", "id")
+        self.assertEqual([e.pk for e in primera + segunda], [e.pk for e in todos])
+
+    def test_events_view_truncates_description(self):
+        """Test que verifica que el listado no carga la descripción completa"""
+        self.event1.description = "x" * 1000
+        self.event1.save()
+        self.client.login(username="regular", password="password123")
+
+        response = self.client.get(reverse("events"))
+
+        event = response.context["events"][0]
+        self.assertEqual(len(event.short_description), EVENTS_DESCRIPTION_LENGTH + 1)
+        self.assertIn("description", event.get_deferred_fields())
+        self.assertNotContains(response, "x" * (EVENTS_DESCRIPTION_LENGTH + 1))
+
+
 class EventDetailViewTest(BaseEventTestCase):
     """Tests para la vista de detalle de un evento"""
 
@@ -249,6 +289,81 @@ class EventFormSubmissionTest(BaseEventTestCase):
         self.assertEqual(self.event1.scheduled_at.hour, 16)
         self.assertEqual(self.event1.scheduled_at.minute, 45)
 
+    def test_event_form_post_cupo_invalido(self):
+        """Test que verifica que un cupo que no es un entero >= 0 no deja el evento sin límite"""
+        self.client.login(username="organizador", password="password123")
+        Event.objects.filter(pk=self.event1.pk).update(general_capacity=10)
+
+        for cupo in ["-5", "10.", "abc", "²"]:
+            response = self.client.post(
+                reverse("event_edit", args=[self.event1.id]),  # type: ignore
+                {
+                    "title": "Evento 1",
+                    "description": "Descripción del evento 1",
+                    "date": "2025-06-15",
+                    "time": "16:45",
+                    "location": "Nueva locacion",
+                    "general_capacity": cupo,
+                },
+            )
+
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, "El cupo debe ser un número entero mayor o igual a 0.")
+            self.event1.refresh_from_db()
+            self.assertEqual(self.event1.general_capacity, 10)
+            self.assertNotEqual(self.event1.location, "Nueva locacion")
+
+    def test_event_form_post_create_cupo_invalido(self):
+        """Test que verifica que un error al crear vuelve al formulario de alta y no da 404"""
+        self.client.login(username="organizador", password="password123")
+
+        response = self.client.post(
+            reverse("event_form"),
+            {
+                "title": "Nuevo Evento",
+                "description": "Descripción del nuevo evento",
+                "date": "2025-05-01",
+                "time": "14:30",
+                "location": "Centro Cultural Borges",
+                "vip_capacity": "-1",
+            },
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "El cupo debe ser un número entero mayor o igual a 0.")
+        self.assertContains(response, 'value="Nuevo Evento"')
+        self.assertContains(response, f'action="{reverse("event_form")}"')
+        self.assertFalse(Event.objects.filter(title="Nuevo Evento").exists())
+
+    def test_event_form_post_cupo_menor_a_lo_vendido(self):
+        """Test que verifica que un cupo menor a lo vendido muestra el error sin guardar cambios"""
+        self.client.login(username="organizador", password="password123")
+        Ticket.objects.create(
+            usuario=self.regular_user,
+            evento=self.event1,
+            quantity=3,
+            buy_date=timezone.now(),
+            type="general",
+        )
+
+        response = self.client.post(
+            reverse("event_edit", args=[self.event1.id]),  # type: ignore
+            {
+                "title": "Evento 1 Actualizado",
+                "description": "Descripción del evento 1",
+                "date": "2025-06-15",
+                "time": "16:45",
+                "location": "Nueva locacion",
+                "general_capacity": "2",
+            },
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "no puede ser menor a las 3 entradas ya vendidas")
+        self.event1.refresh_from_db()
+        self.assertEqual(self.event1.title, "Evento 1")
+        self.assertIsNone(self.event1.general_capacity)
+
 
 class EventDeleteViewTest(BaseEventTestCase):
     """Tests para la eliminación de eventos"""
@@ -1,9 +1,12 @@
 import datetime
+import re
+from unittest import mock
 
 from django.test import TestCase
 from django.urls import reverse
 from django.utils import timezone
 
+from app import views
 from app.models import Event, Rating, User
 
 
@@ -31,10 +34,15 @@ class EventDetailIntegrationTest(TestCase):
             organizer=self.organizer,
         )
 
-         Rating.objects.create(usuario=self.regular_user, evento=self.event1, title="Buena", text="Me gustó", rating=4)
-         Rating.objects.create(usuario=self.regular_user, evento=self.event1, title="Excelente", text="Muy buena experiencia", rating=3)
-         Rating.objects.create(usuario=self.regular_user, evento=self.event1, title="Buena", text="Me gustó", rating=3)
-         Rating.objects.create(usuario=self.regular_user, evento=self.event1, title="Excelente", text="Muy buena experiencia", rating=1)
+         # Un rating por usuario y evento
+         asistentes = [self.regular_user] + [
+            User.objects.create_user(username=f"asistente{i}", password="password123")
+            for i in range(3)
+         ]
+         Rating.objects.create(usuario=asistentes[0], evento=self.event1, title="Buena", text="Me gustó", rating=4)
+         Rating.objects.create(usuario=asistentes[1], evento=self.event1, title="Excelente", text="Muy buena experiencia", rating=3)
+         Rating.objects.create(usuario=asistentes[2], evento=self.event1, title="Buena", text="Me gustó", rating=3)
+         Rating.objects.create(usuario=asistentes[3], evento=self.event1, title="Excelente", text="Muy buena experiencia", rating=1)
 
     def test_event_detail_muestra_promedio_si_es_organizador(self):
 
@@ -50,3 +58,59 @@ class EventDetailIntegrationTest(TestCase):
 
         self.assertEqual(response.status_code, 200)
         self.assertNotContains(response, "2,75")
+
+
+class TopRatedEventsTest(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(username="organizador", password="password123", is_organizer=True)
+        self.users = [User.objects.create_user(username=f"asistente{i}", password="password123") for i in range(6)]
+        manana = timezone.now() + datetime.timedelta(days=1)
+
+        def evento(title, ratings, dias=1):
+            event = Event.objects.create(
+                title=title, description="Descripción", organizer=self.organizer,
+                scheduled_at=manana + datetime.timedelta(days=dias),
+            )
+            for usuario, rating in zip(self.users, ratings):
+                Rating.objects.create(usuario=usuario, evento=event, title="Reseña", text="Texto", rating=rating)
+            return event
+
+        evento("Un solo cinco", [5], dias=1)
+        evento("Muchos cincos", [5, 5, 5, 5, 5, 4], dias=2)
+        evento("Sin calificar", [], dias=3)
+        evento("Malas", [1, 2, 1], dias=4)
+        pasado = evento("Pasado", [5, 5, 5, 5, 5, 5])
+        Event.objects.filter(pk=pasado.pk).update(scheduled_at=timezone.now() - datetime.timedelta(days=1))
+
+    def test_ordena_por_puntaje_bayesiano(self):
+        self.client.force_login(self.users[0])
+
+        response = self.client.get(reverse("events"), {"orden": "calificacion"})
+
+        content = response.content.decode()
+        orden = [content.index(title) for title in ("Muchos cincos", "Un solo cinco", "Sin calificar", "Malas")]
+        self.assertEqual(orden, sorted(orden))
+        self.assertNotIn("Pasado", content)
+
+    def test_paginacion_por_puntaje(self):
+        self.client.force_login(self.users[0])
+        with mock.patch.object(views, "EVENTS_PAGE_SIZE", 2):
+            primera = self.client.get(reverse("events"), {"orden": "calificacion"}).content.decode()
+            cursor = re.search(r"orden=calificacion&after=([\w-]+)", primera).group(1)
+            segunda = self.client.get(reverse("events"), {"orden": "calificacion", "after": cursor}).content.decode()
+
+        self.assertIn("Muchos cincos", primera)
+        self.assertIn("Un solo cinco", primera)
+        self.assertIn("Sin calificar", segunda)
+        self.assertIn("Malas", segunda)
+        self.assertNotIn("Muchos cincos", segunda)
+
+    def test_detalle_muestra_histograma(self):
+        event = Event.objects.get(title="Muchos cincos")
+        self.client.force_login(self.users[0])
+
+        response = self.client.get(reverse("event_detail", args=[event.pk]))
+
+        self.assertContains(response, 'data-testid="ratings-histogram"')
+        self.assertContains(response, 'aria-valuenow="5"')
+        self.assertContains(response, 'aria-valuenow="1"')
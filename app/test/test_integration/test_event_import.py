@@ -0,0 +1,55 @@
+import datetime
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from app.models import Event, User
+
+
+class EventImportViewTest(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(
+            username="organizador", password="password123", is_organizer=True
+        )
+        fecha = (timezone.localdate() + datetime.timedelta(days=5)).isoformat()
+        self.csv = (
+            "title,description,scheduled_at,location\n"
+            f"Festival,Escenario principal,{fecha}T20:00,Parque\n"
+            f",Sin título,{fecha}T21:00,\n"
+        ).encode()
+
+    def upload(self, name, content, **data):
+        self.client.force_login(self.organizer)
+        return self.client.post(reverse("event_import"), {"file": SimpleUploadedFile(name, content), **data})
+
+    def test_importa_y_muestra_reporte(self):
+        response = self.upload("eventos.csv", self.csv)
+
+        self.assertContains(response, "Eventos creados:\n                        <strong>1</strong>", html=False)
+        self.assertContains(response, "Por favor ingrese un titulo")
+        self.assertTrue(Event.objects.filter(title="Festival", organizer=self.organizer).exists())
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=0)
+    def test_archivo_subido_a_disco(self):
+        self.upload("eventos.csv", self.csv)
+        self.assertTrue(Event.objects.filter(title="Festival").exists())
+
+    def test_solo_validar(self):
+        response = self.upload("eventos.csv", self.csv, dry_run="on")
+
+        self.assertContains(response, "Filas válidas (no se importaron)")
+        self.assertFalse(Event.objects.exists())
+
+    def test_errores_de_archivo(self):
+        self.assertContains(self.upload("eventos.txt", b"hola"), "Subí un archivo .csv")
+        self.assertContains(self.upload("eventos.json", b'[{"title": '), "no es un JSON válido")
+        self.assertFalse(Event.objects.exists())
+
+    def test_usuario_regular_no_puede_importar(self):
+        self.client.force_login(User.objects.create_user(username="regular", password="password123"))
+        response = self.client.post(reverse("event_import"), {"file": SimpleUploadedFile("e.csv", self.csv)})
+
+        self.assertRedirects(response, reverse("events"), fetch_redirect_response=False)
+        self.assertFalse(Event.objects.exists())
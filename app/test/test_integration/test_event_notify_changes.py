@@ -123,9 +123,9 @@ class EventNotificationIntegrationTest(TestCase):
         response = self.client.post(reverse("mark_as_read", args=[notification.id])) # type: ignore
         self.assertRedirects(response, reverse("notification_list_user"))
         
-        # 12. Verificar que la notificación se marcó como leída
-        notification.refresh_from_db() # type: ignore
-        self.assertTrue(notification.is_read) # type: ignore
+        # 12. Verificar que la notificación se marcó como leída solo para user1
+        self.assertTrue(notification.is_read_by(self.user1)) # type: ignore
+        self.assertFalse(notification.is_read_by(self.user2)) # type: ignore
         
         # 13. Verificar que el contador se actualizó después de marcar como leída
         response = self.client.get(reverse("notification_list_user"))
@@ -136,6 +136,8 @@ class EventNotificationIntegrationTest(TestCase):
         response = self.client.get(reverse("notification_list_user"))
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, notification.title) # type: ignore
+        # y para él sigue sin leer
+        self.assertEqual(response.context['unread_count'], 1)
 
     def test_integration_organizer_minor_edit_no_notification(self):
         """
@@ -0,0 +1,68 @@
+import datetime
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from app.models import Event, Rating, User
+from app.pagination import encode_cursor
+from app.views import RATINGS_PAGE_SIZE
+
+
+class EventRatingsPagesTest(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(
+            username="organizador", password="password123", is_organizer=True
+        )
+        self.regular_user = User.objects.create_user(username="regular", password="password123")
+        self.event = Event.objects.create(
+            title="Evento concurrido",
+            description="Descripción",
+            scheduled_at=timezone.now() + datetime.timedelta(days=1),
+            organizer=self.organizer,
+        )
+        self.total = RATINGS_PAGE_SIZE + 5
+        for i in range(self.total):
+            Rating.objects.create(
+                usuario=User.objects.create_user(username=f"asistente{i}", password="password123"),
+                evento=self.event,
+                title=f"Reseña {i:02d}",
+                text="Texto",
+                rating=3,
+            )
+        self.client.login(username="regular", password="password123")
+
+    def test_detalle_muestra_primera_pagina_y_total(self):
+        response = self.client.get(reverse("event_detail", args=[self.event.pk]))
+
+        self.assertContains(response, f"Calificaciones y Reseñas ( {self.total} )")
+        self.assertContains(response, 'class="review-box', count=RATINGS_PAGE_SIZE)
+        # Primero las más nuevas
+        self.assertContains(response, f"Reseña {self.total - 1:02d}")
+        self.assertNotContains(response, "Reseña 00")
+        self.assertContains(response, 'data-testid="ratings-next-page"')
+
+    def test_endpoint_devuelve_pagina_siguiente(self):
+        response = self.client.get(reverse("event_ratings", args=[self.event.pk]))
+        next_cursor = response.context["next_cursor"]
+        self.assertIsNotNone(next_cursor)
+
+        response = self.client.get(reverse("event_ratings", args=[self.event.pk]), {"after": next_cursor})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'class="review-box', count=self.total - RATINGS_PAGE_SIZE)
+        self.assertContains(response, "Reseña 00")
+        self.assertNotContains(response, "ratings-next-page")
+        self.assertNotContains(response, "<html")
+
+    def test_endpoint_cursor_de_puntaje_devuelve_la_primera_pagina(self):
+        response = self.client.get(reverse("event_ratings", args=[self.event.pk]), {"after": encode_cursor(3.5, 1)})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'class="review-box', count=RATINGS_PAGE_SIZE)
+        self.assertContains(response, f"Reseña {self.total - 1:02d}")
+
+    def test_endpoint_evento_inexistente(self):
+        response = self.client.get(reverse("event_ratings", args=[self.event.pk + 1000]))
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,46 @@
+import datetime
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from app.models import Event, User
+from app.services import purchase_ticket
+
+
+class EventSalesEndpointTest(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(username="organizador", password="password123", is_organizer=True)
+        self.other_organizer = User.objects.create_user(username="otro", password="password123", is_organizer=True)
+        self.user = User.objects.create_user(username="asistente", password="password123")
+        self.event = Event.objects.create(
+            title="Festival",
+            description="Descripción",
+            scheduled_at=timezone.now() + datetime.timedelta(days=10),
+            organizer=self.organizer,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            purchase_ticket(self.user, self.event, 2, "general")
+
+    async def get(self, user, **params):
+        await self.async_client.aforce_login(user)
+        return await self.async_client.get(reverse("event_sales", args=[self.event.pk]), params)
+
+    async def test_devuelve_la_serie_en_json(self):
+        response = await self.get(self.organizer, granularity="day")
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["granularity"], "day")
+        self.assertEqual(len(data["buckets"]), len(data["quantity"]["general"]))
+        self.assertEqual(data["totals"], {"general": 2, "VIP": 0, "revenue": 40000})
+
+    async def test_solo_el_organizador_del_evento(self):
+        self.assertEqual((await self.get(self.user)).status_code, 403)
+        self.assertEqual((await self.get(self.other_organizer)).status_code, 403)
+
+    async def test_parametros_invalidos(self):
+        response = await self.get(self.organizer, granularity="week")
+        self.assertEqual(response.status_code, 400)
+        response = await self.get(self.organizer, desde="ayer")
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,88 @@
+import datetime
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from app.models import Event, User
+from app.search import search_events
+
+
+class EventSearchTest(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(
+            username="organizador",
+            email="organizador@test.com",
+            password="password123",
+            is_organizer=True,
+        )
+        self.regular_user = User.objects.create_user(
+            username="regular",
+            email="regular@test.com",
+            password="password123",
+        )
+        futuro = timezone.now() + datetime.timedelta(days=5)
+        self.rock = Event.objects.create(
+            title="Festival de Rock",
+            description="Bandas en vivo toda la noche",
+            location="Estadio Único",
+            scheduled_at=futuro,
+            organizer=self.organizer,
+        )
+        self.jazz = Event.objects.create(
+            title="Noche de Jazz",
+            description="Un clásico: rock y jazz fusión",
+            location="Teatro Argentino",
+            scheduled_at=futuro,
+            organizer=self.organizer,
+        )
+        self.pasado = Event.objects.create(
+            title="Rock del año pasado",
+            description="Ya ocurrió",
+            scheduled_at=timezone.now() - datetime.timedelta(days=5),
+            organizer=self.organizer,
+        )
+
+    def test_busqueda_ordena_por_relevancia(self):
+        resultados = search_events("rock")
+
+        # El título pesa más que la descripción y los eventos pasados no aparecen
+        self.assertEqual(resultados, [self.rock, self.jazz])
+
+    def test_busqueda_por_prefijo_y_sin_acentos(self):
+        self.assertEqual(search_events("festi"), [self.rock])
+        self.assertEqual(search_events("unico"), [self.rock])
+        self.assertEqual(search_events("clasico jaz"), [self.jazz])
+
+    def test_busqueda_ignora_operadores(self):
+        self.assertEqual(search_events('rock"* ^('), [self.rock, self.jazz])
+        self.assertEqual(search_events("   "), [])
+
+    def test_indice_se_actualiza_al_editar_y_borrar(self):
+        self.jazz.title = "Noche de Tango"
+        self.jazz.description = "Milongas"
+        self.jazz.save()
+
+        self.assertEqual(search_events("tango"), [self.jazz])
+        self.assertEqual(search_events("rock"), [self.rock])
+
+        self.rock.delete()
+        self.assertEqual(search_events("festival"), [])
+
+    def test_incluir_eventos_pasados(self):
+        resultados = search_events("pasado", upcoming_only=False)
+        self.assertEqual(resultados, [self.pasado])
+
+    @override_settings(EVENT_SEARCH_BACKEND="app.search.backends.SimpleSearchBackend")
+    def test_backend_simple_como_respaldo(self):
+        self.assertEqual(set(search_events("rock")), {self.rock, self.jazz})
+
+    def test_vista_de_busqueda(self):
+        self.client.login(username="regular", password="password123")
+
+        response = self.client.get(reverse("event_search"), {"q": "jazz"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "app/event_search.html")
+        self.assertEqual(response.context["events"], [self.jazz])
+        self.assertContains(response, "Noche de Jazz")
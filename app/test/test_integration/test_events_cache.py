@@ -0,0 +1,188 @@
+import datetime
+import re
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from app.caching import CSRF_PLACEHOLDER, event_ratings_key
+from app.models import Event, Rating, User
+from app.services import set_capacity
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "events-cache-test"}}
+CSRF_VALUE = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class EventsListCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user(
+            username="organizador", password="password123", is_organizer=True
+        )
+        self.regular_user = User.objects.create_user(username="regular", password="password123")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event = Event.objects.create(
+                title="Evento cacheado",
+                description="Descripción",
+                scheduled_at=timezone.now() + datetime.timedelta(days=1),
+                organizer=self.organizer,
+            )
+
+    def get_events(self, client=None):
+        client = client or self.client
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse("events"))
+        return response, len(queries)
+
+    def test_segunda_visita_no_consulta_eventos(self):
+        self.client.force_login(self.regular_user)
+
+        primera, consultas_primera = self.get_events()
+        segunda, consultas_segunda = self.get_events()
+
+        self.assertContains(segunda, "Evento cacheado")
+        self.assertLess(consultas_segunda, consultas_primera)
+        # El token CSRF se enmascara distinto en cada respuesta
+        self.assertEqual(
+            CSRF_VALUE.sub("", primera.content.decode()),
+            CSRF_VALUE.sub("", segunda.content.decode()),
+        )
+
+    def test_fragmento_distinto_por_rol(self):
+        self.client.force_login(self.regular_user)
+        self.assertNotContains(self.get_events()[0], 'aria-label="Editar"')
+
+        self.client.force_login(self.organizer)
+        self.assertContains(self.get_events()[0], 'aria-label="Editar"')
+
+    def test_guardar_o_borrar_evento_invalida(self):
+        self.client.force_login(self.regular_user)
+        self.get_events()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.title = "Título nuevo"
+            self.event.save()
+        self.assertContains(self.get_events()[0], "Título nuevo")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.delete()
+        self.assertContains(self.get_events()[0], "No hay eventos disponibles")
+
+    def test_cambio_de_cupo_invalida(self):
+        self.client.force_login(self.regular_user)
+        self.assertContains(self.get_events()[0], "Sin límite")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            set_capacity(self.event, "general", 50)
+
+        self.assertContains(self.get_events()[0], "General: 50")
+
+    def test_token_csrf_propio_en_fragmento_compartido(self):
+        otro = User.objects.create_user(username="organizador2", password="password123", is_organizer=True)
+        self.client.force_login(self.organizer)
+        self.get_events()
+
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(otro)
+        response, _ = self.get_events(client)
+
+        self.assertNotContains(response, CSRF_PLACEHOLDER)
+        token = CSRF_VALUE.search(response.content.decode()).group(1)  # type: ignore
+        response = client.post(reverse("event_delete", args=[self.event.pk]), {"csrfmiddlewaretoken": token})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Event.objects.filter(pk=self.event.pk).exists())
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class EventDetailCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user(
+            username="organizador", password="password123", is_organizer=True
+        )
+        self.regular_user = User.objects.create_user(username="regular", password="password123")
+        self.otro_usuario = User.objects.create_user(username="otro", password="password123")
+        scheduled_at = timezone.now() + datetime.timedelta(days=1)
+        self.event = Event.objects.create(
+            title="Evento", description="Descripción", scheduled_at=scheduled_at, organizer=self.organizer
+        )
+        self.other_event = Event.objects.create(
+            title="Otro evento", description="Descripción", scheduled_at=scheduled_at, organizer=self.organizer
+        )
+        self.rating = Rating.objects.create(
+            title="Muy bueno", text="Texto", rating=4, usuario=self.otro_usuario, evento=self.event
+        )
+
+    def get_detail(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("event_detail", args=[self.event.pk]))
+        return response, len(queries)
+
+    def post_rating(self, evento, titulo):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("formulario_rating"), {
+                "idEventoRating": evento.pk, "tituloR": titulo, "descripcionR": "Texto", "califiqueR": 2,
+            })
+
+    def test_segunda_visita_usa_fragmento(self):
+        self.client.force_login(self.regular_user)
+
+        primera, consultas_primera = self.get_detail()
+        segunda, consultas_segunda = self.get_detail()
+
+        self.assertLess(consultas_segunda, consultas_primera)
+        self.assertContains(segunda, "Muy bueno")
+        # El formulario queda fuera del fragmento y lleva el token de cada usuario
+        self.assertContains(segunda, 'action="/rating/crearRating"')
+        self.assertNotContains(segunda, CSRF_PLACEHOLDER)
+
+    def test_controles_de_organizador_por_rol(self):
+        self.client.force_login(self.regular_user)
+        self.assertNotContains(self.get_detail()[0], "Eliminar")
+
+        self.client.force_login(self.organizer)
+        response = self.get_detail()[0]
+        self.assertContains(response, "Eliminar")
+        self.assertContains(response, "4,00")
+
+    def test_crear_calificacion_invalida_solo_su_evento(self):
+        self.client.force_login(self.regular_user)
+        self.get_detail()
+        key = event_ratings_key(self.event.pk, "attendee")
+
+        self.post_rating(self.other_event, "En el otro")
+        self.assertEqual(event_ratings_key(self.event.pk, "attendee"), key)
+
+        self.post_rating(self.event, "Nueva reseña")
+        self.assertNotEqual(event_ratings_key(self.event.pk, "attendee"), key)
+        self.assertContains(self.get_detail()[0], "Nueva reseña")
+
+    def test_editar_y_eliminar_calificacion_invalidan(self):
+        self.client.force_login(self.otro_usuario)
+        self.get_detail()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("editarRating"), {
+                "idRating": self.rating.pk, "idEventoRating": self.event.pk,
+                "tituloR": "Cambié de idea", "descripcionR": "Texto", "califiqueR": 1,
+            })
+        self.assertContains(self.get_detail()[0], "Cambié de idea")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(reverse("eliminarRating", args=[self.rating.pk]))
+        self.assertNotContains(self.get_detail()[0], "Cambié de idea")
+
+    def test_editar_evento_invalida_detalle(self):
+        key = event_ratings_key(self.event.pk, "attendee")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.update_with_notification(
+                title="Nuevo título", description=None, scheduled_at=self.event.scheduled_at, location=None
+            )
+
+        self.assertNotEqual(event_ratings_key(self.event.pk, "attendee"), key)
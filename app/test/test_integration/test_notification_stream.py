@@ -0,0 +1,107 @@
+import asyncio
+import contextlib
+import datetime
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from app.models import Event, Notification, Ticket, User
+from app.realtime import NotificationHub, hub
+
+
+class NotificationStreamTest(TestCase):
+    def setUp(self):
+        organizer = User.objects.create_user(username="organizador", password="password123", is_organizer=True)
+        self.event = Event.objects.create(
+            title="Evento",
+            description="Descripción",
+            scheduled_at=timezone.now() + datetime.timedelta(days=1),
+            organizer=organizer,
+        )
+        self.holder = User.objects.create_user(username="asistente", password="password123")
+        self.other = User.objects.create_user(username="otro", password="password123")
+        Ticket.objects.create(usuario=self.holder, evento=self.event, quantity=1, buy_date=timezone.now(), type="general")
+        Notification.objects.create(title="Aviso", message="Mensaje", priority="LOW", user=self.holder)
+
+    def new_notification(self, **kwargs):
+        return Notification.objects.acreate(title="Cambio", message="Nueva fecha", priority="HIGH", **kwargs)
+
+    def test_con_wsgi_manda_el_total_y_cierra(self):
+        self.client.login(username="asistente", password="password123")
+
+        response = self.client.get(reverse("notification_stream"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertIn('event: unread\ndata: {"count": 1}', response.content.decode())
+        self.assertIn("retry:", response.content.decode())
+
+    async def test_hub_avisa_solo_a_destinatarios_conectados(self):
+        local_hub = NotificationHub()
+        holder_queue = local_hub.subscribe(self.holder.pk)
+        other_queue = local_hub.subscribe(self.other.pk)
+        # El test maneja las consultas a mano
+        local_hub.task.cancel()
+        await local_hub.poll()
+
+        await self.new_notification(event=self.event)
+        await self.new_notification(user=self.other)
+        await local_hub.poll()
+
+        self.assertEqual(holder_queue.get_nowait()["message"], "Nueva fecha")
+        self.assertTrue(holder_queue.empty())
+        self.assertEqual(other_queue.qsize(), 1)
+
+    async def test_hub_avisa_las_que_confirman_fuera_de_orden(self):
+        local_hub = NotificationHub()
+        holder_queue = local_hub.subscribe(self.holder.pk)
+        local_hub.task.cancel()
+        await local_hub.poll()
+
+        # En PostgreSQL un id menor puede confirmarse después de uno mayor
+        primero = local_hub.last_id + 1
+        await self.new_notification(pk=primero + 1, user=self.holder)
+        await local_hub.poll()
+        await self.new_notification(pk=primero, user=self.holder)
+        await local_hub.poll()
+        await local_hub.poll()
+
+        avisos = [holder_queue.get_nowait()["id"] for _ in range(holder_queue.qsize())]
+        self.assertEqual(avisos, [primero + 1, primero])
+
+    async def test_hub_no_avisa_las_que_ya_existian(self):
+        local_hub = NotificationHub()
+        holder_queue = local_hub.subscribe(self.holder.pk)
+        local_hub.task.cancel()
+        await local_hub.poll()
+        await local_hub.poll()
+
+        self.assertTrue(holder_queue.empty())
+
+    async def test_flujo_asgi_empuja_notificaciones_nuevas(self):
+        await self.async_client.alogin(username="asistente", password="password123")
+
+        with mock.patch.object(hub, "poll_interval", 0.01):
+            response = await self.async_client.get(reverse("notification_stream"))
+            stream = response.streaming_content
+            self.assertIn(b'"count": 1', await stream.__anext__())
+
+            siguiente = asyncio.ensure_future(stream.__anext__())
+            while hub.last_id is None or not hub.subscribers:
+                await asyncio.sleep(0.01)
+            await self.new_notification(event=self.event)
+
+            chunk = await asyncio.wait_for(siguiente, timeout=5)
+
+            # Desconexión del cliente: el handler ASGI cancela la lectura en curso
+            lectura = asyncio.ensure_future(stream.__anext__())
+            await asyncio.sleep(0.05)
+            lectura.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await lectura
+
+        self.assertIn(b"event: notification", chunk)
+        self.assertIn(b"Nueva fecha", chunk)
+        self.assertEqual(dict(hub.subscribers), {})
@@ -0,0 +1,88 @@
+import datetime
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from app import views
+from app.models import Event, EventStats, Rating, Ticket, User
+from app.pagination import encode_cursor
+from app.services import purchase_ticket
+
+
+class OrganizerDashboardTest(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(username="organizador", password="password123", is_organizer=True)
+        self.other_organizer = User.objects.create_user(username="otro", password="password123", is_organizer=True)
+        self.user = User.objects.create_user(username="asistente", password="password123")
+        self.event = Event.objects.create(
+            title="Festival",
+            description="Descripción",
+            scheduled_at=timezone.now() + datetime.timedelta(days=1),
+            organizer=self.organizer,
+        )
+        Event.objects.create(
+            title="Evento ajeno",
+            description="Descripción",
+            scheduled_at=timezone.now() + datetime.timedelta(days=1),
+            organizer=self.other_organizer,
+        )
+
+    async def get(self, user, **params):
+        await self.async_client.aforce_login(user)
+        return await self.async_client.get(reverse("organizer_dashboard"), params)
+
+    async def test_solo_organizadores(self):
+        response = await self.get(self.user)
+        self.assertRedirects(response, reverse("events"), fetch_redirect_response=False)
+
+    def test_muestra_estadisticas_de_sus_eventos(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            purchase_ticket(self.user, self.event, 2, "VIP")
+        Rating.objects.create(usuario=self.user, evento=self.event, title="Genial", text="Texto", rating=5)
+        self.client.force_login(self.organizer)
+
+        response = self.client.get(reverse("organizer_dashboard"))
+
+        self.assertContains(response, "Festival")
+        self.assertNotContains(response, "Evento ajeno")
+        self.assertEqual(response.context["totals"]["vip_sold"], 2)
+        self.assertEqual(response.context["totals"]["revenue"], 80000)
+        self.assertEqual(response.context["events"][0].stats.ratings_histogram, [0, 0, 0, 0, 1])
+
+    async def test_calcula_eventos_sin_estadisticas(self):
+        # Tickets creados sin pasar por los servicios: todavía no hay fila de EventStats
+        await Ticket.objects.acreate(usuario=self.user, evento=self.event, quantity=3, buy_date=timezone.now())
+        self.assertFalse(await EventStats.objects.filter(pk=self.event.pk).aexists())
+
+        response = await self.get(self.organizer)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["events"][0].stats.general_sold, 3)
+        self.assertTrue(await EventStats.objects.filter(pk=self.event.pk).aexists())
+
+    async def test_cursor_de_puntaje_vuelve_a_la_primera_pagina(self):
+        response = await self.get(self.organizer, after=encode_cursor(3.5, 1))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Festival")
+        self.assertIsNotNone(response.context["totals"])
+
+    async def test_paginacion(self):
+        for i in range(3):
+            await Event.objects.acreate(
+                title=f"Evento {i}",
+                description="Descripción",
+                scheduled_at=timezone.now() + datetime.timedelta(days=2 + i),
+                organizer=self.organizer,
+            )
+        with mock.patch.object(views, "DASHBOARD_PAGE_SIZE", 2):
+            first = await self.get(self.organizer)
+            second = await self.get(self.organizer, after=first.context["next_cursor"])
+
+        self.assertEqual(len(first.context["events"]), 2)
+        self.assertIsNotNone(first.context["totals"])
+        self.assertEqual(len(second.context["events"]), 2)
+        self.assertIsNone(second.context["totals"])
+        self.assertIsNone(second.context["next_cursor"])
@@ -0,0 +1,111 @@
+import datetime
+
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from app.exports import ticket_rows
+from app.models import Comment, Event, Notification, Rating, RefundRequest, Ticket, User
+
+
+class QueryPlanTest(TestCase):
+    """Las consultas más frecuentes de las vistas deben resolverse con los índices del modelo."""
+
+    def setUp(self):
+        if connection.vendor not in ("sqlite", "postgresql"):
+            self.skipTest("Solo se inspeccionan planes de SQLite y PostgreSQL")
+        if connection.vendor == "postgresql":
+            # Con tablas tan chicas el planner prefiere un seq scan; se lo desalienta
+            with connection.cursor() as cursor:
+                cursor.execute("SET enable_seqscan = off")
+
+        self.user = User.objects.create_user(username="usuario", password="password123")
+        self.event = Event.objects.create(
+            title="Evento",
+            description="Descripción",
+            scheduled_at=timezone.now() + datetime.timedelta(days=1),
+            organizer=User.objects.create_user(
+                username="organizador", password="password123", is_organizer=True
+            ),
+        )
+
+    def physical_index(self, model, name):
+        # En SQLite una UniqueConstraint se materializa como sqlite_autoindex_<tabla>_N
+        if connection.vendor != "sqlite":
+            return name
+        table = model._meta.db_table
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, table)
+            if constraints[name].get("index"):
+                return name
+            cursor.execute(f"PRAGMA index_list({table})")
+            for _, index, _, origin, _ in cursor.fetchall():
+                cursor.execute(f"PRAGMA index_info({index})")
+                columns = [row[2] for row in cursor.fetchall()]
+                if origin == "u" and columns == constraints[name]["columns"]:
+                    return index
+        self.fail(f"No se encontró el índice físico de {name}")
+
+    def assertUsesIndex(self, queryset, name):
+        plan = queryset.explain()
+        self.assertIn(self.physical_index(queryset.model, name), plan, plan)
+
+    def test_tickets_por_usuario_y_evento(self):
+        self.assertUsesIndex(
+            Ticket.objects.filter(usuario=self.user, evento=self.event), "ticket_user_event_idx"
+        )
+
+    def test_rating_por_usuario_y_evento(self):
+        self.assertUsesIndex(
+            Rating.objects.filter(usuario=self.user, evento=self.event), "unique_rating_per_user_event"
+        )
+
+    def test_pagina_de_reseñas_de_un_evento(self):
+        self.assertUsesIndex(
+            Rating.objects.filter(evento=self.event).order_by("-created_at", "-id")[:21],
+            "rating_event_created_idx",
+        )
+
+    def test_eventos_mejor_calificados(self):
+        self.assertUsesIndex(
+            Event.objects.filter(scheduled_at__gte=timezone.now()).order_by("-rating_score", "-id")[:21],
+            "event_rating_score_idx",
+        )
+
+    def test_exportacion_de_tickets_por_fecha(self):
+        self.assertUsesIndex(
+            ticket_rows(self.event.pk, desde="2025-01-01", hasta="2025-01-31"), "ticket_event_buy_date_idx"
+        )
+
+    def test_reembolsos_pendientes_del_usuario(self):
+        self.assertUsesIndex(
+            RefundRequest.objects.filter(user=self.user, status="pendiente"), "refund_user_status_idx"
+        )
+
+    def test_listado_de_reembolsos(self):
+        self.assertUsesIndex(
+            RefundRequest.objects.order_by("-created_at", "-id")[:20], "refund_created_idx"
+        )
+
+    def test_notificaciones_no_leidas(self):
+        self.assertUsesIndex(
+            Notification.objects.filter(user=self.user, is_read=False), "notif_unread_idx"
+        )
+
+    def test_notificaciones_de_un_evento(self):
+        self.assertUsesIndex(
+            Notification.objects.filter(event=self.event).order_by("-created_at", "-id"),
+            "notif_event_created_idx",
+        )
+
+    def test_comentarios_de_un_evento(self):
+        self.assertUsesIndex(
+            Comment.objects.filter(event=self.event).order_by("-created_at"),
+            "comment_event_created_idx",
+        )
+
+    def test_eventos_proximos(self):
+        self.assertUsesIndex(
+            Event.objects.filter(scheduled_at__gte=timezone.now()).order_by("scheduled_at", "id"),
+            "event_scheduled_idx",
+        )
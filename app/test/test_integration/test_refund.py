@@ -89,3 +89,30 @@ class RefundRequestIntegrationTest(TestCase):
             form.errors["ticket_code"]
         )
 
+
+    def test_integration_refund_list_queries_constantes(self):
+        User.objects.create_user(username="organizer", password="testpass", is_organizer=True)
+        for i in range(5):
+            ticket = Ticket.objects.create(
+                usuario=self.user,
+                evento=self.event,
+                quantity=1,
+                buy_date=make_aware(datetime.now()),
+                type="general"
+            )
+            RefundRequest.objects.create(
+                ticket_code=str(ticket.ticket_code),
+                reason=f"Motivo {i}",
+                user=self.user,
+                status="rechazado"
+            )
+        RefundRequest.objects.create(ticket_code="12345", reason="Sin ticket", user=self.user)
+
+        self.client.login(username="organizer", password="testpass")
+        # sesión + usuario + count del paginador + página con select_related
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse("refund_list"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Evento Integración", count=6)
+        self.assertContains(response, "Evento no encontrado", count=1)
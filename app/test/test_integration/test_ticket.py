@@ -3,6 +3,7 @@ from django.urls import reverse
 from django.utils import timezone
 
 from ...models import Event, Ticket, User
+from ...services import set_capacity
 
 
 class ConfirmTicketViewTest(TestCase):
@@ -77,3 +78,32 @@ class ConfirmTicketViewTest(TestCase):
         self.assertEqual(Ticket.objects.filter(usuario=self.regular_user, evento=self.event).count(), 1)  # No se creó uno nuevo
 
     
+    def test_ticket_sin_stock_muestra_error(self):
+        self.client.login(username="regular", password="password123")
+        set_capacity(self.event, "general", 1)
+
+        form_data = {
+            'id_evento': self.event.pk,
+            'cantidad': 2,
+            'tipo': 'general',
+            'numero_tarjeta': '1234567812345678',
+            'expiracion': timezone.now().strftime('%m/%y'),
+            'cvv': '123',
+            'nombre_tarjeta': 'Juan Pérez',
+            'acepta_terminos': True,
+        }
+
+        response = self.client.post(self.url, data=form_data)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "No quedan suficientes entradas general")
+        self.assertFalse(Ticket.objects.filter(usuario=self.regular_user, evento=self.event).exists())
+
+    def test_compra_muestra_entradas_disponibles(self):
+        self.client.login(username="regular", password="password123")
+        set_capacity(self.event, "VIP", 7)
+
+        response = self.client.get(reverse('buy_ticket', args=[self.event.pk]))
+
+        self.assertEqual(response.context["stock"], {"general": None, "VIP": 7})
+        self.assertContains(response, "VIP: 7")
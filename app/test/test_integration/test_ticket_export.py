@@ -0,0 +1,83 @@
+import csv
+import datetime
+import io
+import json
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from app.models import Event, Ticket, User
+
+
+class ExportTicketsTest(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(
+            username="organizador", password="password123", is_organizer=True
+        )
+        self.asistente = User.objects.create_user(
+            username="asistente", email="asistente@test.com", password="password123"
+        )
+        self.event = Event.objects.create(
+            title="Evento", description="Descripción", scheduled_at=timezone.now(), organizer=self.organizer
+        )
+        self.enero = timezone.make_aware(datetime.datetime(2025, 1, 10, 12, 0))
+        self.febrero = timezone.make_aware(datetime.datetime(2025, 2, 10, 12, 0))
+        self.general = Ticket.objects.create(
+            usuario=self.asistente, evento=self.event, quantity=2, buy_date=self.enero, type="general"
+        )
+        self.vip = Ticket.objects.create(
+            usuario=self.asistente, evento=self.event, quantity=1, buy_date=self.febrero, type="VIP"
+        )
+        self.url = reverse("export_tickets", args=[self.event.pk])
+
+    def export(self, **query):
+        self.client.force_login(self.organizer)
+        response = self.client.get(self.url, query)
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_con_encabezado_y_filas(self):
+        filas = list(csv.reader(io.StringIO(self.export())))
+
+        self.assertEqual(filas[0], ["ticket_code", "username", "email", "type", "quantity", "buy_date"])
+        self.assertEqual(
+            filas[1],
+            [str(self.general.pk), "asistente", "asistente@test.com", "general", "2",
+             timezone.localtime(self.enero).isoformat()],
+        )
+        self.assertEqual(len(filas), 3)
+
+    def test_ndjson_un_objeto_por_linea(self):
+        registros = [json.loads(linea) for linea in self.export(format="ndjson").splitlines()]
+
+        self.assertEqual([r["ticket_code"] for r in registros], [self.general.pk, self.vip.pk])
+        self.assertEqual(registros[1]["type"], "VIP")
+
+    def test_filtra_por_tipo_y_fechas(self):
+        self.assertEqual(len(self.export(format="ndjson", type="VIP").splitlines()), 1)
+        # hasta incluye todo el día indicado
+        solo_enero = self.export(format="ndjson", desde="2025-01-01", hasta="2025-01-10").splitlines()
+        self.assertEqual([json.loads(linea)["ticket_code"] for linea in solo_enero], [self.general.pk])
+        self.assertEqual(self.export(format="ndjson", desde="2025-03-01"), "")
+
+    def test_parametros_invalidos(self):
+        self.client.force_login(self.organizer)
+        for query in ({"format": "xml"}, {"type": "platea"}, {"desde": "10/01/2025"}):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(self.url, query).status_code, 400)
+
+    def test_solo_el_organizador_del_evento(self):
+        otro = User.objects.create_user(username="otro_org", password="password123", is_organizer=True)
+        for usuario in (self.asistente, otro):
+            with self.subTest(usuario=usuario.username):
+                self.client.force_login(usuario)
+                self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    async def test_asgi_transmite_con_iterador_async(self):
+        await self.async_client.aforce_login(self.organizer)
+        response = await self.async_client.get(self.url, {"format": "ndjson"})
+
+        self.assertTrue(response.is_async)
+        contenido = b"".join([parte async for parte in response.streaming_content]).decode()
+        self.assertEqual(len(contenido.splitlines()), 2)
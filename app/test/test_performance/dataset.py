@@ -0,0 +1,59 @@
+"""
+Datos a escala para los tests de performance.
+
+Los genera app.seeding (lo mismo que `manage.py seed_scale`) y después elige
+las filas de referencia que usan los escenarios: un asistente con ticket,
+rating, comentario, notificación y reembolso sobre un mismo evento.
+"""
+from dataclasses import dataclass
+
+from app.models import Comment, Event, Notification, Rating, RefundRequest, Ticket, User
+from app.seeding import seed_scale
+
+
+@dataclass
+class Dataset:
+    organizer: User
+    user: User
+    event: Event
+    ticket: Ticket
+    rating: Rating
+    comment: Comment
+    notification: Notification
+    refund: RefundRequest
+    unrated_event: Event
+
+
+def seed_dataset(scale=1.0, seed=0, **overrides):
+    seed_scale(scale=scale, seed=seed, **overrides)
+
+    refund = RefundRequest.objects.select_related("user", "ticket__evento__organizer").order_by("pk").first()
+    user, ticket = refund.user, refund.ticket # type: ignore
+    event = ticket.evento
+    rating = Rating.objects.filter(usuario=user, evento=event).first() or Rating.objects.create(
+        usuario=user, evento=event, title="Reseña", text="Opinión sobre el evento", rating=4
+    )
+    comment = Comment.objects.filter(user=user, event=event).first() or Comment.objects.create(
+        user=user, event=event, title="Comentario", text="Texto del comentario"
+    )
+    notification = Notification.objects.filter(user=user).first() or Notification.objects.create(
+        user=user, event=event, title="Aviso", message="Cambió la información del evento",
+        priority=Notification.PRIORITY_MEDIUM,
+    )
+    unrated_event = (
+        Event.objects.exclude(organized_ratings__usuario=user)
+        .exclude(organized_tickets__usuario=user)
+        .order_by("pk")
+        .first()
+    )
+    return Dataset(
+        organizer=event.organizer,
+        user=user,
+        event=event,
+        ticket=ticket,
+        rating=rating,
+        comment=comment,
+        notification=notification,
+        refund=refund, # type: ignore
+        unrated_event=unrated_event, # type: ignore
+    )
@@ -0,0 +1,194 @@
+"""
+Presupuesto de consultas SQL y de tiempo para cada URL con nombre de app/urls.py.
+
+Los presupuestos viven en query_budgets.json para que cualquier cambio quede
+visible en la revisión del PR. Para regenerarlos después de un cambio
+intencional:
+
+    UPDATE_QUERY_BUDGETS=1 python manage.py test app.test.test_performance
+"""
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+
+from app import urls
+
+from .dataset import seed_dataset
+
+BUDGETS_FILE = Path(__file__).with_name("query_budgets.json")
+# Margen sobre los milisegundos medidos al regenerar, piso para no fallar por ruido,
+# y factor para máquinas lentas (CI)
+TIME_HEADROOM = 3
+TIME_FLOOR_MS = 200
+TIME_FACTOR = float(os.environ.get("QUERY_BUDGET_TIME_FACTOR", 1))
+
+
+@dataclass
+class Scenario:
+    role: str  # "anonymous", "user" u "organizer"
+    method: str = "get"
+    args: Callable = lambda d: []
+    data: Callable = lambda d: {}
+    query: dict = field(default_factory=dict)
+
+
+def rating_data(evento):
+    return {"idEventoRating": evento.pk, "tituloR": "Gran experiencia", "descripcionR": "", "califiqueR": 4}
+
+
+SCENARIOS = {
+    "home": Scenario("anonymous"),
+    "register": Scenario("anonymous"),
+    "logout": Scenario("user", "post"),
+    "login": Scenario("anonymous"),
+    # Eventos
+    "events": Scenario("user"),
+    "event_form": Scenario("organizer"),
+    "event_search": Scenario("user", query={"q": "evento agenda"}),
+    "event_import": Scenario("organizer"),
+    "organizer_dashboard": Scenario("organizer"),
+    "event_edit": Scenario("organizer", args=lambda d: [d.event.pk]),
+    "event_detail": Scenario("user", args=lambda d: [d.event.pk]),
+    "event_sales": Scenario("organizer", args=lambda d: [d.event.pk], query={"granularity": "hour"}),
+    "event_delete": Scenario("organizer", "post", args=lambda d: [d.event.pk]),
+    "event_ratings": Scenario("user", args=lambda d: [d.event.pk]),
+    # Ratings
+    "inicio_rating": Scenario("user"),
+    "formulario_rating": Scenario("user", "post", data=lambda d: rating_data(d.unrated_event)),
+    "editarRating": Scenario(
+        "user", "post", data=lambda d: {**rating_data(d.event), "idRating": d.rating.pk}
+    ),
+    "eliminarRating": Scenario("user", args=lambda d: [d.rating.pk]),
+    "edicionRating": Scenario("user", args=lambda d: [d.rating.pk]),
+    # Comentarios
+    "comments": Scenario("user", args=lambda d: [d.event.pk]),
+    "registrar_comentario": Scenario(
+        "user", "post", data=lambda d: {"title": "Hola", "text": "Buen evento", "event_id": d.event.pk}
+    ),
+    "delete_comment": Scenario("user", args=lambda d: [d.event.pk, d.comment.pk]),
+    "edit_comment": Scenario(
+        "user", "post", args=lambda d: [d.event.pk, d.comment.pk], data=lambda d: {"title": "Editado", "text": "Nuevo texto"}
+    ),
+    # Notificaciones
+    "notification_redirect": Scenario("user"),
+    "notification_list": Scenario("organizer"),
+    "notification_list_user": Scenario("user"),
+    "mark_as_read": Scenario("user", args=lambda d: [d.notification.pk]),
+    "notification_stream": Scenario("user"),
+    "notification_create": Scenario("organizer"),
+    "notification_detail": Scenario("organizer", args=lambda d: [d.notification.pk]),
+    "notification_edit": Scenario("organizer", args=lambda d: [d.notification.pk]),
+    "notification_delete": Scenario("organizer", args=lambda d: [d.notification.pk]),
+    # Reembolsos
+    "refund_create": Scenario("user"),
+    "refund_list": Scenario("organizer"),
+    "refund_edit": Scenario("user", args=lambda d: [d.refund.pk]),
+    "refund_delete": Scenario("user", "post", args=lambda d: [d.refund.pk]),
+    "refund_accept": Scenario("organizer", "post", args=lambda d: [d.refund.pk]),
+    "refund_reject": Scenario("organizer", "post", args=lambda d: [d.refund.pk]),
+    "refund_detail": Scenario("user", args=lambda d: [d.refund.pk]),
+    # Tickets
+    "gestion_ticket": Scenario("user", args=lambda d: [d.event.pk]),
+    "export_tickets": Scenario("organizer", args=lambda d: [d.event.pk], query={"format": "ndjson"}),
+    "create_ticket": Scenario(
+        "user", "post", data=lambda d: {"idEvento": d.unrated_event.pk, "tipoEntrada": "general", "cantidadTk": 1}
+    ),
+    "edit_ticket": Scenario("user", args=lambda d: [d.ticket.pk]),
+    "delete_ticket": Scenario("user", args=lambda d: [d.ticket.pk]),
+    "buy_ticket": Scenario("user", args=lambda d: [d.event.pk]),
+    "confirm_ticket": Scenario(
+        "user",
+        "post",
+        data=lambda d: {
+            "id_evento": d.unrated_event.pk,
+            "cantidad": 1,
+            "tipo": "general",
+            "numero_tarjeta": "4111111111111111",
+            "expiracion": "12/40",
+            "cvv": "123",
+            "nombre_tarjeta": "Usuario Perf",
+            "acepta_terminos": "on",
+        },
+    ),
+    "update_ticket": Scenario(
+        "user",
+        "post",
+        data=lambda d: {
+            "ticketCode": d.ticket.pk,
+            "buy_date": "2025-01-01T10:00",
+            "cantidadTk": 2,
+            "tipoEntrada": "VIP",
+        },
+    ),
+}
+
+
+def url_names():
+    return [p.name for p in urls.urlpatterns if isinstance(p, URLPattern) and p.name]
+
+
+class QueryBudgetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = seed_dataset()
+        cls.budgets = json.loads(BUDGETS_FILE.read_text()) if BUDGETS_FILE.exists() else {}
+
+    def login(self, role):
+        self.client.logout()
+        if role != "anonymous":
+            self.client.force_login(getattr(self.data, role))
+
+    def measure(self, name):
+        scenario = SCENARIOS[name]
+        url = reverse(name, args=scenario.args(self.data))
+        self.login(scenario.role)
+        request = getattr(self.client, scenario.method)
+        payload = scenario.data(self.data) if scenario.method == "post" else scenario.query
+
+        # Cada vista corre en un savepoint que se descarta: todas ven el mismo dataset
+        with transaction.atomic(), CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = request(url, payload)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            transaction.set_rollback(True)
+
+        self.assertLess(response.status_code, 400, f"{name} respondió {response.status_code}")
+        return len(queries), elapsed_ms, queries
+
+    def test_todas_las_urls_tienen_escenario(self):
+        self.assertEqual(sorted(url_names()), sorted(SCENARIOS))
+
+    def test_presupuesto_por_vista(self):
+        measured = {}
+        for name in url_names():
+            with self.subTest(view=name):
+                count, elapsed_ms, queries = self.measure(name)
+                measured[name] = {
+                    "queries": count,
+                    "ms": max(TIME_FLOOR_MS, int(round(elapsed_ms * TIME_HEADROOM, -1))),
+                }
+                if os.environ.get("UPDATE_QUERY_BUDGETS"):
+                    continue
+
+                budget = self.budgets.get(name)
+                self.assertIsNotNone(budget, f"{name} no tiene presupuesto en {BUDGETS_FILE.name}")
+                sql = "\n".join(q["sql"] for q in queries.captured_queries)
+                self.assertLessEqual(
+                    count, budget["queries"],
+                    f"{name} hizo {count} consultas (presupuesto {budget['queries']}):\n{sql}",
+                )
+                self.assertLessEqual(
+                    elapsed_ms, budget["ms"] * TIME_FACTOR,
+                    f"{name} tardó {elapsed_ms:.0f} ms (presupuesto {budget['ms']} ms)",
+                )
+
+        if os.environ.get("UPDATE_QUERY_BUDGETS"):
+            BUDGETS_FILE.write_text(json.dumps(measured, indent=2, sort_keys=True) + "\n")
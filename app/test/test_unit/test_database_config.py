@@ -0,0 +1,97 @@
+import os
+from pathlib import Path
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from eventhub.cache import parse_cache_url
+from eventhub.database import database_config, parse_database_url
+
+BASE_DIR = Path("/srv/eventhub")
+
+
+class DatabaseUrlTest(SimpleTestCase):
+    def test_sqlite_relativo_y_absoluto(self):
+        relativo = parse_database_url("sqlite:///db/eventhub.sqlite3", BASE_DIR)
+        absoluto = parse_database_url("sqlite:////var/lib/eventhub.sqlite3", BASE_DIR)
+
+        self.assertEqual(relativo["ENGINE"], "django.db.backends.sqlite3")
+        self.assertEqual(relativo["NAME"], "/srv/eventhub/db/eventhub.sqlite3")
+        self.assertEqual(absoluto["NAME"], "/var/lib/eventhub.sqlite3")
+
+    def test_postgres_con_opciones(self):
+        config = parse_database_url("postgres://user:p%40ss@db:5433/eventhub?sslmode=require", BASE_DIR)
+
+        self.assertEqual(config["ENGINE"], "django.db.backends.postgresql")
+        self.assertEqual(config["NAME"], "eventhub")
+        self.assertEqual(config["USER"], "user")
+        self.assertEqual(config["PASSWORD"], "p@ss")
+        self.assertEqual(config["HOST"], "db")
+        self.assertEqual(config["PORT"], "5433")
+        self.assertEqual(config["OPTIONS"], {"sslmode": "require"})
+
+    def test_esquema_no_soportado(self):
+        with self.assertRaises(ValueError):
+            parse_database_url("mysql://localhost/eventhub", BASE_DIR)
+
+    @mock.patch.dict(os.environ, {}, clear=True)
+    def test_sqlite_por_defecto(self):
+        config = database_config(BASE_DIR)
+
+        self.assertEqual(config["NAME"], BASE_DIR / "db.sqlite3")
+        self.assertEqual(config["OPTIONS"]["transaction_mode"], "IMMEDIATE")
+        self.assertEqual(config["OPTIONS"]["timeout"], 20)
+
+    @mock.patch.dict(os.environ, {"DATABASE_URL": "postgres://u:p@db/eventhub"}, clear=True)
+    def test_postgres_conexiones_persistentes(self):
+        config = database_config(BASE_DIR)
+
+        self.assertEqual(config["CONN_MAX_AGE"], 60)
+        self.assertTrue(config["CONN_HEALTH_CHECKS"])
+        self.assertNotIn("pool", config["OPTIONS"])
+
+    @mock.patch.dict(
+        os.environ,
+        {"DATABASE_URL": "postgres://u:p@db/eventhub", "DB_POOL": "true", "DB_POOL_MAX_SIZE": "20"},
+        clear=True,
+    )
+    def test_postgres_con_pool(self):
+        config = database_config(BASE_DIR)
+
+        self.assertEqual(config["CONN_MAX_AGE"], 0)
+        self.assertEqual(config["OPTIONS"]["pool"]["max_size"], 20)
+
+
+class SQLitePragmasTest(TestCase):
+    def test_pragmas_aplicados_a_la_conexion(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("Solo aplica a SQLite")
+
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA busy_timeout")
+            busy_timeout = cursor.fetchone()[0]
+            cursor.execute("PRAGMA synchronous")
+            synchronous = cursor.fetchone()[0]
+
+        self.assertEqual(busy_timeout, connection.settings_dict["OPTIONS"]["timeout"] * 1000)
+        self.assertEqual(synchronous, 1)  # NORMAL
+
+
+class CacheUrlTest(SimpleTestCase):
+    def test_backends(self):
+        self.assertEqual(parse_cache_url("locmem://")["BACKEND"], "django.core.cache.backends.locmem.LocMemCache")
+        self.assertEqual(parse_cache_url("file:///var/tmp/cache")["LOCATION"], "/var/tmp/cache")
+        redis = parse_cache_url("redis://redis:6379/1")
+        self.assertEqual(redis["BACKEND"], "django.core.cache.backends.redis.RedisCache")
+        self.assertEqual(redis["LOCATION"], "redis://redis:6379/1")
+
+    def test_esquema_no_soportado(self):
+        with self.assertRaises(ValueError):
+            parse_cache_url("memcached://localhost:11211")
+
+    def test_los_tests_corren_sin_cache(self):
+        # Lo desactiva eventhub.test_runner, sin importar CACHE_URL
+        cache.set("clave", "valor")
+        self.assertIsNone(cache.get("clave"))
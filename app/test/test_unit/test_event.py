@@ -49,6 +49,12 @@ class EventModelTest(TestCase):
         self.assertIn("description", errors)
         self.assertEqual(errors["description"], "Por favor ingrese una descripcion")
 
+    def test_event_validate_sin_fecha_y_titulo_largo(self):
+        """Test que verifica que se exige la fecha y se respeta el largo del título"""
+        errors = Event.validate("x" * 201, "Descripción válida", None)
+        self.assertEqual(errors["title"], "El titulo es demasiado largo")
+        self.assertEqual(errors["scheduled_at"], "Por favor ingrese una fecha valida")
+
     def test_event_new_with_valid_data(self):
         """Test que verifica la creación de eventos con datos válidos"""
         scheduled_at = timezone.now() + datetime.timedelta(days=2)
@@ -1,9 +1,13 @@
 import datetime
+from io import StringIO
 
+from django.core.management import call_command
+from django.db import IntegrityError
 from django.test import TestCase
 from django.utils import timezone
 
-from app.models import Event, Rating, User
+from app.models import Event, EventStats, Rating, User
+from app.pagination import decode_cursor, encode_cursor
 
 
 class EventRatingTestCase(TestCase):
@@ -28,6 +32,10 @@ class EventRatingTestCase(TestCase):
             password="password123",
             is_organizer=False,
         )
+        self.other_users = [
+            User.objects.create_user(username=f"asistente{i}", password="password123")
+            for i in range(2)
+        ]
 
     def test_promedio_rating_sin_ratings(self):
         promedio = self.event.promedio_rating()
@@ -42,14 +50,14 @@ class EventRatingTestCase(TestCase):
             rating=4
         )
         Rating.objects.create(
-            usuario=self.regular_user,
+            usuario=self.other_users[0],
             evento=self.event,
             title="Excelente",
             text="Muy buena experiencia",
             rating=5
         )
         Rating.objects.create(
-            usuario=self.regular_user,
+            usuario=self.other_users[1],
             evento=self.event,
             title="Regular",
             text="Podría mejorar",
@@ -70,3 +78,183 @@ class EventRatingTestCase(TestCase):
 
         promedio = self.event.promedio_rating()
         self.assertEqual(promedio, 5)
+
+    def test_promedio_rating_se_actualiza_al_editar(self):
+        rating = Rating.objects.create(
+            usuario=self.regular_user,
+            evento=self.event,
+            title="Buena",
+            text="Me gustó",
+            rating=2
+        )
+        rating.rating = 4
+        rating.save()
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.rating_count, 1)
+        self.assertEqual(self.event.rating_sum, 4)
+        self.assertEqual(self.event.promedio_rating(), 4)
+
+    def test_promedio_rating_se_actualiza_al_eliminar(self):
+        Rating.objects.create(
+            usuario=self.regular_user,
+            evento=self.event,
+            title="Buena",
+            text="Me gustó",
+            rating=4
+        )
+        rating = Rating.objects.create(
+            usuario=self.other_users[0],
+            evento=self.event,
+            title="Mala",
+            text="No me gustó",
+            rating=1
+        )
+        rating.delete()
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.rating_count, 1)
+        self.assertEqual(self.event.promedio_rating(), 4)
+
+    def test_eliminar_dos_veces_descuenta_una_sola_vez(self):
+        self.calificar(self.event, self.other_users[0], 5)
+        rating = self.calificar(self.event, self.regular_user, 2)
+        copia = Rating.objects.get(pk=rating.pk)
+        EventStats.rebuild()
+
+        rating.delete()
+        copia.delete()
+
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.rating_count, self.event.rating_sum), (1, 5))
+        self.assertEqual(EventStats.objects.get(pk=self.event.pk).ratings_histogram, [0, 0, 0, 0, 1])
+
+    def test_eliminar_instancia_vieja_descuenta_lo_guardado(self):
+        rating = self.calificar(self.event, self.regular_user, 2)
+        vieja = Rating.objects.get(pk=rating.pk)
+        rating.rating = 4
+        rating.save()
+
+        vieja.delete()
+
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.rating_count, self.event.rating_sum), (0, 0))
+        self.assertEqual(Event.rebuild_rating_stats(), 0)
+
+    def test_borrar_usuario_descuenta_sus_calificaciones(self):
+        otro_evento = Event.objects.create(
+            title="Otro evento",
+            description="Descripción",
+            scheduled_at=timezone.now() + datetime.timedelta(days=2),
+            organizer=self.organizer,
+        )
+        self.calificar(self.event, self.regular_user, 2)
+        self.calificar(self.event, self.other_users[0], 5)
+        self.calificar(otro_evento, self.regular_user, 4)
+        EventStats.rebuild()
+
+        self.regular_user.delete()
+
+        self.event.refresh_from_db()
+        otro_evento.refresh_from_db()
+        self.assertEqual((self.event.rating_count, self.event.rating_sum), (1, 5))
+        self.assertAlmostEqual(self.event.rating_score, Event.bayesian_score(1, 5))
+        self.assertEqual((otro_evento.rating_count, otro_evento.rating_sum), (0, 0))
+        self.assertAlmostEqual(otro_evento.rating_score, Event.RATING_PRIOR_MEAN)
+        self.assertEqual(EventStats.objects.get(pk=self.event.pk).ratings_histogram, [0, 0, 0, 0, 1])
+        self.assertEqual(EventStats.objects.get(pk=otro_evento.pk).ratings_histogram, [0, 0, 0, 0, 0])
+        # Lo mismo que recalcularía rebuild_rating_stats
+        self.assertEqual(Event.rebuild_rating_stats(), 0)
+
+    def test_save_de_evento_no_pisa_los_contadores(self):
+        evento_viejo = Event.objects.get(pk=self.event.pk)
+        Rating.objects.create(
+            usuario=self.regular_user,
+            evento=self.event,
+            title="Buena",
+            text="Me gustó",
+            rating=5
+        )
+        evento_viejo.title = "Nuevo título"
+        evento_viejo.save()
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.title, "Nuevo título")
+        self.assertEqual(self.event.rating_count, 1)
+        self.assertEqual(self.event.rating_sum, 5)
+
+    def test_rebuild_rating_stats_corrige_contadores(self):
+        Rating.objects.create(
+            usuario=self.regular_user,
+            evento=self.event,
+            title="Buena",
+            text="Me gustó",
+            rating=3
+        )
+        Event.objects.filter(pk=self.event.pk).update(rating_count=0, rating_sum=0)
+
+        call_command("rebuild_rating_stats", stdout=StringIO())
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.rating_count, 1)
+        self.assertEqual(self.event.rating_sum, 3)
+
+    def test_un_solo_rating_por_usuario_y_evento(self):
+        Rating.objects.create(
+            usuario=self.regular_user,
+            evento=self.event,
+            title="Buena",
+            text="Me gustó",
+            rating=4
+        )
+
+        with self.assertRaises(IntegrityError):
+            Rating.objects.create(
+                usuario=self.regular_user,
+                evento=self.event,
+                title="Otra",
+                text="Segunda opinión",
+                rating=1
+            )
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.rating_count, 1)
+        self.assertEqual(self.event.rating_sum, 4)
+
+    def calificar(self, evento, usuario, rating):
+        return Rating.objects.create(usuario=usuario, evento=evento, title="Reseña", text="Texto", rating=rating)
+
+    def test_rating_score_se_actualiza_con_cada_rating(self):
+        self.assertEqual(self.event.rating_score, Event.RATING_PRIOR_MEAN)
+
+        rating = self.calificar(self.event, self.regular_user, 5)
+        self.assertAlmostEqual(self.event.rating_score, Event.bayesian_score(1, 5))
+        rating.rating = 1
+        rating.save()
+        self.event.refresh_from_db()
+        self.assertAlmostEqual(self.event.rating_score, Event.bayesian_score(1, 1))
+        rating.delete()
+        self.event.refresh_from_db()
+        self.assertAlmostEqual(self.event.rating_score, Event.RATING_PRIOR_MEAN)
+
+    def test_rating_score_favorece_muchas_calificaciones(self):
+        # Un solo 5 no supera a muchas calificaciones casi perfectas
+        self.assertLess(Event.bayesian_score(1, 5), Event.bayesian_score(1000, 4800))
+        self.assertGreater(Event.bayesian_score(1000, 4800), Event.bayesian_score(10, 48))
+
+    def test_rebuild_rating_stats_corrige_rating_score(self):
+        self.calificar(self.event, self.regular_user, 4)
+        Event.objects.filter(pk=self.event.pk).update(rating_score=0)
+
+        call_command("rebuild_rating_stats", stdout=StringIO())
+
+        self.event.refresh_from_db()
+        self.assertAlmostEqual(self.event.rating_score, Event.bayesian_score(1, 4))
+
+    def test_cursor_de_puntaje(self):
+        self.assertEqual(decode_cursor(encode_cursor(4.25, 7), float), (4.25, 7))
+        fecha = timezone.now()
+        self.assertEqual(decode_cursor(encode_cursor(fecha, 7)), (fecha, 7))
+        # Un cursor del otro tipo no sirve para esta ordenación
+        self.assertIsNone(decode_cursor(encode_cursor(4.25, 7)))
+        self.assertIsNone(decode_cursor(encode_cursor(fecha, 7), float))
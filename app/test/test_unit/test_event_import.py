@@ -0,0 +1,123 @@
+import datetime
+import io
+import json
+import tempfile
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from app.jsonstream import iter_json_items
+from app.models import Event, User
+from app.search import search_events
+from app.services import EventImportError, import_events
+
+CSV_HEADER = "title,description,date,time,location\n"
+
+
+class IterJsonItemsTest(TestCase):
+    def test_arreglo_y_ndjson_en_pedazos_chicos(self):
+        items = [{"id": i, "texto": "ñ" * i, "lista": [1.5, None]} for i in range(20)] + [12345, "fin"]
+        for read_size in (1, 3, 64):
+            with self.subTest(read_size=read_size):
+                arreglo = io.StringIO(json.dumps(items, indent=2))
+                self.assertEqual(list(iter_json_items(arreglo, read_size)), items)
+                ndjson = io.StringIO("\n".join(json.dumps(item) for item in items))
+                self.assertEqual(list(iter_json_items(ndjson, read_size)), items)
+
+    def test_vacio(self):
+        self.assertEqual(list(iter_json_items(io.StringIO(" [ ] "))), [])
+        self.assertEqual(list(iter_json_items(io.StringIO(""))), [])
+
+    def test_json_mal_formado(self):
+        for texto in ("[1 2]", "[1,", "[1] x", '[{"a":}]'):
+            with self.subTest(texto=texto), self.assertRaises(ValueError):
+                list(iter_json_items(io.StringIO(texto), read_size=2))
+
+
+class ImportEventsTest(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(
+            username="organizador", password="password123", is_organizer=True
+        )
+        self.fecha = (timezone.localdate() + datetime.timedelta(days=10)).isoformat()
+
+    def test_csv_importa_las_validas_y_reporta_las_otras(self):
+        stream = io.StringIO(
+            CSV_HEADER
+            + f"Festival,Escenario principal,{self.fecha},20:30,Parque\n"
+            + f",Sin título,{self.fecha},21:00,\n"
+            + "Sin fecha,Descripción,31/12/2030,10:00,\n"
+            + f"Charla,Sala chica,{self.fecha},,\n"
+        )
+
+        report = import_events(stream, "csv", self.organizer)
+
+        self.assertEqual((report.created, report.rejected), (2, 2))
+        self.assertEqual([number for number, _ in report.errors], [3, 4])
+        self.assertIn("title", report.errors[0][1])
+        self.assertIn("scheduled_at", report.errors[1][1])
+        festival = Event.objects.get(title="Festival")
+        self.assertEqual(festival.organizer, self.organizer)
+        self.assertEqual(festival.location, "Parque")
+        self.assertEqual(timezone.localtime(festival.scheduled_at).strftime("%H:%M"), "20:30")
+        self.assertEqual(Event.objects.get(title="Charla").location, "Por definir")
+
+    def test_json_en_lotes(self):
+        rows = [
+            {"title": f"Sesión {i}", "description": "Taller", "scheduled_at": f"{self.fecha}T10:00:00"}
+            for i in range(7)
+        ] + ["no es un objeto"]
+
+        lotes = []
+        bulk_create = Event.objects.bulk_create
+
+        def registrar(objs, **kwargs):
+            lotes.append(len(objs))
+            return bulk_create(objs, **kwargs)
+
+        with mock.patch.object(Event.objects, "bulk_create", side_effect=registrar):
+            report = import_events(io.StringIO(json.dumps(rows)), "json", self.organizer, batch_size=3)
+
+        self.assertEqual(report.created, 7)
+        self.assertEqual(report.errors, [(8, {"fila": "Cada registro debe ser un objeto con los campos del evento"})])
+        self.assertEqual(lotes, [3, 3, 1])
+        self.assertEqual(Event.objects.filter(title__startswith="Sesión").count(), 7)
+
+    def test_eventos_importados_se_pueden_buscar(self):
+        stream = io.StringIO(CSV_HEADER + f"Jornada de robótica,Talleres,{self.fecha},09:00,Campus\n")
+        import_events(stream, "csv", self.organizer)
+
+        self.assertEqual([e.title for e in search_events("robótica")], ["Jornada de robótica"])
+
+    def test_dry_run_no_crea_eventos(self):
+        stream = io.StringIO(CSV_HEADER + f"Festival,Descripción,{self.fecha},20:00,\n")
+        report = import_events(stream, "csv", self.organizer, dry_run=True)
+
+        self.assertEqual(report.created, 1)
+        self.assertFalse(Event.objects.exists())
+
+    def test_archivo_mal_formado_no_deja_nada(self):
+        rows = json.dumps([{"title": "Uno", "description": "D", "scheduled_at": f"{self.fecha}T10:00"}] * 3)
+        with self.assertRaises(EventImportError):
+            import_events(io.StringIO(rows[:-5]), "json", self.organizer, batch_size=1)
+        self.assertFalse(Event.objects.exists())
+
+    def test_csv_sin_columnas_requeridas(self):
+        with self.assertRaisesMessage(EventImportError, "description, scheduled_at"):
+            import_events(io.StringIO("title,location\nUno,Sala\n"), "csv", self.organizer)
+
+    def test_comando_import_events(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", encoding="utf-8") as archivo:
+            archivo.write(CSV_HEADER + f"Festival,Descripción,{self.fecha},20:00,\n,Sin título,{self.fecha},,\n")
+            archivo.flush()
+            stdout, stderr = io.StringIO(), io.StringIO()
+            call_command("import_events", archivo.name, organizer="organizador", stdout=stdout, stderr=stderr)
+
+            self.assertIn("1 filas importadas, 1 rechazadas", stdout.getvalue())
+            self.assertIn("Fila 3: title: Por favor ingrese un titulo", stderr.getvalue())
+            self.assertTrue(Event.objects.filter(title="Festival").exists())
+
+            with self.assertRaises(CommandError):
+                call_command("import_events", archivo.name, organizer="nadie", stdout=stdout)
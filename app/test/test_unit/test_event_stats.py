@@ -0,0 +1,143 @@
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from app.jobs import execute
+from app.jobs.stats import schedule_stats_rebuild
+from app.models import Comment, Event, EventStats, Job, Rating, RefundRequest, Ticket, User
+from app.services import cancel_ticket, change_ticket, purchase_ticket
+
+
+class EventStatsTest(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(username="organizador", password="password123", is_organizer=True)
+        self.user = User.objects.create_user(username="asistente", password="password123")
+        self.other = User.objects.create_user(username="otro", password="password123")
+        self.event = Event.objects.create(
+            title="Festival",
+            description="Descripción",
+            scheduled_at=timezone.now() + datetime.timedelta(days=1),
+            organizer=self.organizer,
+        )
+
+    def stats(self):
+        return EventStats.objects.get(pk=self.event.pk)
+
+    def assertMatchesRebuild(self):
+        incremental = self.stats()
+        EventStats.rebuild(Event.objects.filter(pk=self.event.pk))
+        rebuilt = self.stats()
+        for field in ("general_sold", "vip_sold", "revenue", "comment_count", *EventStats.RATING_FIELDS,
+                      *EventStats.REFUND_FIELDS.values()):
+            self.assertEqual(getattr(incremental, field), getattr(rebuilt, field), field)
+
+    def test_compra_cambio_y_cancelacion(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket = purchase_ticket(self.user, self.event, 2, "general")
+        stats = self.stats()
+        self.assertEqual((stats.general_sold, stats.vip_sold, stats.revenue), (2, 0, 40000))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            change_ticket(ticket, 1, "VIP")
+        stats = self.stats()
+        self.assertEqual((stats.general_sold, stats.vip_sold, stats.revenue), (0, 1, 40000))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            cancel_ticket(ticket)
+        stats = self.stats()
+        self.assertEqual((stats.general_sold, stats.vip_sold, stats.revenue), (0, 0, 0))
+        self.assertMatchesRebuild()
+
+    def test_compra_no_escribe_estadisticas_dentro_de_la_transaccion(self):
+        EventStats.rebuild(Event.objects.filter(pk=self.event.pk))
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            purchase_ticket(self.user, self.event, 2, "general")
+        self.assertEqual(self.stats().general_sold, 0)
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.stats().general_sold, 2)
+
+    def test_histograma_de_calificaciones(self):
+        rating = Rating.objects.create(usuario=self.user, evento=self.event, title="Bien", text="Texto", rating=4)
+        Rating.objects.create(usuario=self.other, evento=self.event, title="Genial", text="Texto", rating=5)
+        self.assertEqual(self.stats().ratings_histogram, [0, 0, 0, 1, 1])
+
+        rating.rating = 2
+        rating.save()
+        self.assertEqual(self.stats().ratings_histogram, [0, 1, 0, 0, 1])
+
+        rating.delete()
+        self.assertEqual(self.stats().ratings_histogram, [0, 0, 0, 0, 1])
+        self.assertMatchesRebuild()
+
+    def test_comentarios(self):
+        comment = Comment.objects.create(title="Hola", text="Texto", user=self.user, event=self.event)
+        Comment.objects.create(title="Chau", text="Texto", user=self.other, event=self.event)
+        self.assertEqual(self.stats().comment_count, 2)
+
+        comment.text = "Editado"
+        comment.save()
+        self.assertEqual(self.stats().comment_count, 2)
+
+        comment.delete()
+        self.assertEqual(self.stats().comment_count, 1)
+        self.assertMatchesRebuild()
+
+    def test_eliminar_comentario_dos_veces_descuenta_una_sola_vez(self):
+        comment = Comment.objects.create(title="Hola", text="Texto", user=self.user, event=self.event)
+        Comment.objects.create(title="Chau", text="Texto", user=self.other, event=self.event)
+        copia = Comment.objects.get(pk=comment.pk)
+
+        comment.delete()
+        copia.delete()
+
+        self.assertEqual(self.stats().comment_count, 1)
+        self.assertMatchesRebuild()
+
+    def test_reembolsos_por_estado(self):
+        ticket = Ticket.objects.create(usuario=self.user, evento=self.event, quantity=1, buy_date=timezone.now())
+        refund = RefundRequest.objects.create(ticket_code=str(ticket.pk), reason="No puedo ir", user=self.user)
+        stats = self.stats()
+        self.assertEqual((stats.refunds_pending, stats.refunds_approved), (1, 0))
+
+        refund.status = "aprobado"
+        refund.save()
+        stats = self.stats()
+        self.assertEqual((stats.refunds_pending, stats.refunds_approved), (0, 1))
+
+        refund.delete()
+        self.assertEqual(self.stats().refunds_approved, 0)
+        self.assertMatchesRebuild()
+
+    def test_rebuild_corrige_desvios(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            purchase_ticket(self.user, self.event, 3, "VIP")
+        # Un UPDATE directo no pasa por los servicios: la fila queda desviada
+        Ticket.objects.filter(evento=self.event).update(quantity=1)
+        self.assertEqual(self.stats().vip_sold, 3)
+
+        out = StringIO()
+        call_command("rebuild_event_stats", "--event", str(self.event.pk), stdout=out)
+
+        stats = self.stats()
+        self.assertEqual((stats.vip_sold, stats.revenue), (1, 40000))
+        self.assertIsNotNone(stats.rebuilt_at)
+        self.assertIn("1 eventos recalculados", out.getvalue())
+
+    def test_tarea_periodica_recalcula_y_se_reprograma(self):
+        # La ejecución de hace dos horas: al correr encola la del próximo horario
+        now = timezone.now() - datetime.timedelta(hours=2)
+        job = schedule_stats_rebuild(now)
+        self.assertEqual(schedule_stats_rebuild(now).pk, job.pk)
+        self.assertEqual(job.run_at, now.replace(minute=0, second=0, microsecond=0) + datetime.timedelta(hours=1))
+
+        Ticket.objects.create(usuario=self.user, evento=self.event, quantity=2, buy_date=timezone.now())
+        execute(job)
+
+        self.assertEqual(self.stats().general_sold, 2)
+        self.assertEqual(Job.objects.filter(name="event_stats.rebuild", status=Job.STATUS_PENDING).count(), 1)
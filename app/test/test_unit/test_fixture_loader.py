@@ -0,0 +1,119 @@
+import io
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import Group
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from app.fixture_loader import FixtureLoader, load_fixtures
+from app.models import Event, EventStats, Rating, User
+from app.search import search_events
+
+
+def user(pk, **fields):
+    return {"model": "app.user", "pk": pk, "fields": {"username": f"usuario{pk}", "password": "x", **fields}}
+
+
+def event(pk, organizer, title="Concierto de jazz"):
+    return {"model": "app.event", "pk": pk, "fields": {
+        "title": title, "description": "Descripción", "scheduled_at": "2030-06-20T20:00:00Z",
+        "organizer": organizer, "created_at": "2025-04-01T00:00:00Z", "updated_at": "2025-04-01T00:00:00Z",
+        "location": "Teatro", "rating_count": 1, "rating_sum": 5,
+    }}
+
+
+def rating(pk, usuario, evento):
+    return {"model": "app.rating", "pk": pk, "fields": {
+        "title": "Genial", "text": "Texto", "rating": 5, "usuario": usuario, "evento": evento,
+        "created_at": "2025-04-02T00:00:00Z",
+    }}
+
+
+class LoadFixturesTest(TestCase):
+    def write_fixture(self, objects):
+        archivo = tempfile.NamedTemporaryFile("w", suffix=".json", encoding="utf-8", delete=False)
+        self.addCleanup(os.remove, archivo.name)
+        with archivo:
+            json.dump(objects, archivo)
+        return archivo.name
+
+    def test_hijos_antes_que_padres_y_valores_tal_cual(self):
+        grupo = Group.objects.create(name="staff")
+        # Al revés de como los ordena dumpdata
+        path = self.write_fixture([
+            rating(1, 2, 10), event(10, 1), user(2), user(1, is_organizer=True, groups=[grupo.pk]),
+        ])
+
+        counts = load_fixtures([path], batch_size=1)
+
+        self.assertEqual(counts, {"app.Rating": 1, "app.Event": 1, "app.User": 2})
+        evento = Event.objects.get(pk=10)
+        # auto_now/auto_now_add no pisan las fechas del fixture
+        self.assertEqual(evento.created_at.isoformat(), "2025-04-01T00:00:00+00:00")
+        self.assertEqual(evento.updated_at.isoformat(), "2025-04-01T00:00:00+00:00")
+        self.assertEqual((evento.rating_count, evento.rating_sum), (1, 5))
+        self.assertEqual(Rating.objects.get(pk=1).evento, evento)
+        self.assertEqual(list(User.objects.get(pk=1).groups.all()), [grupo])
+        self.assertEqual([e.pk for e in search_events("jazz")], [10])
+
+    def test_recalcula_calificaciones_solo_de_los_eventos_cargados(self):
+        organizador = User.objects.create_user(username="organizador", password="password123", is_organizer=True)
+        ajeno = Event.objects.create(
+            title="Ajeno", description="Descripción", scheduled_at="2030-01-01T00:00:00Z", organizer=organizador
+        )
+        # Un desvío en un evento que no está en el fixture no lo toca la carga
+        Event.objects.filter(pk=ajeno.pk).update(rating_count=7)
+        sin_contadores = event(10, 1)
+        del sin_contadores["fields"]["rating_count"], sin_contadores["fields"]["rating_sum"]
+
+        load_fixtures([self.write_fixture([
+            user(1, is_organizer=True), user(2), sin_contadores, rating(1, 1, 10), rating(2, 2, 10),
+        ])])
+
+        evento = Event.objects.get(pk=10)
+        self.assertEqual((evento.rating_count, evento.rating_sum), (2, 10))
+        self.assertAlmostEqual(evento.rating_score, Event.bayesian_score(2, 10))
+        self.assertEqual(EventStats.objects.get(pk=10).ratings_histogram, [0, 0, 0, 0, 2])
+        self.assertEqual(Event.objects.get(pk=ajeno.pk).rating_count, 7)
+        self.assertFalse(EventStats.objects.filter(pk=ajeno.pk).exists())
+
+    def test_inserta_los_padres_pendientes_primero(self):
+        objects = [user(1, is_organizer=True), event(10, 1), event(11, 1), rating(1, 1, 10), rating(2, 1, 11)]
+        orden = []
+        insert = FixtureLoader._insert
+
+        def registrar(loader, model, objs):
+            orden.append((model._meta.label, len(objs)))
+            return insert(loader, model, objs)
+
+        with mock.patch.object(FixtureLoader, "_insert", registrar):
+            load_fixtures([self.write_fixture(objects)], batch_size=2)
+
+        self.assertEqual(orden, [("app.User", 1), ("app.Event", 2), ("app.Rating", 2)])
+
+    def test_volver_a_cargar_actualiza(self):
+        load_fixtures([self.write_fixture([user(1, is_organizer=True), event(10, 1)])])
+        load_fixtures([self.write_fixture([event(10, 1, title="Concierto de tango")])])
+
+        self.assertEqual(Event.objects.get().title, "Concierto de tango")
+        self.assertEqual([e.pk for e in search_events("tango")], [10])
+
+    def test_clave_foranea_rota_no_carga_nada(self):
+        path = self.write_fixture([user(1), event(10, organizer=99)])
+
+        with self.assertRaises(CommandError):
+            call_command("load_fixtures", path, stdout=io.StringIO())
+        self.assertFalse(User.objects.exists())
+
+    def test_comando_con_fixture_del_repo(self):
+        User.objects.create_user(username="organizador", password="password123", pk=1, is_organizer=True)
+        stdout = io.StringIO()
+
+        call_command("load_fixtures", str(settings.BASE_DIR / "fixtures" / "events.json"), stdout=stdout)
+
+        self.assertIn("app.Event: 1", stdout.getvalue())
+        self.assertEqual(Event.objects.get(pk=1).title, "Concierto de Jazz")
@@ -0,0 +1,163 @@
+import datetime
+import threading
+
+from django.core.exceptions import ValidationError
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from ...models import Event, Ticket, TicketInventory, User
+from ...services import (
+    SoldOutError,
+    cancel_ticket,
+    change_ticket,
+    purchase_ticket,
+    remaining_stock,
+    set_capacity,
+    with_remaining_stock,
+)
+from ...services.inventory import INVENTORY_SHARDS
+
+
+class InventoryServiceTest(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(
+            username="organizador_test",
+            email="organizador@example.com",
+            password="password123",
+            is_organizer=True,
+        )
+        self.users = [
+            User.objects.create_user(username=f"comprador{i}", password="password123")
+            for i in range(3)
+        ]
+        self.event = Event.objects.create(
+            title="Evento con cupo",
+            description="Descripción del evento",
+            scheduled_at=timezone.now() + datetime.timedelta(days=1),
+            organizer=self.organizer,
+        )
+
+    def test_set_capacity_reparte_el_stock_en_shards(self):
+        set_capacity(self.event, "general", 10)
+
+        shards = TicketInventory.objects.filter(evento=self.event, type="general")
+        self.assertEqual(shards.count(), INVENTORY_SHARDS)
+        self.assertEqual(sum(s.remaining for s in shards), 10)
+        self.assertEqual(remaining_stock(self.event), {"general": 10, "VIP": None})
+
+    def test_compra_descuenta_y_cancelacion_devuelve_stock(self):
+        set_capacity(self.event, "VIP", 5)
+
+        ticket = purchase_ticket(self.users[0], self.event, 3, "VIP")
+        self.assertEqual(remaining_stock(self.event)["VIP"], 2)
+
+        cancel_ticket(ticket)
+        self.assertEqual(remaining_stock(self.event)["VIP"], 5)
+
+    def test_cancelar_dos_veces_devuelve_el_stock_una_vez(self):
+        set_capacity(self.event, "general", 10)
+        ticket = purchase_ticket(self.users[0], self.event, 3)
+        purchase_ticket(self.users[1], self.event, 3)
+        copia = Ticket.objects.get(pk=ticket.pk)
+
+        cancel_ticket(ticket)
+        cancel_ticket(copia)
+
+        self.assertEqual(remaining_stock(self.event)["general"], 7)
+
+    def test_compra_sin_stock_no_crea_ticket(self):
+        set_capacity(self.event, "general", 5)
+        purchase_ticket(self.users[0], self.event, 4)
+
+        with self.assertRaises(SoldOutError) as context:
+            purchase_ticket(self.users[1], self.event, 2)
+
+        self.assertEqual(context.exception.remaining, 1)
+        self.assertEqual(Ticket.objects.filter(evento=self.event).count(), 1)
+        self.assertEqual(remaining_stock(self.event)["general"], 1)
+
+    def test_compra_toma_de_varios_shards(self):
+        set_capacity(self.event, "general", INVENTORY_SHARDS)
+
+        for user in self.users[:2]:
+            purchase_ticket(user, self.event, 4)
+
+        self.assertEqual(remaining_stock(self.event)["general"], 0)
+
+    def test_cambio_de_tipo_mueve_stock(self):
+        set_capacity(self.event, "general", 4)
+        set_capacity(self.event, "VIP", 4)
+        ticket = purchase_ticket(self.users[0], self.event, 2, "general")
+
+        change_ticket(ticket, 3, "VIP")
+
+        self.assertEqual(remaining_stock(self.event), {"general": 4, "VIP": 1})
+
+    def test_cupo_no_puede_ser_menor_a_lo_vendido(self):
+        purchase_ticket(self.users[0], self.event, 3)
+
+        with self.assertRaises(ValidationError):
+            set_capacity(self.event, "general", 2)
+
+        set_capacity(self.event, "general", 5)
+        self.assertEqual(remaining_stock(self.event)["general"], 2)
+
+    def test_cupo_cargado_directamente_se_inicializa_al_comprar(self):
+        Event.objects.filter(pk=self.event.pk).update(general_capacity=3)
+        self.event.refresh_from_db()
+
+        purchase_ticket(self.users[0], self.event, 2)
+
+        self.assertEqual(remaining_stock(self.event)["general"], 1)
+
+    def test_with_remaining_stock_anota_cada_evento(self):
+        set_capacity(self.event, "general", 6)
+        purchase_ticket(self.users[0], self.event, 2)
+
+        event = with_remaining_stock(Event.objects.filter(pk=self.event.pk)).get()
+
+        self.assertEqual(event.stock_general, 4)
+        self.assertIsNone(event.stock_vip)
+
+
+class InventoryConcurrencyTest(TransactionTestCase):
+    """
+    Dos primeros compradores simultáneos de un cupo cargado sin set_capacity
+    arman el stock una sola vez. Necesita bloqueos por fila, así que solo
+    corre en PostgreSQL.
+    """
+
+    def setUp(self):
+        if connection.vendor != "postgresql":
+            self.skipTest("SQLite bloquea toda la base al escribir")
+        organizer = User.objects.create_user(username="organizador", password="password123", is_organizer=True)
+        self.buyers = [User.objects.create_user(username=f"comprador{i}", password="password123") for i in range(2)]
+        self.event = Event.objects.create(
+            title="Evento", description="Descripción", scheduled_at=timezone.now(), organizer=organizer
+        )
+        Event.objects.filter(pk=self.event.pk).update(general_capacity=10)
+        self.event.refresh_from_db()
+
+    def test_primeras_compras_simultaneas_arman_el_stock_una_vez(self):
+        barrier = threading.Barrier(2)
+        errors = []
+
+        def buy(usuario):
+            try:
+                barrier.wait(10)
+                purchase_ticket(usuario, Event.objects.get(pk=self.event.pk), 2)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=buy, args=(usuario,)) for usuario in self.buyers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(TicketInventory.objects.filter(evento=self.event).count(), INVENTORY_SHARDS)
+        self.assertEqual(remaining_stock(self.event)["general"], 6)
@@ -0,0 +1,188 @@
+import datetime
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from app.jobs import claim, enqueue, execute, handler, work
+from app.jobs import notifications as notification_jobs
+from app.models import Event, Job, Notification, Ticket, User
+
+calls = []
+
+
+@handler("tests.ok")
+def ok_handler(job):
+    calls.append(job.payload)
+
+
+@handler("tests.progreso")
+def progress_handler(job):
+    job.save_progress(paso=1)
+    calls.append(job.payload)
+
+
+@handler("tests.falla")
+def failing_handler(job):
+    raise RuntimeError("servicio caído")
+
+
+class JobQueueTest(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_clave_de_idempotencia(self):
+        primera = enqueue("tests.ok", {"n": 1}, key="unica")
+        segunda = enqueue("tests.ok", {"n": 2}, key="unica")
+
+        self.assertEqual(primera.pk, segunda.pk)
+        self.assertEqual(Job.objects.count(), 1)
+
+    def test_worker_ejecuta_pendientes(self):
+        enqueue("tests.ok", {"n": 1})
+        enqueue("tests.ok", {"n": 2}, run_at=timezone.now() + datetime.timedelta(hours=1))
+
+        self.assertEqual(work("test", burst=True), 1)
+        self.assertEqual(calls, [{"n": 1}])
+        self.assertEqual(Job.objects.filter(status=Job.STATUS_DONE).count(), 1)
+        self.assertEqual(Job.objects.filter(status=Job.STATUS_PENDING).count(), 1)
+
+    def test_reintento_y_dead_letter(self):
+        job = enqueue("tests.falla", max_attempts=2)
+
+        with self.assertLogs("app.jobs.queue", "ERROR"):
+            work("test", burst=True)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_PENDING)
+        self.assertEqual(job.attempts, 1)
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn("servicio caído", job.last_error)
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        with self.assertLogs("app.jobs.queue", "ERROR"):
+            work("test", burst=True)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_DEAD)
+        self.assertEqual(job.attempts, 2)
+
+    def test_handler_desconocido_queda_en_error(self):
+        job = enqueue("tests.no_existe", max_attempts=1)
+
+        with self.assertLogs("app.jobs.queue", "ERROR"):
+            self.assertFalse(execute(claim("test")[0]))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_DEAD)
+
+    def test_retoma_tareas_de_un_worker_caido(self):
+        job = enqueue("tests.ok")
+        claim("worker-caido")
+        self.assertEqual(claim("otro"), [])
+
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - datetime.timedelta(hours=1))
+
+        self.assertEqual([j.pk for j in claim("otro")], [job.pk])
+
+    def test_save_progress_renueva_el_bloqueo(self):
+        job = enqueue("tests.ok")
+        [tomada] = claim("worker")
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - datetime.timedelta(hours=1))
+
+        tomada.save_progress(paso=1)
+
+        self.assertEqual(claim("otro"), [])
+        job.refresh_from_db()
+        self.assertEqual(job.payload, {"paso": 1})
+
+    def test_worker_que_perdio_la_tarea_no_pisa_al_nuevo_dueno(self):
+        job = enqueue("tests.progreso")
+        [vieja] = claim("worker-lento")
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - datetime.timedelta(hours=1))
+        [nueva] = claim("otro")
+
+        # El handler se corta en el primer save_progress en vez de seguir en paralelo
+        with self.assertLogs("app.jobs.queue", "WARNING"):
+            self.assertFalse(execute(vieja))
+        self.assertEqual(calls, [])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), (Job.STATUS_RUNNING, "otro"))
+
+        # Un handler sin progreso termina, pero el estado final es del dueño actual
+        vieja.name = "tests.ok"
+        self.assertTrue(execute(vieja))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), (Job.STATUS_RUNNING, "otro"))
+
+        self.assertTrue(execute(nueva))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_DONE)
+
+    def test_comando_run_workers(self):
+        enqueue("tests.ok", {"n": 1})
+        out = StringIO()
+
+        call_command("run_workers", "--processes", "1", "--burst", stdout=out)
+
+        self.assertEqual(calls, [{"n": 1}])
+        self.assertIn("1 tareas procesadas", out.getvalue())
+
+
+class NotificationDeliveryJobTest(TestCase):
+    def setUp(self):
+        organizer = User.objects.create_user(username="organizador", password="password123", is_organizer=True)
+        self.event = Event.objects.create(
+            title="Evento",
+            description="Descripción",
+            location="Lugar",
+            scheduled_at=timezone.now() + datetime.timedelta(days=7),
+            organizer=organizer,
+        )
+        self.attendees = [
+            User.objects.create_user(username=f"asistente{i}", email=f"asistente{i}@example.com", password="password123")
+            for i in range(3)
+        ]
+        sin_correo = User.objects.create_user(username="sin_correo", password="password123")
+        for user in [*self.attendees, sin_correo]:
+            for _ in range(2):
+                Ticket.objects.create(usuario=user, evento=self.event, quantity=1, buy_date=timezone.now(), type="general")
+
+    def update_event(self):
+        self.event.update_with_notification(
+            title=self.event.title,
+            description=self.event.description,
+            scheduled_at=self.event.scheduled_at,
+            location="Otro lugar",
+        )
+        return Notification.objects.get(event=self.event)
+
+    def test_editar_evento_encola_el_envio(self):
+        notification = self.update_event()
+
+        self.assertEqual(len(mail.outbox), 0)
+        job = Job.objects.get()
+        self.assertEqual(job.payload, {"notification_id": notification.pk})
+
+        work("test", burst=True)
+
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), [u.email for u in self.attendees])
+
+    @mock.patch.object(notification_jobs, "DELIVERY_BATCH_SIZE", 2)
+    def test_reintento_sigue_desde_el_ultimo_lote(self):
+        self.update_event()
+        job = Job.objects.get()
+        enviar = mock.Mock(side_effect=[2, RuntimeError("smtp caído")])
+
+        with mock.patch("django.core.mail.backends.locmem.EmailBackend.send_messages", enviar), \
+                self.assertLogs("app.jobs.queue", "ERROR"):
+            work("test", burst=True)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_PENDING)
+        self.assertEqual(job.payload["after"], self.attendees[1].pk)
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        work("test", burst=True)
+
+        self.assertEqual([m.to[0] for m in mail.outbox], [self.attendees[2].email])
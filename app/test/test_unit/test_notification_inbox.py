@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils.timezone import make_aware
+
+from app.models import Event, Notification, Ticket
+from app.pagination import decode_cursor, encode_cursor
+
+User = get_user_model()
+
+
+class NotificationInboxUnitTest(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(
+            username="organizer",
+            password="testpass",
+            is_organizer=True
+        )
+        self.user = User.objects.create_user(
+            username="testuser",
+            password="testpass"
+        )
+        self.other_user = User.objects.create_user(
+            username="otheruser",
+            password="testpass"
+        )
+        self.event = Event.objects.create(
+            title="Evento con ticket",
+            description="Descripción",
+            scheduled_at=make_aware(datetime.now() + timedelta(days=7)),
+            organizer=self.organizer,
+        )
+        self.other_event = Event.objects.create(
+            title="Evento sin ticket",
+            description="Descripción",
+            scheduled_at=make_aware(datetime.now() + timedelta(days=7)),
+            organizer=self.organizer,
+        )
+        Ticket.objects.create(
+            usuario=self.user,
+            evento=self.event,
+            quantity=1,
+            buy_date=make_aware(datetime.now()),
+            type="general"
+        )
+
+    def crear_notificacion(self, title, **kwargs):
+        return Notification.objects.create(
+            title=title,
+            message="Mensaje",
+            priority=Notification.PRIORITY_LOW,
+            **kwargs
+        )
+
+    def test_inbox_incluye_propias_y_globales_de_sus_eventos(self):
+        propia = self.crear_notificacion("Propia", user=self.user)
+        global_evento = self.crear_notificacion("Global", event=self.event)
+        self.crear_notificacion("Otro evento", event=self.other_event)
+        self.crear_notificacion("Otro usuario", user=self.other_user)
+
+        notifications, unread_count, has_more = Notification.inbox(self.user)
+
+        self.assertEqual([n.pk for n in notifications], [global_evento.pk, propia.pk])
+        self.assertEqual(unread_count, 2)
+        self.assertFalse(has_more)
+
+    def test_inbox_usa_una_sola_consulta(self):
+        for i in range(3):
+            self.crear_notificacion(f"Propia {i}", user=self.user, is_read=i == 0)
+
+        with self.assertNumQueries(1):
+            notifications, unread_count, _ = Notification.inbox(self.user)
+            [n.event for n in notifications]
+
+        self.assertEqual(unread_count, 2)
+
+    def test_inbox_pagina_por_cursor(self):
+        creadas = [self.crear_notificacion(f"Propia {i}", user=self.user) for i in range(5)]
+
+        primera, unread_count, has_more = Notification.inbox(self.user, limit=3)
+        self.assertTrue(has_more)
+        self.assertEqual(unread_count, 5)
+
+        cursor = decode_cursor(encode_cursor(primera[-1].created_at, primera[-1].pk))
+        segunda, unread_count, has_more = Notification.inbox(self.user, before=cursor, limit=3)
+
+        self.assertFalse(has_more)
+        self.assertEqual(unread_count, 5)
+        self.assertEqual(
+            [n.pk for n in primera + segunda],
+            [n.pk for n in reversed(creadas)],
+        )
+
+    def test_decode_cursor_invalido(self):
+        self.assertIsNone(decode_cursor("no-es-un-cursor"))
+        self.assertIsNone(decode_cursor(None))
+
+    def test_marcar_global_como_leida_es_por_usuario(self):
+        Ticket.objects.create(
+            usuario=self.other_user,
+            evento=self.event,
+            quantity=1,
+            buy_date=make_aware(datetime.now()),
+            type="general"
+        )
+        notification = self.crear_notificacion("Global", event=self.event)
+
+        notification.mark_read_by(self.user)
+
+        notification.refresh_from_db()
+        self.assertFalse(notification.is_read)
+        self.assertTrue(notification.is_read_by(self.user))
+        self.assertFalse(notification.is_read_by(self.other_user))
+
+        notifications, unread_count, _ = Notification.inbox(self.user)
+        self.assertTrue(notifications[0].read_by_user)
+        self.assertEqual(unread_count, 0)
+
+        notifications, unread_count, _ = Notification.inbox(self.other_user)
+        self.assertFalse(notifications[0].read_by_user)
+        self.assertEqual(unread_count, 1)
+
+    def test_marcar_personal_como_leida_usa_su_flag(self):
+        notification = self.crear_notificacion("Propia", user=self.user)
+
+        notification.mark_read_by(self.user)
+        notification.mark_read_by(self.user)
+
+        notification.refresh_from_db()
+        self.assertTrue(notification.is_read)
+        self.assertFalse(notification.reads.exists())
+
+    def test_no_se_marca_notificacion_personal_ajena(self):
+        notification = self.crear_notificacion("Ajena", user=self.other_user)
+
+        notification.mark_read_by(self.user)
+
+        notification.refresh_from_db()
+        self.assertFalse(notification.is_read)
@@ -64,3 +64,13 @@ class RefundRequestFormTest(TestCase):
         form = RefundRequestForm(data=form_data, user=self.user)
         self.assertFalse(form.is_valid())
         self.assertIn("El ticket ingresado no existe o no pertenece a tu cuenta.", form.errors["ticket_code"])
+
+    def test_refund_request_resuelve_ticket_desde_el_codigo(self):
+        refund = RefundRequest.objects.get(user=self.user)
+        self.assertEqual(refund.ticket, self.ticket)
+        self.assertEqual(refund.event_name, "Test Event")
+
+        refund.ticket_code = "999999"
+        refund.save()
+        self.assertIsNone(refund.ticket)
+        self.assertEqual(refund.event_name, "Evento no encontrado")
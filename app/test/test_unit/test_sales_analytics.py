@@ -0,0 +1,94 @@
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+
+from app.analytics import SalesRangeError, bucket_start, rebuild_sales_rollups, sales_series
+from app.models import DailySales, Event, HourlySales, Ticket, User
+from app.services import cancel_ticket, change_ticket, purchase_ticket
+
+UTC = datetime.timezone.utc
+
+
+class SalesAnalyticsTest(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(username="organizador", password="password123", is_organizer=True)
+        self.user = User.objects.create_user(username="asistente", password="password123")
+        self.other = User.objects.create_user(username="otro", password="password123")
+        self.event = Event.objects.create(
+            title="Festival",
+            description="Descripción",
+            scheduled_at=timezone.now() + datetime.timedelta(days=10),
+            organizer=self.organizer,
+        )
+
+    def rollups(self, model):
+        return sorted(model.objects.filter(evento=self.event).values_list("type", "quantity", "revenue"))
+
+    def test_bucket_start(self):
+        moment = datetime.datetime(2025, 3, 4, 15, 42, 7, tzinfo=UTC)
+        self.assertEqual(bucket_start(moment, "hour"), datetime.datetime(2025, 3, 4, 15, tzinfo=UTC))
+        self.assertEqual(bucket_start(moment, "day"), datetime.datetime(2025, 3, 4, tzinfo=UTC))
+
+    def test_compra_cambio_y_cancelacion(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket = purchase_ticket(self.user, self.event, 2, "general")
+            purchase_ticket(self.other, self.event, 1, "general")
+        self.assertEqual(self.rollups(HourlySales), [("general", 3, 60000)])
+        self.assertEqual(self.rollups(DailySales), [("general", 3, 60000)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            change_ticket(ticket, 1, "VIP")
+        self.assertEqual(self.rollups(HourlySales), [("VIP", 1, 40000), ("general", 1, 20000)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            cancel_ticket(ticket)
+        self.assertEqual(self.rollups(DailySales), [("VIP", 0, 0), ("general", 1, 20000)])
+
+    def test_serie_con_intervalos_vacios(self):
+        hoy = timezone.now()
+        for dias, cantidad, tipo in [(0, 2, "general"), (2, 1, "VIP"), (2, 3, "general")]:
+            Ticket.objects.create(
+                usuario=self.user, evento=self.event, quantity=cantidad, type=tipo,
+                buy_date=hoy - datetime.timedelta(days=dias),
+            )
+        rebuild_sales_rollups(Event.objects.filter(pk=self.event.pk))
+
+        series = sales_series(self.event.pk, "day", desde=(hoy - datetime.timedelta(days=3)).date(), hasta=hoy.date())
+
+        self.assertEqual(len(series["buckets"]), 4)
+        self.assertEqual(series["quantity"], {"general": [0, 3, 0, 2], "VIP": [0, 1, 0, 0]})
+        self.assertEqual(series["revenue"], [0, 100000, 0, 40000])
+        self.assertEqual(series["totals"], {"general": 5, "VIP": 1, "revenue": 140000})
+
+    def test_serie_por_hora_por_defecto(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            purchase_ticket(self.user, self.event, 2, "VIP")
+
+        series = sales_series(self.event.pk, "hour")
+
+        self.assertEqual(len(series["buckets"]), 48)
+        self.assertEqual(series["quantity"]["VIP"][-1], 2)
+        self.assertEqual(sum(series["quantity"]["VIP"]), 2)
+
+    def test_rebuild_coincide_con_incremental(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket = purchase_ticket(self.user, self.event, 3, "general")
+            purchase_ticket(self.other, self.event, 2, "VIP")
+            change_ticket(ticket, 1, "general")
+        incremental = {model: self.rollups(model) for model in (HourlySales, DailySales)}
+
+        rebuild_sales_rollups()
+
+        for model, rows in incremental.items():
+            self.assertEqual(self.rollups(model), rows)
+
+    def test_rangos_invalidos(self):
+        with self.assertRaises(SalesRangeError):
+            sales_series(self.event.pk, "week")
+        with self.assertRaises(SalesRangeError):
+            sales_series(self.event.pk, "day", desde="2025-13-01")
+        with self.assertRaises(SalesRangeError):
+            sales_series(self.event.pk, "day", desde="2025-03-02", hasta="2025-03-01")
+        with self.assertRaises(SalesRangeError):
+            sales_series(self.event.pk, "hour", desde="2020-01-01", hasta="2025-01-01")
@@ -0,0 +1,64 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db.models import Count, Sum
+from django.test import TestCase
+
+from app.models import (
+    Comment,
+    Event,
+    Notification,
+    Rating,
+    RefundRequest,
+    Ticket,
+    TicketQuota,
+    User,
+)
+from app.seeding import seed_scale
+
+
+def snapshot():
+    return sorted(
+        Ticket.objects.values_list("usuario__username", "evento__title", "quantity", "type")
+    ) + sorted(Rating.objects.values_list("usuario__username", "evento__title", "rating"))
+
+
+class SeedScaleTest(TestCase):
+    def test_crea_las_cantidades_pedidas(self):
+        created = seed_scale(scale=0.01, seed=3)
+
+        self.assertEqual(created["users"], 10)
+        self.assertEqual(created["events"], 10)
+        self.assertEqual(Ticket.objects.count(), 100)
+        self.assertEqual(Rating.objects.count(), 100)
+        self.assertEqual(Comment.objects.count(), 50)
+        self.assertEqual(Notification.objects.count(), 50)
+        self.assertEqual(RefundRequest.objects.count(), 5)
+
+    def test_respeta_restricciones_y_contadores(self):
+        seed_scale(scale=0.01, users=5, events=4, tickets=30, ratings=30)
+
+        # 5 usuarios x 4 eventos: como mucho 20 pares únicos
+        self.assertEqual(Ticket.objects.count(), 20)
+        self.assertEqual(TicketQuota.objects.aggregate(total=Sum("quantity"))["total"],
+                         Ticket.objects.aggregate(total=Sum("quantity"))["total"])
+        self.assertFalse(
+            RefundRequest.objects.filter(status="pendiente").values("user")
+            .annotate(n=Count("pk")).filter(n__gt=1).exists()
+        )
+        for event in Event.objects.annotate(n=Count("organized_ratings"), s=Sum("organized_ratings__rating")):
+            self.assertEqual((event.rating_count, event.rating_sum), (event.n, event.s or 0)) # type: ignore
+
+    def test_misma_semilla_mismos_datos(self):
+        seed_scale(scale=0.01, seed=7)
+        primero = snapshot()
+        User.objects.all().delete()
+        seed_scale(scale=0.01, seed=7)
+
+        self.assertEqual(snapshot(), primero)
+
+    def test_comando_no_repite_una_semilla(self):
+        call_command("seed_scale", "--scale", "0.01", stdout=StringIO())
+
+        with self.assertRaises(CommandError):
+            call_command("seed_scale", "--scale", "0.01", stdout=StringIO())
@@ -0,0 +1,245 @@
+import threading
+
+from django.core.exceptions import ValidationError
+from django.db import connection, connections, transaction
+from django.db.models import Sum
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from ...models import DailySales, Event, EventStats, HourlySales, Ticket, TicketQuota, User
+from ...services import (
+    PurchaseLine,
+    TicketLimitError,
+    cancel_ticket,
+    change_ticket,
+    purchase_ticket,
+    purchase_tickets,
+)
+
+
+class TicketPurchaseServiceTest(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(
+            username="organizador_test",
+            email="organizador@example.com",
+            password="password123",
+            is_organizer=True,
+        )
+        self.user = User.objects.create_user(
+            username="comprador",
+            email="comprador@example.com",
+            password="password123",
+        )
+        self.event = Event.objects.create(
+            title="Evento de prueba",
+            description="Descripción del evento de prueba",
+            scheduled_at=timezone.now(),
+            organizer=self.organizer,
+        )
+        self.other_event = Event.objects.create(
+            title="Otro evento",
+            description="Descripción del otro evento",
+            scheduled_at=timezone.now(),
+            organizer=self.organizer,
+        )
+
+    def quota(self, evento=None):
+        return TicketQuota.objects.get(usuario=self.user, evento=evento or self.event).quantity
+
+    def test_compra_actualiza_la_cuota(self):
+        ticket = purchase_ticket(self.user, self.event, 3, "VIP")
+
+        self.assertEqual(ticket.quantity, 3)
+        self.assertEqual(ticket.type, "VIP")
+        self.assertEqual(self.quota(), 3)
+
+    def test_compra_que_supera_el_limite_no_crea_tickets(self):
+        purchase_ticket(self.user, self.event, 3)
+
+        with self.assertRaises(TicketLimitError) as context:
+            purchase_ticket(self.user, self.event, 2)
+
+        self.assertEqual(context.exception.existentes, 3)
+        self.assertIn("superarías el límite de 4 entradas", context.exception.messages[0])
+        self.assertEqual(Ticket.objects.filter(usuario=self.user).count(), 1)
+        self.assertEqual(self.quota(), 3)
+
+    def test_cuota_inicializa_con_tickets_existentes(self):
+        Ticket.objects.create(
+            usuario=self.user, evento=self.event, quantity=4, buy_date=timezone.now()
+        )
+
+        with self.assertRaises(TicketLimitError):
+            purchase_ticket(self.user, self.event, 1)
+
+    def test_compra_por_lotes_es_atomica(self):
+        purchase_ticket(self.user, self.other_event, 4)
+
+        with self.assertRaises(TicketLimitError):
+            purchase_tickets(self.user, [
+                PurchaseLine(self.event, 2),
+                PurchaseLine(self.other_event, 1),
+            ])
+
+        self.assertFalse(Ticket.objects.filter(evento=self.event).exists())
+        self.assertFalse(TicketQuota.objects.filter(evento=self.event).exists())
+
+    def test_compra_por_lotes_suma_lineas_del_mismo_evento(self):
+        tickets = purchase_tickets(self.user, [
+            PurchaseLine(self.event, 2, "general"),
+            PurchaseLine(self.event, 2, "VIP"),
+            PurchaseLine(self.other_event, 1),
+        ])
+
+        self.assertEqual(len(tickets), 3)
+        self.assertEqual(self.quota(), 4)
+        self.assertEqual(self.quota(self.other_event), 1)
+
+    def test_modificar_y_cancelar_ajustan_la_cuota(self):
+        ticket = purchase_ticket(self.user, self.event, 1)
+        purchase_ticket(self.user, self.event, 2)
+
+        change_ticket(ticket, 2, "VIP")
+        self.assertEqual(self.quota(), 4)
+
+        with self.assertRaises(TicketLimitError):
+            change_ticket(ticket, 3, "VIP")
+
+        cancel_ticket(ticket)
+        self.assertEqual(self.quota(), 2)
+        self.assertFalse(Ticket.objects.filter(pk=ticket.pk).exists())
+
+    def test_cancelar_dos_veces_no_devuelve_cupo_de_mas(self):
+        ticket = purchase_ticket(self.user, self.event, 2)
+        purchase_ticket(self.user, self.event, 2)
+        copia = Ticket.objects.get(pk=ticket.pk)
+
+        self.assertTrue(cancel_ticket(ticket))
+        self.assertFalse(cancel_ticket(copia))
+
+        self.assertEqual(self.quota(), 2)
+        with self.assertRaises(TicketLimitError):
+            purchase_ticket(self.user, self.event, 3)
+
+    def test_modificar_relee_el_ticket(self):
+        ticket = purchase_ticket(self.user, self.event, 1)
+        vieja = Ticket.objects.get(pk=ticket.pk)
+        change_ticket(ticket, 3, "general")
+
+        # La copia en memoria todavía dice 1: el cambio se calcula sobre las 3 guardadas
+        change_ticket(vieja, 2, "general")
+
+        self.assertEqual(self.quota(), 2)
+        self.assertEqual(Ticket.objects.get(pk=ticket.pk).quantity, 2)
+
+    def test_modificar_un_ticket_cancelado(self):
+        ticket = purchase_ticket(self.user, self.event, 1)
+        copia = Ticket.objects.get(pk=ticket.pk)
+        cancel_ticket(ticket)
+
+        with self.assertRaises(ValidationError):
+            change_ticket(copia, 2, "general")
+        self.assertEqual(self.quota(), 0)
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_tipo_de_entrada_invalido(self):
+        with self.assertRaises(ValidationError):
+            purchase_ticket(self.user, self.event, 1, "bogus")
+        self.assertFalse(Ticket.objects.exists())
+
+        ticket = purchase_ticket(self.user, self.event, 1)
+        with self.assertRaises(ValidationError):
+            change_ticket(ticket, 1, "bogus")
+        ticket.refresh_from_db()
+        self.assertEqual(ticket.type, "general")
+        self.assertEqual(self.quota(), 1)
+
+    def test_tipo_invalido_desde_el_formulario_no_es_error_500(self):
+        self.client.force_login(self.user)
+
+        response = self.client.post(
+            reverse("create_ticket"), {"idEvento": self.event.pk, "tipoEntrada": "bogus", "cantidadTk": "1"}
+        )
+
+        self.assertRedirects(response, reverse("gestion_ticket", args=[self.event.pk]), fetch_redirect_response=False)
+        self.assertFalse(Ticket.objects.exists())
+
+
+class PurchaseHotRowsTest(TestCase):
+    """Las filas que comparten todas las compras de un evento no se escriben dentro de la transacción."""
+
+    HOT_TABLES = ("app_eventstats", "app_hourlysales", "app_dailysales")
+
+    def setUp(self):
+        organizer = User.objects.create_user(username="organizador", password="password123", is_organizer=True)
+        self.user = User.objects.create_user(username="comprador", password="password123")
+        self.event = Event.objects.create(
+            title="Evento", description="Descripción", scheduled_at=timezone.now(), organizer=organizer
+        )
+
+    def test_compra_no_toca_estadisticas_ni_rollups_antes_del_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            with CaptureQueriesContext(connection) as queries:
+                ticket = purchase_ticket(self.user, self.event, 2)
+                change_ticket(ticket, 1, "VIP")
+                cancel_ticket(ticket)
+
+        for query in queries.captured_queries:
+            for table in self.HOT_TABLES:
+                self.assertNotIn(table, query["sql"])
+        self.assertEqual(len(callbacks), 3)
+
+
+class PurchaseConcurrencyTest(TransactionTestCase):
+    """
+    Con otra transacción bloqueando las filas de EventStats y de ventas del
+    evento, una compra igual tiene que completarse sin esperarlas. Necesita
+    bloqueos por fila, así que solo corre en PostgreSQL.
+    """
+
+    def setUp(self):
+        if connection.vendor != "postgresql":
+            self.skipTest("SQLite bloquea toda la base al escribir")
+        organizer = User.objects.create_user(username="organizador", password="password123", is_organizer=True)
+        self.buyers = [User.objects.create_user(username=f"comprador{i}", password="password123") for i in range(2)]
+        self.event = Event.objects.create(
+            title="Evento", description="Descripción", scheduled_at=timezone.now(), organizer=organizer
+        )
+        # Crea las filas compartidas que la otra transacción va a bloquear
+        purchase_ticket(self.buyers[0], self.event, 1)
+
+    def test_compra_no_espera_la_fila_de_estadisticas(self):
+        locked, release = threading.Event(), threading.Event()
+
+        def hold_rows():
+            try:
+                with transaction.atomic():
+                    EventStats.objects.select_for_update().get(pk=self.event.pk)
+                    list(HourlySales.objects.select_for_update().filter(evento=self.event))
+                    list(DailySales.objects.select_for_update().filter(evento=self.event))
+                    locked.set()
+                    release.wait(10)
+            finally:
+                connections.close_all()
+
+        holder = threading.Thread(target=hold_rows)
+        holder.start()
+        self.assertTrue(locked.wait(10))
+        try:
+            with transaction.atomic():
+                # Si la compra tocara una fila bloqueada fallaría acá en vez de esperar
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL lock_timeout = '2s'")
+                purchase_ticket(self.buyers[1], self.event, 2)
+                release.set()
+        finally:
+            release.set()
+            holder.join()
+
+        stats = EventStats.objects.get(pk=self.event.pk)
+        self.assertEqual(stats.general_sold, 3)
+        self.assertEqual(
+            HourlySales.objects.filter(evento=self.event).aggregate(total=Sum("quantity"))["total"], 3
+        )
@@ -12,9 +12,14 @@ urlpatterns = [
     # === URLs PARA EVENTs ===
     path("events/", views.events, name="events"),
     path("events/create/", views.event_form, name="event_form"),
+    path("events/search/", views.event_search, name="event_search"),
+    path("events/import/", views.event_import, name="event_import"),
+    path("events/dashboard/", views.organizer_dashboard, name="organizer_dashboard"),
     path("events/<int:id>/edit/", views.event_form, name="event_edit"),
     path("events/<int:id>/", views.event_detail, name="event_detail"),
     path("events/<int:id>/delete/", views.event_delete, name="event_delete"),
+    path("events/<int:id>/ratings/", views.event_ratings, name="event_ratings"),
+    path("events/<int:id>/sales/", views.event_sales, name="event_sales"),
     # === URLs PARA RATINGs ===
     path("rating/", views.inicio_rating, name="inicio_rating"),
     path("rating/crearRating", views.formulario_rating, name="formulario_rating"),
@@ -31,6 +36,7 @@ urlpatterns = [
     path('notifications/organizador/', views.notification_list, name='notification_list'),
     path('notificaciones/usuario/', views.notification_list_user, name='notification_list_user'),
     path('notificaciones/marcar-leida/<int:pk>/', views.mark_as_read, name='mark_as_read'),
+    path('notificaciones/stream/', views.notification_stream, name='notification_stream'),
     path('notifications/create/', views.notification_create, name='notification_create'),
     path('notifications/detail/<int:pk>/', views.notification_detail, name='notification_detail'),
     path('notifications/edit/<int:pk>/', views.notification_edit, name='notification_edit'),
@@ -45,6 +51,7 @@ urlpatterns = [
     path('refund/<int:id>/', views.refund_detail, name='refund_detail'),
     # === URLs PARA TICKETs ===
     path('tickets/gestion/<idEvento>', views.gestion_ticket, name='gestion_ticket'),
+    path('tickets/exportar/<idEvento>', views.export_tickets, name='export_tickets'),
     path('tickets/crearTicket', views.create_ticket, name='create_ticket'),
     path('tickets/editar/<id>', views.edit_ticket, name='edit_ticket'),
     path('tickets/eliminar/<id>', views.delete_ticket, name='delete_ticket'),
@@ -1,17 +1,80 @@
+import asyncio
 import datetime
+import io
 
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.auth import authenticate, login
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.handlers.asgi import ASGIRequest
 from django.core.paginator import Paginator
-from django.db.models import Q, Sum
-from django.http import HttpResponseBadRequest, HttpResponseForbidden
-from django.shortcuts import get_object_or_404, redirect, render
+from django.db import IntegrityError, transaction
+from django.db.models import Sum
+from django.db.models.functions import Substr
+from django.http import (
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseForbidden,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect, render
+from django.template.loader import render_to_string
 from django.utils import timezone
+from django.utils.safestring import mark_safe
 from django.utils.timezone import localtime, now
 
+from .analytics import SalesRangeError, sales_series
+from .caching import (
+    CSRF_PLACEHOLDER,
+    EVENT_RATINGS_TIMEOUT,
+    EVENTS_LIST_TIMEOUT,
+    aevent_ratings_key,
+    aevents_list_key,
+    event_ratings_key,
+    with_csrf_token,
+)
+from .exports import EXPORT_FORMATS, ExportFilterError, astream_rows, stream_rows, ticket_rows
 from .forms import CompraTicketForm, NotificationForm, RatingForm, RefundRequestForm, TicketForm
-from .models import Comment, Event, Notification, Rating, RefundRequest, Ticket, User
+from .models import Comment, Event, EventStats, Notification, Rating, RefundRequest, Ticket, User
+from .pagination import akeyset_page, decode_cursor, encode_cursor, keyset_page
+from .realtime import notification_events
+from .search import search_events
+from .services import (
+    EventImportError,
+    SoldOutError,
+    TicketLimitError,
+    cancel_ticket,
+    change_ticket,
+    import_events,
+    import_format,
+    purchase_ticket,
+    remaining_stock,
+    set_capacity,
+    with_remaining_stock,
+)
+
+EVENTS_PAGE_SIZE = 20
+EVENTS_DESCRIPTION_LENGTH = 150
+# ?orden= del listado de eventos: (campo del keyset, descendente)
+EVENTS_ORDERINGS = {"fecha": ("scheduled_at", False), "calificacion": ("rating_score", True)}
+RATINGS_PAGE_SIZE = 20
+DASHBOARD_PAGE_SIZE = 50
+DASHBOARD_TOTALS = (
+    "general_sold", "vip_sold", "revenue", "comment_count",
+    "refunds_pending", "refunds_approved", "refunds_rejected",
+)
+
+
+async def _load_user(request):
+    """
+    Carga el usuario en una vista async y lo deja en request.user, para que las
+    plantillas y los context processors no consulten la base desde el event loop.
+    """
+    request.user = await request.auser()
+    return request.user
 
 
 # === CONTROLLERS PARA NOTIFICATIONS ===
@@ -23,17 +86,35 @@ def notification_redirect(request):
         return redirect('notification_list_user')
 
 @login_required
-def notification_list_user(request):
-    notifications = Notification.objects.filter(
-        Q(user=request.user) |
-        Q(user__isnull=True, event__in=Ticket.objects.filter(usuario=request.user).values('evento'))
-    ).select_related('event')
-    unread_count = notifications.filter(is_read=False).count()
+async def notification_list_user(request):
+    user = await _load_user(request)
+    before = decode_cursor(request.GET.get('before'))
+    notifications, unread_count, has_more = await Notification.ainbox(user, before=before)
+    next_cursor = None
+    if has_more:
+        last = notifications[-1]
+        next_cursor = encode_cursor(last.created_at, last.pk)
     return render(request, 'notifications/list_user.html', {
         'notifications': notifications,
-        'unread_count': unread_count
+        'unread_count': unread_count,
+        'next_cursor': next_cursor,
     })
 
+@login_required
+async def notification_stream(request):
+    """Server-sent events con el total de no leídas y cada notificación nueva del usuario."""
+    user = await request.auser()
+    if isinstance(request, ASGIRequest):
+        response = StreamingHttpResponse(notification_events(user), content_type="text/event-stream")
+    else:
+        # Con WSGI la conexión ocuparía un worker para siempre: se manda el total y
+        # se cierra, y EventSource vuelve a preguntar según el retry del flujo
+        body = "".join([chunk async for chunk in notification_events(user, live=False)])
+        response = HttpResponse(body, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
 @login_required
 def notification_list(request):
     notifications = Notification.objects.all().select_related('user', 'event')
@@ -57,11 +138,7 @@ def notification_list(request):
 @login_required
 def mark_as_read(request, pk):
     notification = get_object_or_404(Notification, pk=pk)
-
-    if notification.user is None or notification.user == request.user:
-        notification.is_read = True
-        notification.save()
-
+    notification.mark_read_by(request.user)
     return redirect('notification_list_user')
 
 def notification_create(request):
@@ -71,7 +148,9 @@ def notification_create(request):
             notification = form.save(commit=False)
             if form.cleaned_data['destinatario_tipo'] == 'todos':
                 notification.user = None
-            notification.save()
+            with transaction.atomic():
+                notification.save()
+                notification.schedule_delivery()
             return redirect('notification_list')
     else:
         form = NotificationForm()
@@ -158,23 +237,209 @@ def home(request):
 
 # === CONTROLLERS PARA EVENTS ===
 @login_required
-def events(request):
-    events = Event.objects.filter(scheduled_at__gte=now()).order_by("scheduled_at")
+async def events(request):
+    user = await _load_user(request)
+    role = "organizer" if user.is_organizer else "attendee"
+    orden = request.GET.get("orden")
+    if orden not in EVENTS_ORDERINGS:
+        orden = "fecha"
+    field, descending = EVENTS_ORDERINGS[orden]
+    # Un cursor de la otra ordenación (fecha en vez de puntaje) vuelve a la primera página
+    cursor = decode_cursor(request.GET.get("after"), float if field == "rating_score" else datetime.datetime)
+    key = await aevents_list_key(role, cursor and encode_cursor(*cursor), orden)
+
+    table = await cache.aget(key)
+    if table is None:
+        # Solo las columnas del listado; la descripción viaja recortada desde la base
+        upcoming = Event.objects.filter(scheduled_at__gte=now()).only(
+            "id", "title", "scheduled_at", "general_capacity", "vip_capacity",
+            "rating_count", "rating_sum", "rating_score",
+        ).annotate(short_description=Substr("description", 1, EVENTS_DESCRIPTION_LENGTH + 1))
+        # "calificacion" recorre event_rating_score_idx con el puntaje ya calculado
+        events, next_cursor = await akeyset_page(
+            with_remaining_stock(upcoming), field, cursor, limit=EVENTS_PAGE_SIZE, descending=descending
+        )
+        table = render_to_string(
+            "app/events_table.html",
+            {
+                "events": events,
+                "user_is_organizer": user.is_organizer,
+                "next_cursor": next_cursor,
+                "is_first_page": cursor is None,
+                "orden": orden,
+                "description_length": EVENTS_DESCRIPTION_LENGTH,
+                "csrf_token": CSRF_PLACEHOLDER,
+            },
+        )
+        await cache.aset(key, table, EVENTS_LIST_TIMEOUT)
+
     return render(
         request,
         "app/events.html",
-        {"events": events, "user_is_organizer": request.user.is_organizer},
+        {
+            "events_table": with_csrf_token(table, request),
+            "user_is_organizer": user.is_organizer,
+            "orden": orden,
+        },
     )
 
 @login_required
-def event_detail(request, id):
-    event = get_object_or_404(Event, pk=id)
-    listaRating = Rating.objects.filter(evento=event)
-    form = RatingForm(initial={'idEventoRating': event.pk})
-    for r in listaRating:
+async def organizer_dashboard(request):
+    """Panel del organizador: ventas, calificaciones, comentarios y reembolsos de sus eventos."""
+    user = await _load_user(request)
+    if not user.is_organizer:
+        return redirect("events")
+
+    cursor = decode_cursor(request.GET.get("after"))
+    eventos = Event.objects.filter(organizer=user).select_related("stats").defer("description")
+    events, next_cursor = await akeyset_page(eventos, "scheduled_at", cursor, limit=DASHBOARD_PAGE_SIZE)
+
+    faltantes = [event.pk for event in events if not hasattr(event, "stats")]
+    if faltantes:
+        # Eventos sin actividad registrada desde que existe la tabla: se calculan una sola vez
+        await sync_to_async(EventStats.rebuild)(Event.objects.filter(pk__in=faltantes))
+        stats = {s.pk: s async for s in EventStats.objects.filter(pk__in=faltantes)}
+        for event in events:
+            if event.pk in stats:
+                event.stats = stats[event.pk]
+
+    totals = None
+    if cursor is None:
+        totals = await EventStats.objects.filter(evento__organizer=user).aaggregate(
+            **{field: Sum(field) for field in DASHBOARD_TOTALS}
+        )
+
+    return render(request, "app/dashboard.html", {
+        "events": events,
+        "totals": totals,
+        "next_cursor": next_cursor,
+        "user_is_organizer": True,
+    })
+
+@login_required
+async def event_sales(request, id):
+    """
+    Ventas del evento en el tiempo, en JSON para el gráfico del organizador:
+    ?granularity=hour|day y rango opcional con ?desde= y ?hasta= (AAAA-MM-DD).
+    """
+    user, event = await asyncio.gather(
+        _load_user(request), aget_object_or_404(Event.objects.only("id", "organizer_id"), pk=id)
+    )
+    if not user.is_organizer or event.organizer_id != user.pk:
+        return HttpResponseForbidden("Solo el organizador del evento puede ver sus ventas.")
+
+    try:
+        series = await sync_to_async(sales_series)(
+            event.pk,
+            request.GET.get("granularity", "day"),
+            request.GET.get("desde"),
+            request.GET.get("hasta"),
+        )
+    except SalesRangeError as e:
+        return HttpResponseBadRequest(str(e))
+    return JsonResponse(series)
+
+@login_required
+def event_search(request):
+    q = request.GET.get("q", "").strip()
+    results = search_events(q, limit=EVENTS_PAGE_SIZE) if q else []
+    return render(
+        request,
+        "app/event_search.html",
+        {"q": q, "events": results, "user_is_organizer": request.user.is_organizer},
+    )
+
+def _render_ratings_page(event_id, ratings, next_cursor, user_is_organizer):
+    for r in ratings:
         r.full_stars = range(r.rating) # type: ignore
         r.empty_stars = range(5 - r.rating) # type: ignore
-    return render(request, "app/event_detail.html", {"event": event, "form": form,  "ratings": listaRating ,"user_is_organizer": request.user.is_organizer })
+    return render_to_string(
+        "app/event_ratings.html",
+        {
+            "ratings": ratings,
+            "event_id": event_id,
+            "next_cursor": next_cursor,
+            "user_is_organizer": user_is_organizer,
+        },
+    )
+
+def _event_ratings_page(event_id, user_is_organizer, cursor=None):
+    """Una página de reseñas renderizada, cacheada por evento, rol y cursor."""
+    role = "organizer" if user_is_organizer else "attendee"
+    key = event_ratings_key(event_id, role, cursor and encode_cursor(*cursor))
+    page = cache.get(key)
+    if page is None:
+        listaRating, next_cursor = keyset_page(
+            Rating.objects.filter(evento_id=event_id).select_related('usuario'),
+            "created_at", cursor, limit=RATINGS_PAGE_SIZE, descending=True,
+        )
+        page = _render_ratings_page(event_id, listaRating, next_cursor, user_is_organizer)
+        cache.set(key, page, EVENT_RATINGS_TIMEOUT)
+    return mark_safe(page)
+
+async def _aevent_ratings_page(event_id, user_is_organizer, cursor=None):
+    """Versión async de _event_ratings_page."""
+    role = "organizer" if user_is_organizer else "attendee"
+    key = await aevent_ratings_key(event_id, role, cursor and encode_cursor(*cursor))
+    page = await cache.aget(key)
+    if page is None:
+        listaRating, next_cursor = await akeyset_page(
+            Rating.objects.filter(evento_id=event_id).select_related('usuario'),
+            "created_at", cursor, limit=RATINGS_PAGE_SIZE, descending=True,
+        )
+        page = _render_ratings_page(event_id, listaRating, next_cursor, user_is_organizer)
+        await cache.aset(key, page, EVENT_RATINGS_TIMEOUT)
+    return mark_safe(page)
+
+@login_required
+async def event_detail(request, id):
+    user = await _load_user(request)
+    # El evento (con sus agregados de rating) y la página de reseñas no dependen entre sí
+    event, ratings_block = await asyncio.gather(
+        aget_object_or_404(Event.objects.select_related("organizer", "stats"), pk=id),
+        _aevent_ratings_page(id, user.is_organizer),
+    )
+    form = RatingForm(initial={'idEventoRating': event.pk})
+    return render(request, "app/event_detail.html", {
+        "event": event,
+        "form": form,
+        "user_is_organizer": user.is_organizer,
+        "ratings_block": ratings_block,
+    })
+
+@login_required
+async def event_ratings(request, id):
+    """Páginas siguientes de reseñas, como fragmento HTML para event_detail."""
+    user = await _load_user(request)
+    cursor = decode_cursor(request.GET.get("after"))
+    _, page = await asyncio.gather(
+        aget_object_or_404(Event.objects.only("id"), pk=id),
+        _aevent_ratings_page(id, user.is_organizer, cursor),
+    )
+    return HttpResponse(page)
+
+@login_required
+def event_import(request):
+    """Alta masiva de eventos desde un archivo CSV o JSON, con el reporte de filas rechazadas."""
+    if not request.user.is_organizer:
+        return redirect("events")
+
+    context = {}
+    if request.method == "POST":
+        upload = request.FILES.get("file")
+        fmt = import_format(upload.name) if upload else None
+        context["dry_run"] = request.POST.get("dry_run") is not None
+        if fmt is None:
+            context["error"] = "Subí un archivo .csv, .json, .ndjson o .jsonl."
+        else:
+            # El archivo subido se decodifica a medida que se lee, sin cargarlo entero
+            stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+            try:
+                context["report"] = import_events(stream, fmt, request.user, dry_run=context["dry_run"])
+            except EventImportError as e:
+                context["error"] = str(e)
+
+    return render(request, "app/event_import.html", context)
 
 @login_required
 def event_delete(request, id):
@@ -211,22 +476,65 @@ def event_form(request, id=None):
             datetime.datetime(int(year), int(month), int(day), int(hour), int(minutes))
         )
 
+        # Cupos opcionales por tipo de entrada; vacío = sin límite
+        capacities = {}
+        capacity_error = None
+        for tipo, field in Event.CAPACITY_FIELDS.items():
+            if field in request.POST:
+                value = request.POST.get(field, "").strip()
+                try:
+                    capacities[tipo] = int(value) if value else None
+                except ValueError:
+                    capacity_error = "El cupo debe ser un número entero mayor o igual a 0."
+                    continue
+                if capacities[tipo] is not None and capacities[tipo] < 0:
+                    capacity_error = "El cupo debe ser un número entero mayor o igual a 0."
+
         if event is None:
-            # Crear nuevo evento
-            Event.objects.create(
-                title=title,
-                description=description,
-                location=location,
-                scheduled_at=scheduled_at,
-                organizer=user,
+            # Sin guardar: si hay un error el formulario conserva lo ingresado y sigue siendo de alta
+            form_event = Event(
+                title=title, description=description, location=location, scheduled_at=scheduled_at
             )
         else:
-            # Actualizar evento con notificación si corresponde
-            event.update_with_notification(
-                title=title,
-                description=description,
-                scheduled_at=scheduled_at,
-                location=location
+            form_event = event
+
+        if capacity_error:
+            return render(
+                request,
+                "app/event_form.html",
+                {"event": form_event, "user_is_organizer": user.is_organizer,
+                 "capacity_error": capacity_error},
+            )
+
+        try:
+            with transaction.atomic():
+                if event is None:
+                    # Crear nuevo evento
+                    event = Event.objects.create(
+                        title=title,
+                        description=description,
+                        location=location,
+                        scheduled_at=scheduled_at,
+                        organizer=user,
+                    )
+                else:
+                    # Actualizar evento con notificación si corresponde
+                    event.update_with_notification(
+                        title=title,
+                        description=description,
+                        scheduled_at=scheduled_at,
+                        location=location
+                    )
+
+                for tipo, capacity in capacities.items():
+                    if capacity != event.capacity_for(tipo):
+                        set_capacity(event, tipo, capacity)
+        except ValidationError as e:
+            return render(
+                request,
+                "app/event_form.html",
+                {"event": form_event, "user_is_organizer": user.is_organizer,
+                 "capacity_error": e.messages[0]},
             )
 
         return redirect("events")
@@ -242,14 +550,17 @@ def event_form(request, id=None):
 
 # === CONTROLLER PARA COMMENTS ===
 @login_required
-def comment(request, event_id):
-    event = get_object_or_404(Event, pk=event_id)
-    comments = Comment.objects.filter(event=event).order_by("-created_at")
-    
+async def comment(request, event_id):
+    await _load_user(request)
+    comments = Comment.objects.filter(event_id=event_id).select_related("user").order_by("-created_at")
+    event, total = await asyncio.gather(aget_object_or_404(Event, pk=event_id), comments.acount())
+
     paginator = Paginator(comments, 20)
+    paginator.count = total
     page_number = request.GET.get("page")
     comments_page = paginator.get_page(page_number)
-    
+    comments_page.object_list = [c async for c in comments_page.object_list]
+
     return render(request, "comments/comments.html", {
         "event": event,
         "comments": comments_page
@@ -339,17 +650,12 @@ def refund_create(request):
 
 @login_required
 def refund_list(request):
-    if request.user.is_organizer:
-        refunds = RefundRequest.objects.select_related('user').all()
-    else:
-        refunds = RefundRequest.objects.filter(user=request.user)
+    refunds = RefundRequest.objects.select_related('user', 'ticket__evento').order_by('-created_at', '-id')
+    if not request.user.is_organizer:
+        refunds = refunds.filter(user=request.user)
 
-    for refund in refunds:
-        try:
-            ticket = Ticket.objects.get(ticket_code=refund.ticket_code)
-            refund.event_name = ticket.evento.title  # type: ignore
-        except Ticket.DoesNotExist:
-            refund.event_name = "Evento no encontrado"  # type: ignore
+    paginator = Paginator(refunds, 20)
+    refunds = paginator.get_page(request.GET.get("page"))
 
     return render(request, "refunds/refund_list.html", {
         "refunds": refunds,
@@ -406,12 +712,13 @@ def refund_reject(request, id):
     return redirect("refund_list")
 
 @login_required
-def refund_detail(request, id):
-    refund = get_object_or_404(RefundRequest, id=id)
+async def refund_detail(request, id):
+    user = await _load_user(request)
+    refund = await aget_object_or_404(RefundRequest.objects.select_related("user"), id=id)
 
-    user_is_organizer = request.user.is_organizer
+    user_is_organizer = user.is_organizer
 
-    if not user_is_organizer and refund.user != request.user:
+    if not user_is_organizer and refund.user_id != user.pk: # type: ignore
         return redirect('refund_list')
 
     return render(request, "refunds/refund_detail.html", {"refund": refund})
@@ -425,17 +732,43 @@ def gestion_ticket(request, idEvento):
 
     event = get_object_or_404(Event, pk=idEvento)
     if not usuarioTk.is_organizer:
-        listaTickets=Ticket.objects.filter(usuario=usuarioTk)
+        listaTickets=Ticket.objects.filter(usuario=usuarioTk).select_related('evento')
     else:
         tiene_eventos = Event.objects.filter(organizer=usuarioTk, pk=idEvento).exists()
         if not tiene_eventos:
             return render(request, "ticket/gestionTicket.html", {"listaTickets": listaTickets,"user_is_organizer": request.user.is_organizer})
         eventosOrg = usuarioTk.organized_events.filter(pk=idEvento)
-        listaTickets = Ticket.objects.filter(evento__in=eventosOrg)
+        listaTickets = Ticket.objects.filter(evento__in=eventosOrg).select_related('evento')
 
     return render(request, "ticket/gestionTicket.html", 
                 {"listaTickets": listaTickets,"user_is_organizer": request.user.is_organizer, "event": event})
 
+@login_required
+def export_tickets(request, idEvento):
+    """
+    Descarga los tickets del evento en CSV o NDJSON (?format=), filtrados por
+    ?type= y por fecha de compra con ?desde= y ?hasta= (AAAA-MM-DD).
+    """
+    event = get_object_or_404(Event, pk=idEvento)
+    if not request.user.is_organizer or event.organizer_id != request.user.pk:
+        return HttpResponseForbidden("Solo el organizador del evento puede exportar sus tickets.")
+
+    fmt = request.GET.get("format", "csv")
+    if fmt not in EXPORT_FORMATS:
+        return HttpResponseBadRequest("Formato inválido: usá csv o ndjson.")
+    try:
+        rows = ticket_rows(
+            event.pk, request.GET.get("type"), request.GET.get("desde"), request.GET.get("hasta")
+        )
+    except ExportFilterError as e:
+        return HttpResponseBadRequest(str(e))
+
+    # Con ASGI un iterador sync se leería entero antes de enviarse
+    stream = astream_rows(rows, fmt) if isinstance(request, ASGIRequest) else stream_rows(rows, fmt)
+    response = StreamingHttpResponse(stream, content_type=EXPORT_FORMATS[fmt])
+    response["Content-Disposition"] = f'attachment; filename="tickets-evento-{event.pk}.{fmt}"'
+    return response
+
 @login_required
 def create_ticket(request):
     usuario = request.user
@@ -444,14 +777,17 @@ def create_ticket(request):
     tipo = request.POST['tipoEntrada']
     cantidad = request.POST['cantidadTk']
     
-    Ticket.objects.create( quantity=cantidad , buy_date=timezone.now(), type=tipo, usuario=usuario, evento = event)
+    try:
+        purchase_ticket(usuario, event, int(cantidad), tipo)
+    except ValidationError as e:
+        messages.error(request, e.messages[0])
     return redirect('gestion_ticket', idEvento= idEvento)
 
 @login_required
 def delete_ticket(request, id):
     tk = get_object_or_404(Ticket, ticket_code=id)
     evento = tk.evento
-    tk.delete()
+    cancel_ticket(tk)
     return redirect('gestion_ticket', idEvento= evento.pk)
 
 @login_required
@@ -467,28 +803,18 @@ def edit_ticket(request, id):
 
 @login_required
 def update_ticket(request):
-    usuario = request.user
     form = TicketForm(request.POST)
     if form.is_valid():
             tipo = form.cleaned_data['tipoEntrada']
             cantidad = form.cleaned_data['cantidadTk']
             id = form.cleaned_data['ticketCode']
             tk = get_object_or_404(Ticket, ticket_code=id)
-            event = tk.evento
-            
-            entradas_existentes = Ticket.objects.filter(
-            usuario=usuario,
-            evento=event).aggregate(total=Sum("quantity"))["total"] or 0
-
-            entradas_existentes = entradas_existentes - tk.quantity
 
-            if entradas_existentes + cantidad > 4:
-                form.add_error('cantidadTk',f"Ya has comprado {entradas_existentes + tk.quantity} entradas para este evento. "
-            f"Con esta compra ({cantidad - tk.quantity }) superarías el límite de 4 entradas.")
+            try:
+                change_ticket(tk, cantidad, tipo)
+            except ValidationError as e:
+                form.add_error('cantidadTk', e)
                 return render(request, "ticket/edicionTicket.html",{ "form": form})
-            tk.quantity = cantidad
-            tk.type = tipo
-            tk.save()
             return redirect('gestion_ticket', idEvento= tk.evento.pk)
     else:
             id = request.POST.get('ticketCode')
@@ -501,7 +827,7 @@ def update_ticket(request):
 def buy_ticket(request, idEvento):
     event = get_object_or_404(Event, pk=idEvento)
     form = CompraTicketForm(initial={'id_evento': event.pk})
-    return render(request, "ticket/entrada.html", {"user_is_organizer": request.user.is_organizer, "evento":event, "form": form})
+    return render(request, "ticket/entrada.html", {"user_is_organizer": request.user.is_organizer, "evento":event, "form": form, "stock": remaining_stock(event)})
 
 @login_required
 def confirm_ticket(request):
@@ -513,27 +839,22 @@ def confirm_ticket(request):
         cantidad = form.cleaned_data['cantidad']
         tipo = form.cleaned_data['tipo']
 
-        # Validación: no permitir más de 4 entradas por usuario por evento
-        entradas_existentes = Ticket.objects.filter(
-            usuario=usuario,
-            evento=event
-        ).aggregate(total=Sum("quantity"))["total"] or 0
-
-        if entradas_existentes + cantidad > 4:
-            form.add_error('cantidad',f"Ya has comprado {entradas_existentes} entradas para este evento. "
-            f"Con esta compra ({cantidad}) superarías el límite de 4 entradas.")
+        # Validación y reserva atómica: no más de 4 entradas por usuario por evento
+        try:
+            purchase_ticket(usuario, event, cantidad, tipo)
+        except (TicketLimitError, SoldOutError) as e:
+            form.add_error('cantidad', e)
             return render(request, "ticket/entrada.html", {
                 "user_is_organizer": usuario.is_organizer,
                 "evento": event,
-                "form": form
+                "form": form,
+                "stock": remaining_stock(event),
             })
-        
-        Ticket.objects.create( quantity=cantidad , buy_date=timezone.now(), type=tipo, usuario=usuario, evento = event)
         return redirect('gestion_ticket', idEvento= id_evento)
     else:
         id_evento = request.POST.get('id_evento')
         event = get_object_or_404(Event, pk=id_evento)
-        return render(request, "ticket/entrada.html", {"user_is_organizer": request.user.is_organizer, "evento":event, "form": form})
+        return render(request, "ticket/entrada.html", {"user_is_organizer": request.user.is_organizer, "evento":event, "form": form, "stock": remaining_stock(event)})
 
 
 # === CONTROLLERS PARA RATINGS ===
@@ -562,17 +883,23 @@ def formulario_rating(request):
             titulo = form.cleaned_data['tituloR']
             descripcion = form.cleaned_data['descripcionR']
             rating = form.cleaned_data['califiqueR']
-            Rating.objects.create( title=titulo , text=descripcion, rating=rating, usuario =usuario, evento=event)
-            return redirect('event_detail', id=idEvento)
+            try:
+                Rating.objects.create( title=titulo , text=descripcion, rating=rating, usuario =usuario, evento=event)
+            except IntegrityError:
+                # Otra petición simultánea del mismo usuario ganó la carrera
+                form.add_error(None, "Ya has calificado este evento.")
+            else:
+                return redirect('event_detail', id=idEvento)
     else:
         idEvento = request.POST.get('idEventoRating')
         event = get_object_or_404(Event, pk=idEvento)
 
-    listaRating = Rating.objects.filter(evento=event)
-    for r in listaRating:
-        r.full_stars = range(r.rating) # type: ignore
-        r.empty_stars = range(5 - r.rating) # type: ignore
-    return render(request, "app/event_detail.html", {"event": event, "form": form,  "ratings": listaRating })
+    return render(request, "app/event_detail.html", {
+        "event": event,
+        "form": form,
+        "user_is_organizer": usuario.is_organizer,
+        "ratings_block": _event_ratings_page(event.pk, usuario.is_organizer),
+    })
 
 @login_required
 def edicionRating(request, id):
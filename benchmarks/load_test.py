@@ -0,0 +1,337 @@
+"""
+Benchmark de carga para los flujos de navegación y compra.
+
+Crea una base SQLite temporal con datos sintéticos, levanta la app WSGI
+(gunicorn si está instalado, si no un servidor wsgiref con hilos) o ASGI
+(`--server uvicorn`: gunicorn con workers de uvicorn) y la
+golpea con clientes concurrentes que mezclan listado de eventos, detalle,
+compra de entradas, bandeja de notificaciones y comentarios. Reporta por
+endpoint requests por segundo y latencias p50/p95/p99 en JSON.
+
+Uso:
+    python benchmarks/load_test.py --clients 16 --duration 30 --output reporte.json
+    python benchmarks/load_test.py --baseline reporte_anterior.json
+    python benchmarks/load_test.py --server uvicorn --baseline reporte_wsgi.json
+"""
+import argparse
+import json
+import math
+import os
+import random
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "eventhub.settings")
+
+# Peso relativo de cada endpoint en la mezcla de tráfico
+TRAFFIC_MIX = {
+    "events": 30,
+    "event_detail": 25,
+    "notification_list_user": 15,
+    "comments": 15,
+    "buy_ticket": 10,
+    "confirm_ticket": 5,
+}
+CSRF_TOKEN_RE = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+def setup_django(db_path, scale, seed):
+    # Configuración de producción (DEBUG apagado) compartida con el proceso de gunicorn
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{db_path}",
+        "DJANGO_ENV": "production",
+        "SECRET_KEY": os.environ.get("SECRET_KEY", "benchmark-secret-key"),
+        "ALLOWED_HOSTS": "127.0.0.1,localhost",
+    })
+    import django
+
+    django.setup()
+
+    from django.core.management import call_command
+
+    from app.seeding import seed_scale
+
+    call_command("migrate", verbosity=0)
+    seed_scale(scale=scale, seed=seed)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(server, port, workers, threads):
+    """Devuelve una función que detiene el servidor."""
+    if server == "gunicorn":
+        process = subprocess.Popen(
+            [
+                sys.executable, "-m", "gunicorn", "eventhub.wsgi",
+                "--bind", f"127.0.0.1:{port}",
+                "--workers", str(workers),
+                "--threads", str(threads),
+                "--log-level", "warning",
+            ],
+            cwd=BASE_DIR,
+        )
+        return process.terminate
+    if server == "uvicorn":
+        # Las vistas async comparten el event loop de cada worker; --threads no aplica
+        process = subprocess.Popen(
+            [
+                sys.executable, "-m", "gunicorn", "eventhub.asgi:application",
+                "--worker-class", "uvicorn_worker.UvicornWorker",
+                "--bind", f"127.0.0.1:{port}",
+                "--workers", str(workers),
+                "--log-level", "warning",
+            ],
+            cwd=BASE_DIR,
+        )
+        return process.terminate
+
+    from socketserver import ThreadingMixIn
+    from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+    from django.core.wsgi import get_wsgi_application
+
+    class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+        daemon_threads = True
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    httpd = make_server(
+        "127.0.0.1", port, get_wsgi_application(),
+        server_class=ThreadingWSGIServer, handler_class=QuietHandler,
+    )
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd.shutdown
+
+
+def wait_for_server(base_url, timeout=30):
+    import requests
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            requests.get(base_url + "/", timeout=1)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    raise RuntimeError(f"El servidor no respondió en {timeout} s")
+
+
+def login_sessions(clients):
+    """Sesiones autenticadas (cookie sessionid) para los primeros `clients` asistentes."""
+    from django.test import Client
+
+    from app.models import User
+
+    users = list(User.objects.filter(is_organizer=False).order_by("pk")[:clients])
+    sessions = []
+    for user in users:
+        client = Client()
+        client.force_login(user)
+        sessions.append(client.cookies["sessionid"].value)
+    return sessions
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return None
+    index = max(math.ceil(p / 100 * len(sorted_values)) - 1, 0)
+    return round(sorted_values[index] * 1000, 2)
+
+
+class TrafficClient:
+    def __init__(self, base_url, sessionid, event_ids, rng):
+        import requests
+
+        self.base_url = base_url
+        self.session = requests.Session()
+        self.session.cookies.set("sessionid", sessionid)
+        self.event_ids = event_ids
+        # Pocos eventos concentran la mayor parte del tráfico
+        self.event_weights = [1 / (rank + 1) for rank in range(len(event_ids))]
+        self.rng = rng
+
+    def pick_event(self):
+        return self.rng.choices(self.event_ids, weights=self.event_weights)[0]
+
+    def request(self, endpoint):
+        event_id = self.pick_event()
+        if endpoint == "events":
+            return self.session.get(f"{self.base_url}/events/")
+        if endpoint == "event_detail":
+            return self.session.get(f"{self.base_url}/events/{event_id}/")
+        if endpoint == "notification_list_user":
+            return self.session.get(f"{self.base_url}/notificaciones/usuario/")
+        if endpoint == "comments":
+            return self.session.get(f"{self.base_url}/comments/{event_id}/")
+        if endpoint == "buy_ticket":
+            return self.session.get(f"{self.base_url}/tickets/entrada/{event_id}")
+        if endpoint == "confirm_ticket":
+            # El formulario de compra entrega el token CSRF que exige el POST
+            page = self.session.get(f"{self.base_url}/tickets/entrada/{event_id}")
+            token = CSRF_TOKEN_RE.search(page.text)
+            return self.session.post(
+                f"{self.base_url}/tickets/confirmarEntrada",
+                data={
+                    "csrfmiddlewaretoken": token.group(1) if token else "",
+                    "id_evento": event_id,
+                    "cantidad": 1,
+                    "tipo": "general",
+                    "numero_tarjeta": "4111111111111111",
+                    "expiracion": "12/40",
+                    "cvv": "123",
+                    "nombre_tarjeta": "Cliente Benchmark",
+                    "acepta_terminos": "on",
+                },
+                allow_redirects=False,
+            )
+        raise ValueError(endpoint)
+
+    def run(self, deadline):
+        samples = []
+        endpoints, weights = zip(*TRAFFIC_MIX.items())
+        while time.monotonic() < deadline:
+            endpoint = self.rng.choices(endpoints, weights=weights)[0]
+            start = time.perf_counter()
+            try:
+                status = self.request(endpoint).status_code
+            except Exception:
+                status = None
+            samples.append((endpoint, time.perf_counter() - start, status))
+        return samples
+
+
+def run_load(base_url, sessions, event_ids, duration, warmup, seed):
+    clients = [
+        TrafficClient(base_url, sessionid, event_ids, random.Random(seed + i))
+        for i, sessionid in enumerate(sessions)
+    ]
+    with ThreadPoolExecutor(max_workers=len(clients)) as pool:
+        if warmup:
+            list(pool.map(lambda c: c.run(time.monotonic() + warmup), clients))
+        started = time.monotonic()
+        results = list(pool.map(lambda c: c.run(started + duration), clients))
+        elapsed = time.monotonic() - started
+
+    latencies = defaultdict(list)
+    statuses = defaultdict(lambda: defaultdict(int))
+    for samples in results:
+        for endpoint, latency, status in samples:
+            latencies[endpoint].append(latency)
+            statuses[endpoint][str(status or "error")] += 1
+
+    def failed(endpoint):
+        return sum(n for status, n in statuses[endpoint].items() if status == "error" or int(status) >= 400)
+
+    endpoints = {}
+    for endpoint in TRAFFIC_MIX:
+        values = sorted(latencies[endpoint])
+        endpoints[endpoint] = {
+            "requests": len(values),
+            "errors": failed(endpoint),
+            "statuses": dict(statuses[endpoint]),
+            "rps": round(len(values) / elapsed, 1),
+            "p50_ms": percentile(values, 50),
+            "p95_ms": percentile(values, 95),
+            "p99_ms": percentile(values, 99),
+        }
+    total = sum(e["requests"] for e in endpoints.values())
+    return {
+        "seconds": round(elapsed, 2),
+        "requests": total,
+        "errors": sum(e["errors"] for e in endpoints.values()),
+        "rps": round(total / elapsed, 1),
+        "endpoints": endpoints,
+    }
+
+
+def compare(report, baseline):
+    """Variación porcentual de rps y p95 respecto de un reporte anterior."""
+    def change(new, old):
+        return round((new - old) / old * 100, 1) if new is not None and old else None
+
+    return {
+        endpoint: {
+            "rps_change_pct": change(stats["rps"], baseline["endpoints"].get(endpoint, {}).get("rps")),
+            "p95_change_pct": change(stats["p95_ms"], baseline["endpoints"].get(endpoint, {}).get("p95_ms")),
+        }
+        for endpoint, stats in report["endpoints"].items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=16, help="clientes concurrentes")
+    parser.add_argument("--duration", type=float, default=30, help="segundos de medición")
+    parser.add_argument("--warmup", type=float, default=3, help="segundos de calentamiento sin medir")
+    parser.add_argument("--scale", type=float, default=1.0, help="escala de seed_scale (1.0 = 1000 eventos, 10000 tickets)")
+    parser.add_argument("--server", choices=["gunicorn", "uvicorn", "wsgiref"], default=None)
+    parser.add_argument("--workers", type=int, default=2, help="workers de gunicorn")
+    parser.add_argument("--threads", type=int, default=4, help="hilos por worker de gunicorn")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="archivo donde guardar el reporte JSON")
+    parser.add_argument("--baseline", help="reporte JSON anterior contra el cual comparar")
+    args = parser.parse_args()
+
+    server = args.server or ("gunicorn" if shutil.which("gunicorn") else "wsgiref")
+    tmp = tempfile.mkdtemp(prefix="eventhub-load-")
+    try:
+        setup_django(os.path.join(tmp, "bench.sqlite3"), args.scale, args.seed)
+
+        from django.db import connection
+
+        from app.models import Event
+
+        sessions = login_sessions(args.clients)
+        event_ids = list(Event.objects.order_by("scheduled_at").values_list("pk", flat=True)[:200])
+        connection.close()
+
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        stop = start_server(server, port, args.workers, args.threads)
+        try:
+            wait_for_server(base_url)
+            report = run_load(base_url, sessions, event_ids, args.duration, args.warmup, args.seed)
+        finally:
+            stop()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    report["config"] = {
+        "server": server,
+        "clients": len(sessions),
+        "duration": args.duration,
+        "scale": args.scale,
+        "workers": args.workers if server in ("gunicorn", "uvicorn") else None,
+        "threads": args.threads if server == "gunicorn" else None,
+        "mix": TRAFFIC_MIX,
+    }
+    if args.baseline:
+        report["comparison"] = compare(report, json.loads(Path(args.baseline).read_text()))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    print(output)
+    if report["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
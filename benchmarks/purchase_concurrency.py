@@ -0,0 +1,132 @@
+"""
+Benchmark de concurrencia para la compra de tickets.
+
+Lanza compras en paralelo contra un mismo evento usando el servicio
+app.services.purchase_ticket sobre una base SQLite temporal, y verifica
+al final que ningun usuario haya superado el limite de entradas.
+
+Uso:
+    python benchmarks/purchase_concurrency.py --buyers 20 --attempts 6 --threads 8
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "eventhub.settings")
+
+
+def setup_django(db_path):
+    import django
+    from django.conf import settings
+
+    settings.DATABASES["default"].update({
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": db_path,
+        "OPTIONS": {"timeout": 30, "transaction_mode": "IMMEDIATE"},
+    })
+    django.setup()
+
+    from django.core.management import call_command
+
+    call_command("migrate", verbosity=0)
+
+
+def seed(buyers):
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    from app.models import Event, User
+
+    organizer = User.objects.create_user(username="bench_org", password="x", is_organizer=True)
+    event = Event.objects.create(
+        title="Evento benchmark",
+        description="Compras concurrentes",
+        scheduled_at=timezone.now() + timedelta(days=30),
+        organizer=organizer,
+    )
+    users = User.objects.bulk_create(
+        [User(username=f"bench_user_{i}") for i in range(buyers)]
+    )
+    return event, users
+
+
+def run(buyers, attempts, threads, seed_value):
+    from django.db import OperationalError, connection
+
+    from app.models import Ticket, TicketQuota
+    from app.services import MAX_TICKETS_PER_EVENT, TicketLimitError, purchase_ticket
+
+    event, users = seed(buyers)
+    rng = random.Random(seed_value)
+    jobs = [(user, rng.randint(1, 3)) for user in users for _ in range(attempts)]
+    rng.shuffle(jobs)
+
+    def buy(job):
+        user, quantity = job
+        start = time.perf_counter()
+        try:
+            purchase_ticket(user, event, quantity)
+            outcome = "ok"
+        except TicketLimitError:
+            outcome = "limit"
+        except OperationalError:
+            outcome = "error"
+        finally:
+            connection.close()
+        return outcome, time.perf_counter() - start
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(buy, jobs))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for _, latency in results)
+    totals = {
+        user.pk: sum(Ticket.objects.filter(usuario=user, evento=event).values_list("quantity", flat=True))
+        for user in users
+    }
+    quotas = dict(TicketQuota.objects.filter(evento=event).values_list("usuario", "quantity"))
+
+    return {
+        "purchases": len(jobs),
+        "threads": threads,
+        "seconds": round(elapsed, 3),
+        "purchases_per_second": round(len(jobs) / elapsed, 1),
+        "ok": sum(1 for outcome, _ in results if outcome == "ok"),
+        "rejected_by_limit": sum(1 for outcome, _ in results if outcome == "limit"),
+        "db_errors": sum(1 for outcome, _ in results if outcome == "error"),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+        "users_over_limit": sum(1 for total in totals.values() if total > MAX_TICKETS_PER_EVENT),
+        "quota_mismatches": sum(1 for pk, total in totals.items() if quotas.get(pk, 0) != total),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--buyers", type=int, default=20)
+    parser.add_argument("--attempts", type=int, default=6, help="compras por usuario")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(os.path.join(tmp, "bench.sqlite3"))
+        report = run(args.buyers, args.attempts, args.threads, args.seed)
+
+    print(json.dumps(report, indent=2))
+    if report["users_over_limit"] or report["quota_mismatches"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
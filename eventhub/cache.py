@@ -0,0 +1,45 @@
+"""
+Configuración de la caché a partir del entorno.
+
+CACHE_URL admite:
+    locmem://                      memoria local de cada proceso (por defecto)
+    file:///ruta/al/directorio     archivos compartidos entre procesos de una máquina
+    redis://host:6379/0            Redis o compatible (Valkey, KeyDB); requiere `pip install redis`
+    dummy://                       sin caché
+"""
+import os
+from urllib.parse import urlsplit
+
+from .database import env_int
+
+BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+    "rediss": "django.core.cache.backends.redis.RedisCache",
+    "dummy": "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+def parse_cache_url(url):
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in BACKENDS:
+        raise ValueError(f"Esquema de CACHE_URL no soportado: {scheme!r}")
+
+    config = {"BACKEND": BACKENDS[scheme]}
+    if scheme == "file":
+        config["LOCATION"] = parts.path
+    elif scheme in ("redis", "rediss"):
+        config["LOCATION"] = url
+    elif scheme == "locmem":
+        config["LOCATION"] = parts.netloc or "eventhub"
+    return config
+
+
+def cache_config(default="locmem://"):
+    """Arma CACHES["default"] según CACHE_URL y CACHE_TIMEOUT (segundos)."""
+    config = parse_cache_url(os.environ.get("CACHE_URL") or default)
+    config["TIMEOUT"] = env_int("CACHE_TIMEOUT", 300)
+    config["KEY_PREFIX"] = os.environ.get("CACHE_KEY_PREFIX", "eventhub")
+    return config
@@ -12,6 +12,9 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 import os
 from pathlib import Path
 
+from .cache import cache_config
+from .database import database_config, env_bool, env_int
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -81,12 +84,33 @@ WSGI_APPLICATION = "eventhub.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+# Se configura con DATABASE_URL (sqlite:/// o postgres://) y las variables DB_*;
+# ver eventhub/database.py. Por defecto, SQLite en BASE_DIR / "db.sqlite3".
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
+    "default": database_config(BASE_DIR),
+}
+
+# Backend de búsqueda de eventos (ruta a la clase). Por defecto se elige según
+# el motor: FTS5 en SQLite, tsvector en PostgreSQL.
+EVENT_SEARCH_BACKEND = os.environ.get("EVENT_SEARCH_BACKEND") or None
+
+# Caché: CACHE_URL (locmem://, file://, redis://); ver eventhub/cache.py.
+# Los tests corren sin caché salvo que la pidan con override_settings; ver
+# eventhub/test_runner.py.
+CACHES = {
+    "default": cache_config(),
 }
+TEST_RUNNER = "eventhub.test_runner.TestRunner"
+
+# Correo: los workers de app.jobs envían las notificaciones por este backend.
+# Por defecto se imprimen por consola; en producción se configura SMTP.
+EMAIL_BACKEND = os.environ.get("EMAIL_BACKEND", "django.core.mail.backends.console.EmailBackend")
+EMAIL_HOST = os.environ.get("EMAIL_HOST", "localhost")
+EMAIL_PORT = env_int("EMAIL_PORT", 25)
+EMAIL_HOST_USER = os.environ.get("EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = os.environ.get("EMAIL_HOST_PASSWORD", "")
+EMAIL_USE_TLS = env_bool("EMAIL_USE_TLS")
+DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL", "eventhub@localhost")
 
 
 # Password validation
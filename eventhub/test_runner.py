@@ -0,0 +1,23 @@
+"""
+Runner de los tests (TEST_RUNNER): corren con la caché desactivada.
+
+La memoria local, el directorio o el Redis de CACHE_URL sobreviven al
+rollback de la base entre tests, así que un fragmento cacheado por un test
+lo vería el siguiente. Los tests de la caché activan la suya con
+override_settings.
+"""
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+from .cache import parse_cache_url
+
+
+class TestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._caches = override_settings(CACHES={"default": parse_cache_url("dummy://")})
+        self._caches.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._caches.disable()
+        super().teardown_test_environment(**kwargs)